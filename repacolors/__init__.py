@@ -6,9 +6,36 @@ color scales and more.
 .. include:: ./documentation.md
 """
 
-from .colors import Color
-from .scale import ColorScale
-from .cubehelix import CubeHelix
-from .schemes import ColorWheel
+import importlib
 
 __version__ = "0.5.0"
+__all__ = ["Color", "ColorArray", "ColorScale", "CubeHelix", "ColorWheel"]
+
+# imported on first access (PEP 562), to keep `import repacolors` cheap
+_LAZY = {
+    "Color": "colors",
+    "ColorArray": "colorarray",
+    "ColorScale": "scale",
+    "CubeHelix": "cubehelix",
+    "ColorWheel": "schemes",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(f".{_LAZY[name]}", __name__), name)
+    else:
+        # submodules (`repacolors.palette`, ...)
+        try:
+            value = importlib.import_module(f".{name}", __name__)
+        except ModuleNotFoundError as err:
+            if err.name != f"{__name__}.{name}":
+                raise
+            raise AttributeError(f"module '{__name__}' has no attribute '{name}'") from None
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,186 @@
+"""asyncio API
+
+`ColorPool` runs the CPU heavy batch work (conversions, scale mapping, palette
+and scheme generation) in a managed thread or process pool, in chunks, with a
+limit on the number of chunks running at once. Cancelling the awaiting task
+cancels the chunks not started yet.
+
+`AsyncClient` talks to the color service (`repacolor serve`).
+"""
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from .service import decode_response, default_socket_path, encode_request
+
+
+def _convert_chunk(colordefs: Sequence[Any], fmt: str) -> List[Any]:
+    from .colors import Color
+    return [getattr(Color(cdef), fmt) for cdef in colordefs]
+
+
+def _scale_chunk(colordefs: Tuple[str, ...], kwargs: Dict[str, Any], positions: Sequence[float]) -> List[Any]:
+    from .scale import ColorScale
+    scale = ColorScale(list(colordefs), **kwargs)
+    return [scale[pos] for pos in positions]
+
+
+def _palette(name: str, n: int = None) -> List[Any]:
+    from .colors import Color
+    from .palette import get_palette, get_scale
+    if n is None:
+        return [Color(cdef) for cdef in get_palette(name)]
+
+    return get_scale(name).samples(n)
+
+
+def _scheme_chunk(colordefs: Sequence[Any], scheme: str, wheel: str, adjust: bool) -> List[Any]:
+    from .colors import Color
+    from . import schemes
+    cwheel = getattr(schemes, wheel.upper())
+    return cwheel.batch([Color(cdef) for cdef in colordefs], scheme, adjust)
+
+
+class ColorPool:
+    """Runs color work in a thread (`kind="thread"`) or process pool
+
+    - `max_workers`: size of the pool
+    - `limit`: maximum number of chunks running at once (defaults to `max_workers` or 4)
+    - `chunksize`: number of items sent to a worker at once
+
+    Usage:
+
+        async with ColorPool("process") as pool:
+            hexes = await pool.convert(colordefs, "lhex")
+    """
+
+    def __init__(self, kind: str = "thread", max_workers: int = None, limit: int = None, chunksize: int = 256):
+        if kind not in ["thread", "process"]:
+            raise ValueError(f"Unknown pool kind '{kind}'")
+
+        self.kind = kind
+        self.max_workers = max_workers
+        self.limit = limit or max_workers or 4
+        self.chunksize = chunksize
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Run `fn(*args)` in the pool, respecting the concurrency limit"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore
+        if semaphore is None or self._loop is not loop:
+            # bound to the running loop, a new one for every loop the pool is used in
+            semaphore = self._semaphore = asyncio.Semaphore(self.limit)
+            self._loop = loop
+
+        async with semaphore:
+            return await loop.run_in_executor(self.executor, partial(fn, *args))
+
+    async def map_chunks(self, fn: Callable, items: Sequence[Any]) -> List[Any]:
+        """Run `fn(chunk)` for every chunk of `items`, returns the concatenated results in order"""
+        items = list(items)
+        chunks = [items[i:i + self.chunksize] for i in range(0, len(items), self.chunksize)]
+        results = await asyncio.gather(*(self.run(fn, chunk) for chunk in chunks))
+
+        return [result for chunk in results for result in chunk]
+
+    async def convert(self, colordefs: Sequence[Any], fmt: str = "lhex") -> List[Any]:
+        """Convert many color definitions to `fmt` (any `Color` attribute)"""
+        return await self.map_chunks(partial(_convert_chunk, fmt=fmt), colordefs)
+
+    async def map_scale(self, colordefs: Sequence[Any], positions: Sequence[float], **kwargs) -> List[Any]:
+        """Colors of the scale (built from `colordefs` and `kwargs`) at the given positions"""
+        colordefs = tuple(getattr(cdef, "lhexa", cdef) for cdef in colordefs)
+        return await self.map_chunks(partial(_scale_chunk, colordefs, kwargs), positions)
+
+    async def palette(self, name: str, n: int = None) -> List[Any]:
+        """Colors of the named palette, or `n` samples of its scale"""
+        return await self.run(_palette, name, n)
+
+    async def schemes(self, colordefs: Sequence[Any], scheme: str = "triad", wheel: str = "ryb", adjust: bool = True) -> List[Any]:
+        """Color scheme of every base color (see `ColorWheel.batch`)"""
+        return await self.map_chunks(partial(_scheme_chunk, scheme=scheme, wheel=wheel, adjust=adjust), colordefs)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+
+class AsyncClient:
+    """asyncio client of the color service (see `repacolors.service.Client`)
+
+    Requests of concurrent tasks are sent one batch at a time, so the
+    responses can't get mixed up.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or default_socket_path()
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def _connection(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self._reader is None or self._writer is None:
+            self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+
+        return self._reader, self._writer
+
+    async def connect(self):
+        await self._connection()
+        return self
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+            self._reader = self._writer = None
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def request(self, command: str, *args: str) -> List[str]:
+        return (await self.batch([(command,) + args]))[0]
+
+    async def batch(self, requests: Sequence[Sequence[str]]) -> List[List[str]]:
+        """Send all the requests at once, then read the responses"""
+        data = b"".join(encode_request(*request) for request in requests)
+        if self._lock is None:
+            # created lazily, to be bound to the running loop
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            reader, writer = await self._connection()
+            try:
+                writer.write(data)
+                await writer.drain()
+                lines = [await reader.readline() for _ in range(data.count(b"\n"))]
+            except BaseException:
+                # cancelled / failed in the middle of a batch, the responses
+                # of the next batch would be out of sync - reconnect next time
+                writer.close()
+                self._reader = self._writer = None
+                raise
+
+        return [decode_response(line.decode("utf-8")) for line in lines]
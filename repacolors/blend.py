@@ -2,7 +2,7 @@
 https://en.wikipedia.org/wiki/Blend_modes
 """
 from . import colors
-from .types import RGBTuple
+from .types import RGBTuple, CTuple
 
 
 def _normal(fgv: float, bgv: float) -> float:
@@ -65,13 +65,31 @@ def blend(fg: "colors.Color", bg: "colors.Color", mode: str = "normal", gamma: f
         else:
             gamma = 1.0
 
-    blendfn = BLEND_MODES[mode]
+    blended = blend_rgb(fg.rgb, bg.rgb, fg.alpha, mode, gamma)
 
-    blended = RGBTuple(
+    return colors.Color(blended, bg.alpha)
+
+
+def blend_rgb(fg: CTuple, bg: CTuple, alpha: float = 1.0, mode: str = "normal", gamma: float = None) -> RGBTuple:
+    """Blend plain RGB tuples, without creating `Color` objects
+
+    Same as `blend`, but `fg` and `bg` are (r, g, b) tuples in [0, 1] range and
+    the alpha of the foreground is given separately.
+    """
+    blendfn = BLEND_MODES.get(mode, _normal)
+
+    if gamma is None:
+        gamma = 2.2 if blendfn is _normal else 1.0
+
+    if blendfn is _normal:
+        if alpha == 1:
+            return RGBTuple(*fg[:3])
+        if alpha == 0:
+            return RGBTuple(*bg[:3])
+
+    return RGBTuple(
         *tuple(
-            (fg.alpha * blendfn(fgv, bgv) ** gamma + (1 - fg.alpha) * bgv ** gamma) ** (1 / gamma)
-            for fgv, bgv in zip(fg.rgb, bg.rgb)
+            (alpha * blendfn(fgv, bgv) ** gamma + (1 - alpha) * bgv ** gamma) ** (1 / gamma)
+            for fgv, bgv in zip(fg[:3], bg[:3])
         )
     )
-
-    return colors.Color(blended, bg.alpha)
@@ -0,0 +1,209 @@
+"""On-disk cache
+
+The cache directory is `$REPACOLORS_CACHE_DIR`, or `repacolors` in the XDG
+cache directory (`$XDG_CACHE_HOME`, `~/.cache` by default).
+
+`ArtifactCache` stores compiled binary data (the lookup tables of color
+scales, the ANSI quantization tables) shared by processes. It is used by the
+library only if enabled, with `enable()` or the `REPACOLORS_CACHE=1`
+environment variable.
+
+Artifact file format (little-endian): magic (`RPCA`), format version (uint16),
+reserved (uint16), payload length (uint64), CRC32 of the payload (uint32),
+payload.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from typing import Optional
+
+
+def cache_dir(create: bool = True) -> str:
+    """Path of the cache directory, created if needed"""
+    path = os.environ.get("REPACOLORS_CACHE_DIR")
+    if not path:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        path = os.path.join(base, "repacolors")
+
+    if create:
+        os.makedirs(path, exist_ok=True)
+
+    return path
+
+
+def atomic_write(path: str, data: bytes):
+    """Write `data` to `path`, readers see either the old or the new content"""
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+MAGIC = b"RPCA"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQI")
+
+# default size limit of the artifacts (bytes)
+MAX_SIZE = 64 * 1024 * 1024
+
+
+class ArtifactCache:
+    """Versioned, checksummed binary artifacts in `directory`
+
+    Writes are atomic, so concurrent processes can share the cache. Loaded
+    artifacts are memory mapped. The least recently used artifacts are
+    removed when the total size exceeds `max_size`.
+    """
+
+    def __init__(self, directory: str = None, max_size: int = MAX_SIZE):
+        self.directory = directory or os.path.join(cache_dir(), "artifacts")
+        self.max_size = max_size
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.bin")
+
+    @staticmethod
+    def _payload(data) -> Optional[memoryview]:
+        """The payload of the artifact file content `data`, `None` if invalid"""
+        if len(data) < HEADER.size:
+            return None
+
+        magic, version, _, length, crc = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION or len(data) != HEADER.size + length:
+            return None
+
+        view = memoryview(data)[HEADER.size:]
+        if zlib.crc32(view) != crc:
+            view.release()
+            return None
+
+        return view
+
+    @staticmethod
+    def _touch(path: str):
+        try:
+            # last use, for the LRU eviction
+            os.utime(path)
+        except OSError:
+            pass
+
+    def load(self, key: str) -> Optional[memoryview]:
+        """The memory mapped payload of the artifact `key`, `None` if missing or invalid
+
+        The file stays mapped while the returned view is alive, use it for
+        tables that are used as they are (no copying).
+        """
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # missing or empty
+            return None
+
+        payload = self._payload(data)
+        if payload is None:
+            data.close()
+            self._remove(path)
+            return None
+
+        self._touch(path)
+        return payload
+
+    def read(self, key: str) -> Optional[bytes]:
+        """The payload of the artifact `key` (read into memory), `None` if missing or invalid"""
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        payload = self._payload(data)
+        if payload is None:
+            self._remove(path)
+            return None
+
+        self._touch(path)
+        with payload:
+            return payload.tobytes()
+
+    def store(self, key: str, payload: bytes):
+        """Store the artifact `key` (atomically), evicts old artifacts if needed"""
+        header = HEADER.pack(MAGIC, VERSION, 0, len(payload), zlib.crc32(payload))
+        atomic_write(self.path(key), header + bytes(payload))
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used artifacts above `max_size`"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".bin"):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".bin"):
+                self._remove(os.path.join(self.directory, name))
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+_ARTIFACTS: Optional[ArtifactCache] = None
+_ENABLED: Optional[bool] = None
+
+
+def enable(directory: str = None, max_size: int = MAX_SIZE) -> ArtifactCache:
+    """Use the artifact cache (in `directory`, defaults to the cache directory)"""
+    global _ARTIFACTS, _ENABLED
+
+    _ARTIFACTS = ArtifactCache(directory, max_size)
+    _ENABLED = True
+    return _ARTIFACTS
+
+
+def disable():
+    global _ARTIFACTS, _ENABLED
+
+    _ARTIFACTS = None
+    _ENABLED = False
+
+
+def artifacts() -> Optional[ArtifactCache]:
+    """The artifact cache if it's enabled, `None` otherwise"""
+    global _ENABLED
+
+    if _ENABLED is None:
+        if os.environ.get("REPACOLORS_CACHE", "") in ("1", "true", "yes"):
+            enable()
+        else:
+            _ENABLED = False
+
+    return _ARTIFACTS
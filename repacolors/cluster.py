@@ -0,0 +1,225 @@
+"""Clustering of colors in CIELAB
+
+`kmeans` finds `k` representative colors of a (weighted) color set, with
+k-means++ initialisation and an optional mini-batch mode for big inputs. The
+assignment step can run in worker processes.
+
+    colors = kmeans(image_colors, 8, seed=1)  # [(Color, weight), ...]
+    theme(image_colors, 8)                    # Theme of the clusters
+"""
+
+import random
+from itertools import accumulate
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+from .colorarray import ColorArray
+from .colors import Color
+from .distance import distance_squared
+from .scale import ColorScale
+from .themes import Theme
+from .types import *
+
+# points of the worker process, set by `_init_worker`
+_POINTS: List[LabTuple] = []
+_WEIGHTS: List[float] = []
+
+
+def _lab_points(colors: Iterable[Any]) -> List[LabTuple]:
+    if isinstance(colors, ColorArray):
+        return [LabTuple(*t) for t in colors.to("lab").tuples()]
+
+    return [c.lab if isinstance(c, Color) else LabTuple(*c[:3]) for c in colors]
+
+
+def _nearest(point: LabTuple, centers: Sequence[LabTuple]) -> Tuple[int, float]:
+    best, best_dist = 0, float("inf")
+    for i, center in enumerate(centers):
+        dist = distance_squared(point, center)
+        if dist < best_dist:
+            best, best_dist = i, dist
+
+    return best, best_dist
+
+
+def _assign(points: Sequence[LabTuple], weights: Sequence[float], centers: Sequence[LabTuple]) -> Tuple[List[List[float]], float]:
+    """Weighted sums (L, a, b, weight) of the points nearest to each center, and the inertia"""
+    sums = [[0.0, 0.0, 0.0, 0.0] for _ in centers]
+    indexed = list(enumerate(centers))
+    inertia = 0.0
+    for (l, a, b), weight in zip(points, weights):
+        # inlined `_nearest`, this is the hot loop
+        best, best_dist = 0, float("inf")
+        for i, (cl, ca, cb) in indexed:
+            dist = (l - cl) * (l - cl) + (a - ca) * (a - ca) + (b - cb) * (b - cb)
+            if dist < best_dist:
+                best, best_dist = i, dist
+
+        acc = sums[best]
+        acc[0] += l * weight
+        acc[1] += a * weight
+        acc[2] += b * weight
+        acc[3] += weight
+        inertia += best_dist * weight
+
+    return sums, inertia
+
+
+def _init_worker(points: List[LabTuple], weights: List[float]):
+    global _POINTS, _WEIGHTS
+    _POINTS, _WEIGHTS = points, weights
+
+
+def _assign_range(start: int, end: int, centers: Sequence[LabTuple]) -> Tuple[List[List[float]], float]:
+    return _assign(_POINTS[start:end], _WEIGHTS[start:end], centers)
+
+
+class _Assigner:
+    """Assignment step, split across `jobs` processes"""
+
+    def __init__(self, points: List[LabTuple], weights: List[float], jobs: int = 1):
+        self.points = points
+        self.weights = weights
+        self.jobs = jobs
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if jobs > 1 and len(points) >= jobs * 64:
+            self._executor = ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(points, weights))
+
+    def __call__(self, centers: Sequence[LabTuple]) -> Tuple[List[List[float]], float]:
+        if self._executor is None:
+            return _assign(self.points, self.weights, centers)
+
+        size = -(-len(self.points) // self.jobs)
+        futures = [
+            self._executor.submit(_assign_range, start, start + size, list(centers))
+            for start in range(0, len(self.points), size)
+        ]
+
+        sums = [[0.0, 0.0, 0.0, 0.0] for _ in centers]
+        inertia = 0.0
+        for future in futures:
+            part, part_inertia = future.result()
+            for acc, values in zip(sums, part):
+                for j in range(4):
+                    acc[j] += values[j]
+            inertia += part_inertia
+
+        return sums, inertia
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+
+
+def kmeans_plusplus(points: Sequence[LabTuple], weights: Sequence[float], k: int, rng: random.Random) -> List[LabTuple]:
+    """k-means++ initial centers: far from each other, in dense regions"""
+    centers = [rng.choices(points, cum_weights=list(accumulate(weights)))[0]]
+    dists = [distance_squared(p, centers[0]) for p in points]
+
+    while len(centers) < k:
+        cum_probs = list(accumulate(d * w for d, w in zip(dists, weights)))
+        if not cum_probs[-1]:
+            break
+
+        center = rng.choices(points, cum_weights=cum_probs)[0]
+        centers.append(center)
+        dists = [min(d, distance_squared(p, center)) for d, p in zip(dists, points)]
+
+    return centers
+
+
+def _shift(old: Sequence[LabTuple], new: Sequence[LabTuple]) -> float:
+    return max(distance_squared(o, n) for o, n in zip(old, new)) ** .5
+
+
+def _minibatch(points, weights, centers, batch_size, max_iter, tolerance, rng) -> List[LabTuple]:
+    """Mini-batch k-means (Sculley), weighted sampling of the points"""
+    centers = [list(c) for c in centers]
+    counts = [0] * len(centers)
+    # computed once, `choices` would build it on every call
+    cum_weights = list(accumulate(weights))
+
+    for _ in range(max_iter):
+        old = [LabTuple(*c) for c in centers]
+        for point in rng.choices(points, cum_weights=cum_weights, k=batch_size):
+            i, _ = _nearest(point, old)
+            counts[i] += 1
+            rate = 1 / counts[i]
+            center = centers[i]
+            for j in range(3):
+                center[j] += (point[j] - center[j]) * rate
+
+        if _shift(old, [LabTuple(*c) for c in centers]) < tolerance:
+            break
+
+    return [LabTuple(*c) for c in centers]
+
+
+def kmeans(
+    colors: Iterable[Any],
+    k: int = 8,
+    weights: Sequence[float] = None,
+    max_iter: int = 100,
+    tolerance: float = 1e-3,
+    seed: Any = None,
+    jobs: int = 1,
+    batch_size: int = None,
+) -> List[Tuple[Color, float]]:
+    """k-means clustering of the colors in CIELAB (CIE76 distance)
+
+    - `colors`: `Color`s, Lab tuples or a `ColorArray`
+    - `weights`: weight of the colors (e.g. pixel counts of a histogram)
+    - `tolerance`: stops when the centers move less than this (Lab units)
+    - `seed`: random seed, the result is deterministic with the same seed
+    - `jobs`: number of processes for the assignment step
+    - `batch_size`: mini-batch mode, updates the centers from `batch_size`
+      random samples per iteration (only the final assignment uses all the points)
+
+    Returns the mean colors of the (non-empty) clusters and their weights
+    (sum: 1), the most weighted first.
+    """
+    points = _lab_points(colors)
+    weights = [1.0] * len(points) if weights is None else list(weights)
+    if len(weights) != len(points):
+        raise ValueError("Number of weights should match the number of colors")
+    if not points:
+        return []
+
+    rng = random.Random(seed)  # nosec
+    centers = kmeans_plusplus(points, weights, k, rng)
+    assign = _Assigner(points, weights, jobs)
+    try:
+        if batch_size:
+            centers = _minibatch(points, weights, centers, batch_size, max_iter, tolerance, rng)
+            sums, _ = assign(centers)
+        else:
+            for _ in range(max_iter):
+                sums, _ = assign(centers)
+                new = [
+                    LabTuple(acc[0] / acc[3], acc[1] / acc[3], acc[2] / acc[3]) if acc[3] else center
+                    for acc, center in zip(sums, centers)
+                ]
+                moved = _shift(centers, new)
+                centers = new
+                if moved < tolerance:
+                    break
+            sums, _ = assign(centers)
+    finally:
+        assign.close()
+
+    total = sum(acc[3] for acc in sums)
+    clusters = [
+        (Color(LabTuple(acc[0] / acc[3], acc[1] / acc[3], acc[2] / acc[3])), acc[3] / total)
+        for acc in sums if acc[3]
+    ]
+
+    return sorted(clusters, key=lambda cw: -cw[1])
+
+
+def theme(colors: Iterable[Any], k: int = 8, **kwargs) -> Theme:
+    """Theme of the `k` cluster colors (most weighted first), see `kmeans`"""
+    return Theme([color.lhex for color, _ in kmeans(colors, k, **kwargs)])
+
+
+def scale(colors: Iterable[Any], k: int = 8, **kwargs) -> ColorScale:
+    """Color scale of the `k` cluster colors ordered by lightness, see `kmeans`"""
+    return ColorScale(sorted((color for color, _ in kmeans(colors, k, **kwargs)), key=lambda c: c.cie_l))
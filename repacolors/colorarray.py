@@ -0,0 +1,265 @@
+"""Arrays of colors
+
+`ColorArray` stores the channel values of many colors in a flat `array("d")`
+in one color space, the `Color` objects are created only when the items are
+accessed. `from_buffer` wraps raw pixel data (screenshots, frame dumps)
+without copying it.
+"""
+
+from array import array
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Type, Union
+from . import convert
+from . import ops
+from . import pixels
+from .colors import Color
+from .types import *
+
+
+def _converter(src: str, dst: str):
+    """Conversion function between two color spaces (through RGB)"""
+    if src == dst:
+        return None
+
+    direct = getattr(convert, f"{src}2{dst}", None)
+    if direct is not None:
+        return direct
+
+    to_rgb = (lambda c: c) if src == "rgb" else getattr(convert, f"{src}2rgb")
+    from_rgb = (lambda c: c) if dst == "rgb" else getattr(convert, f"rgb2{dst}")
+
+    return lambda c: from_rgb(to_rgb(c))
+
+
+def _doubles(values: Iterable[float]) -> array:
+    """`values` as an `array("d")`, not copied if it's already one"""
+    if isinstance(values, array):
+        return values
+
+    return array("d", values)
+
+
+class ColorArray(Sequence):
+    """Colors as flat channel values in the color space `cspace`
+
+    - `values`: the channel values, `len(values) == len(array) * channels`
+    - `alpha`: alpha values, `None` if all the colors are opaque
+
+    Usage:
+
+        carr = ColorArray.from_colors([Color("red"), Color("#0f08")], "lab")
+        carr[1]            # <Color lime - ...>
+        list(carr.tuples())  # [LabTuple(...), LabTuple(...)]
+    """
+
+    def __init__(self, values: Iterable[float] = (), cspace: str = "rgb", alpha: Iterable[float] = None):
+        if cspace not in COLORSPACES:
+            raise ValueError(f"Unknown color space '{cspace}'")
+
+        self.cspace = cspace
+        self.ctype: Type[Any] = COLORSPACES[cspace]
+        self.channels = channels(cspace)
+        self._values = _doubles(values)
+        if len(self._values) % self.channels:
+            raise ValueError(f"Number of values should be a multiple of {self.channels}")
+
+        self._alpha = None if alpha is None else _doubles(alpha)
+        if self._alpha is not None and len(self._alpha) != len(self):
+            raise ValueError("Number of alpha values should match the number of colors")
+
+    @classmethod
+    def from_tuples(cls, tuples: Iterable[Sequence[float]], cspace: str = "rgb", alpha: Iterable[float] = None) -> "ColorArray":
+        values = array("d")
+        for t in tuples:
+            values.extend(t)
+
+        return cls(values, cspace, alpha)
+
+    @classmethod
+    def from_colors(cls, colors: Iterable[Any], cspace: str = "rgb") -> "ColorArray":
+        values, alpha = array("d"), array("d")
+        for c in colors:
+            c = Color(c)
+            values.extend(getattr(c, cspace))
+            alpha.append(c.alpha)
+
+        return cls(values, cspace, alpha if any(a != 1 for a in alpha) else None)
+
+    @property
+    def values(self) -> array:
+        """The flat channel values"""
+        return self._values
+
+    @property
+    def alpha(self) -> Optional[array]:
+        return self._alpha
+
+    def __len__(self) -> int:
+        return len(self._values) // self.channels
+
+    def _tuple(self, i: int) -> CTuple:
+        return self.ctype(*self._values[i * self.channels:(i + 1) * self.channels])
+
+    def __getitem__(self, i: Union[int, slice]) -> Any:
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            values = array("d")
+            for j in range(start, stop, step):
+                values.extend(self._tuple(j))
+            alpha = None if self._alpha is None else self._alpha[i]
+
+            return ColorArray(values, self.cspace, alpha)
+
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("ColorArray index out of range")
+
+        return Color(self._tuple(i), 1.0 if self._alpha is None else self._alpha[i])
+
+    def __iter__(self) -> Iterator[Color]:
+        alpha = self._alpha if self._alpha is not None else [1.0] * len(self)
+        return (Color(t, a) for t, a in zip(self.tuples(), alpha))
+
+    def tuples(self) -> Iterator[CTuple]:
+        """The colors as (named) tuples, without creating `Color` objects"""
+        ctype, channels, values = self.ctype, self.channels, self._values
+        return (ctype(*values[i:i + channels]) for i in range(0, len(values), channels))
+
+    def to(self, cspace: str) -> "ColorArray":
+        """The colors in the color space `cspace`"""
+        converter = _converter(self.cspace, cspace)
+        if converter is None:
+            return self
+
+        return ColorArray.from_tuples((converter(t) for t in self.tuples()), cspace, self._alpha)
+
+    def hexes(self) -> List[str]:
+        """`#rrggbb` values of the colors"""
+        return [convert.rgb2hex(t, True) for t in self.to("rgb").tuples()]
+
+    def normalize(self) -> "ColorArray":
+        """The colors clamped to the valid range of the color space"""
+        return ops.normalize_array(self)
+
+    def __add__(self, other):
+        return ops.add(self, other)
+
+    def __sub__(self, other):
+        return ops.sub(self, other)
+
+    def __mul__(self, other):
+        return ops.mul(self, other)
+
+    def __truediv__(self, other):
+        return ops.div(self, other)
+
+    def __radd__(self, other):
+        return ops.add(other, self)
+
+    def __rsub__(self, other):
+        return ops.sub(other, self)
+
+    def __rmul__(self, other):
+        return ops.mul(other, self)
+
+    def __rtruediv__(self, other):
+        return ops.div(other, self)
+
+    def __repr__(self) -> str:
+        return f"<ColorArray {self.cspace} [{len(self)}]>"
+
+
+class BufferArray(ColorArray):
+    """RGB colors of a raw pixel buffer, without copying it (see `from_buffer`)"""
+
+    def __init__(self, buf, byteorder: str = "BGRX", width: int = None, height: int = 1, stride: int = None):
+        self.byteorder = byteorder.upper()
+        self._offsets = pixels.channel_offsets(self.byteorder)
+        self.psize = len(self.byteorder)
+        self._view = memoryview(buf).cast("B")
+        if width is None:
+            width = len(self._view) // (height * self.psize)
+
+        self.width = width
+        self.height = height
+        self.stride = stride or width * self.psize
+        if len(self._view) < self.stride * (height - 1) + width * self.psize:
+            raise ValueError("Buffer too small")
+
+        self.cspace = "rgb"
+        self.ctype = RGBTuple
+        self.channels = 3
+
+    def __len__(self) -> int:
+        return self.width * self.height
+
+    @property
+    def values(self) -> array:
+        values = array("d")
+        for t in self.tuples():
+            values.extend(t)
+        return values
+
+    @property
+    def alpha(self) -> Optional[array]:
+        if "A" not in self._offsets:
+            return None
+
+        ao, psize = self._offsets["A"], self.psize
+        return array("d", (a / 255 for row in self._rows() for a in row[ao::psize]))
+
+    @property
+    def _alpha(self):
+        return self.alpha
+
+    def _rows(self) -> Iterator[memoryview]:
+        linelen = self.width * self.psize
+        for y in range(self.height):
+            yield self._view[y * self.stride:y * self.stride + linelen]
+
+    def _pos(self, i: int) -> int:
+        y, x = divmod(i, self.width)
+        return y * self.stride + x * self.psize
+
+    def _tuple(self, i: int) -> RGBTuple:
+        pos, view, offsets = self._pos(i), self._view, self._offsets
+        return RGBTuple(view[pos + offsets["R"]] / 255, view[pos + offsets["G"]] / 255, view[pos + offsets["B"]] / 255)
+
+    def __getitem__(self, i: Union[int, slice]) -> Any:
+        if isinstance(i, int) and "A" in self._offsets:
+            if i < 0:
+                i += len(self)
+            if not 0 <= i < len(self):
+                raise IndexError("BufferArray index out of range")
+            return Color(self._tuple(i), self._view[self._pos(i) + self._offsets["A"]] / 255)
+
+        return super().__getitem__(i)
+
+    def pixel(self, x: int, y: int) -> Color:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"Pixel ({x}, {y}) out of the image")
+
+        return self[y * self.width + x]
+
+    def tuples(self) -> Iterator[RGBTuple]:
+        ro, go, bo = self._offsets["R"], self._offsets["G"], self._offsets["B"]
+        psize = self.psize
+        for row in self._rows():
+            for r, g, b in zip(row[ro::psize], row[go::psize], row[bo::psize]):
+                yield RGBTuple(r / 255, g / 255, b / 255)
+
+    def __repr__(self) -> str:
+        return f"<BufferArray {self.byteorder} {self.width}x{self.height}>"
+
+
+def from_buffer(buf, byteorder: str = "BGRX", width: int = None, height: int = 1, stride: int = None) -> BufferArray:
+    """Colors of the raw pixel data `buf` (`bytes`, `bytearray`, `mmap`, `memoryview`, ...)
+
+    The data is not copied, the pixels are decoded on access.
+
+    - `byteorder`: channels of a pixel, one character per byte (`R`, `G`, `B`,
+      `A`, anything else is padding), e.g. `RGB`, `BGRX`, `RGBA`
+    - `width`, `height`: size of the image (`width` defaults to the whole buffer)
+    - `stride`: length of a row in bytes, if the rows are padded
+    """
+    return BufferArray(buf, byteorder, width, height, stride)
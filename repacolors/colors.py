@@ -1,33 +1,46 @@
-import json
-import os
 import sys
 import math
 import re
 import hashlib
+import heapq
 from itertools import zip_longest
+from functools import lru_cache
 from typing import Dict, Any, Optional, Callable, Iterator, List, Union, Tuple
 from . import convert
 from . import terminal
 from . import distance
 from . import blend
 from . import ops
+from . import contrast
+from . import names
 from .types import *
 
-DIR = os.path.dirname(os.path.realpath(__file__))
-CSSJSON = os.path.join(DIR, "css-color-names.json")
 
-with open(CSSJSON, "r") as f:
-    CSSNAME2HEX = json.load(f)
+@lru_cache(maxsize=1)
+def _css_names() -> Tuple[Dict[str, str], Dict[str, str]]:
+    """CSS color name dicts, built from the name table on first use"""
+    table = names.css_names()
+    name2hx = dict(table.items())
 
-HEX2CSSNAME = dict((hx, name) for name, hx in CSSNAME2HEX.items())
+    return name2hx, dict((name2hx[name], name) for name in name2hx if table.get_name(name2hx[name]) == name)
 
 
-def name2hex(name: str) -> str:
-    return CSSNAME2HEX.get(name, None)
+def __getattr__(name):
+    # CSSNAME2HEX / HEX2CSSNAME are built lazily
+    if name == "CSSNAME2HEX":
+        return _css_names()[0]
+    if name == "HEX2CSSNAME":
+        return _css_names()[1]
 
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 
-def hex2name(hx: str) -> str:
-    return HEX2CSSNAME.get(hx, None)
+
+def name2hex(name: str, table: names.NameTable = None) -> Optional[str]:
+    return (table or names.css_names()).get_hex(name)
+
+
+def hex2name(hx: str, table: names.NameTable = None) -> Optional[str]:
+    return (table or names.css_names()).get_name(hx)
 
 
 # TODO
@@ -48,25 +61,21 @@ def get_color(hx, cspace="rgb", container=COLORCACHE):
     return color
 
 
-# TODO
 def closest(col: CTuple, n: int = 3, cspace: str = "rgb"):
-    named_colors = HEX2CSSNAME.keys()
+    """Closest `n` named colors (except the color itself) to the RGB tuple `col`
+    """
     chx = convert.rgb2hex(RGBTuple(*col), True)
     if cspace != "rgb":
-        col = getattr(convert, f"rgb2{cspace}")(*col)
+        col = getattr(convert, f"rgb2{cspace}")(RGBTuple(*col))
     closests = []
 
-    for nch in named_colors:
+    for nch in _css_names()[1].keys():
         if chx == nch:
             continue
         nc = get_color(nch, cspace)
-        distance = distance.distance(col, nc[cspace])
-        closests.append({"color": nc, "distance": distance})
-        # not the most efficient way, but...
-        closests.sort(key=lambda c: c["distance"])
-        closests = closests[:n]
+        closests.append({"color": nc, "distance": distance.distance(col, nc[cspace])})
 
-    return closests
+    return heapq.nsmallest(n, closests, key=lambda c: c["distance"])
 
 
 class ColorProperty:
@@ -286,19 +295,11 @@ class Color(terminal.TerminalColor):
 
     @staticmethod
     def from_bytes(cbytes: bytes, byteorder: str = "RGB") -> "Color":
-        red = 0
-        green = 0
-        blue = 0
-        alpha = 1.0
-        for i, component in enumerate(byteorder.upper()):
-            if component == "R":
-                red = cbytes[i]
-            elif component == "G":
-                green = cbytes[i]
-            elif component == "B":
-                blue = cbytes[i]
-            elif component == "A":
-                alpha = cbytes[i] / 255
+        """Color of a single pixel, for many pixels see `repacolors.colorarray.from_buffer`"""
+        offsets = {component: i for i, component in enumerate(byteorder.upper())}
+        red, green, blue = (cbytes[offsets[c]] if c in offsets else 0 for c in "RGB")
+        alpha = cbytes[offsets["A"]] / 255 if "A" in offsets else 1.0
+
         return Color(bytes([red, green, blue]), alpha=alpha)
 
     @staticmethod
@@ -438,9 +439,19 @@ class Color(terminal.TerminalColor):
         alpha = self.alpha * (1 - ratio) + color.alpha * ratio
         return Color(newprop, alpha=alpha, cspace=self.cspace)
 
-    def closest_named(self, num: int = 3) -> List["Color"]:
-        # TODO return closest named colors
-        return []
+    def closest_named(self, num: int = 3, table: names.NameTable = None) -> List["Color"]:
+        """Closest named colors (CIE76 distance), except the color itself
+
+        Uses the CSS color names, or the `table` provided (see `repacolors.names`).
+        """
+        table = table or names.css_names()
+        closests = []
+        for name, hx, _ in table.nearest(self.lab, num, exclude=convert.rgb2hex(self.rgb, True)):
+            color = Color(hx)
+            color._name = name
+            closests.append(color)
+
+        return closests
 
     def distance(self, other: "Color") -> float:
         return distance.distance_cie94(self.lab, other.lab)
@@ -652,44 +663,24 @@ class Color(terminal.TerminalColor):
         contrast_ratio > 4.5:1 - AA
         contrast_ratio > 7:1 - AAA
         """
-        l1, l2 = getattr(self, property), getattr(other, property)
+        if property == "cie_y":
+            l1, l2 = self.xyz.y, other.xyz.y
+        else:
+            l1, l2 = getattr(self, property), getattr(other, property)
+
         if l2 > l1:
             l1, l2 = l2, l1
 
         return (l1 + 0.05) / (l2 + 0.05)
 
     def adjust_contrast(self, other: "Color", limit: float = 4.5, epsilon: Optional[float] = None) -> Tuple["Color", "Color"]:
-        # adjust contrast of the given colors to fulfill WCAG requirements
-        # increases/decreases HSL lightness only
-        # first tries to adjust the main color, if the other is too close then changes that too
-        if self.contrast_ratio(other) >= limit:
-            return (self, other)
-
-        if epsilon is None:
-            epsilon = limit / 1000
-
-        lighter = self.cie_y > other.cie_y
-
-        c1 = self
-        c2 = other
-        cr = c1.contrast_ratio(c2)
-        if lighter:
-            increment = epsilon
-        else:
-            increment = -epsilon
-
-        # try to adjust c1
-        while cr < limit and c1.lightness < .999 and c1.lightness > .001:
-            c1 = c1.set(lightness = c1.lightness + increment)
-            cr = c1.contrast_ratio(c2)
+        """Adjust contrast of the given colors to fulfill WCAG requirements
 
-        if cr < limit:
-            # c1 was not enough try to adjust c2 too
-            while cr < limit and c2.lightness < .999 and c2.lightness > .001:
-                c2 = c2.set(lightness = c2.lightness - increment)
-                cr = c1.contrast_ratio(c2)
-
-        return (c1, c2)
+        Increases/decreases HSL lightness only, first tries to adjust the main
+        color, if the other is too close then changes that too.
+        `epsilon` is the precision of the lightness search.
+        """
+        return contrast.adjust_contrast(self, other, limit, epsilon)
 
     def __str__(self):
         return self.hex
@@ -704,25 +695,25 @@ class Color(terminal.TerminalColor):
         return NotImplemented
 
     def __add__(self, other):
-        if isinstance(other, (Color, tuple, float, int)):
+        if isinstance(other, (Color, tuple, float, int)) or ops.is_array(other):
             return ops.add(self, other)
 
         raise TypeError(f"Cannot add '{type(other)}' to 'Color'")
 
     def __sub__(self, other):
-        if isinstance(other, (Color, tuple, float, int)):
+        if isinstance(other, (Color, tuple, float, int)) or ops.is_array(other):
             return ops.sub(self, other)
 
         raise TypeError(f"Cannot substract '{type(other)}' from 'Color'")
 
     def __mul__(self, other):
-        if isinstance(other, (Color, tuple, float, int)):
+        if isinstance(other, (Color, tuple, float, int)) or ops.is_array(other):
             return ops.mul(self, other)
 
         raise TypeError(f"Cannot multiply '{type(other)}' with 'Color'")
 
     def __truediv__(self, other):
-        if isinstance(other, (Color, tuple, float, int)):
+        if isinstance(other, (Color, tuple, float, int)) or ops.is_array(other):
             return ops.div(self, other)
 
         raise TypeError(f"Cannot multiply '{type(other)}' with 'Color'")
@@ -845,7 +836,7 @@ class Color(terminal.TerminalColor):
         return f"{self.termbg}{self.textcolor.termfg} {self.lhex} {self.termreset}"
 
     def print(self, fmt: str = "display", force_ansi: bool = False, stream = sys.stdout):
-        if not force_ansi and not sys.stdout.isatty() and fmt in ["display", "hexdisplay"]:
+        if not force_ansi and not stream.isatty() and fmt in ["display", "hexdisplay"]:
             fmt = "lhex"
 
         content = getattr(self, fmt, self.lhex)
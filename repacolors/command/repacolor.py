@@ -4,16 +4,268 @@ import repacolors.palette
 import repacolors.schemes
 import sys
 import os
+import re
+import csv
+import json
+import struct
 import subprocess  # nosec
+from collections import deque
+from functools import partial, lru_cache
+from itertools import islice
 
+COLORDEF_RE = re.compile(r"[^\s(]+(?:\([^)]*\))?")
 
-def from_stdin():
-    colordef = []
-    # read from stdin
+
+def iter_stdin():
+    # read from stdin lazily, line by line
     for line in sys.stdin:
-        colordef.append(line.strip())
+        yield line.strip()
+
+
+def from_stdin():
+    return list(iter_stdin())
+
+
+def write_lines(lines, stream=None, flush_every=None):
+    """Write the lines as they come, flushing the buffered output every
+    `flush_every` lines (every line for interactive input)
+
+    Exits quietly if the reader closes the pipe (`repacolor ... | head`).
+    """
+    if stream is None:
+        stream = sys.stdout
+    if flush_every is None:
+        flush_every = 1 if sys.stdin.isatty() else 1024
+
+    try:
+        for i, line in enumerate(lines, 1):
+            stream.write(line)
+            stream.write("\n")
+            if i % flush_every == 0:
+                stream.flush()
+        stream.flush()
+    except BrokenPipeError:
+        # python flushes stdout on exit, which would fail again
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, stream.fileno())
+        sys.exit(1)
+
+
+def resolve_format(fmt, force_ansi=False, stream=None):
+    """Fall back to `lhex` for terminal-only formats if the output is not a terminal"""
+    if stream is None:
+        stream = sys.stdout
+    if not force_ansi and not stream.isatty() and fmt in ["display", "hexdisplay"]:
+        return "lhex"
+
+    return fmt
+
+
+@lru_cache(maxsize=4096)
+def _format_colordef(colordef, fmt):
+    c = repacolors.Color(colordef)
+    return getattr(c, fmt, c.lhex)
+
+
+def format_color(colordef, fmt):
+    """Format a color (definition), recently seen color definitions are cached
+    (logs tend to repeat colors)
+    """
+    if isinstance(colordef, str):
+        return _format_colordef(colordef, fmt)
+
+    c = colordef if isinstance(colordef, repacolors.Color) else repacolors.Color(colordef)
+    return getattr(c, fmt, c.lhex)
+
+
+def color_formatter(fmt, force_ansi=False, stream=None):
+    """Return a (picklable) function formatting a color definition with `fmt`,
+    the output is checked for being a terminal only once
+    """
+    return partial(format_color, fmt=resolve_format(fmt, force_ansi, stream))
+
+
+OUTPUT_MODES = ["text", "jsonl", "csv", "raw"]
+DEFAULT_PROPERTIES = "hex,rgb,hsl,lab,lch"
+
+
+@lru_cache(maxsize=8)
+def _get_color(colordef):
+    return repacolors.Color(colordef)
+
+
+def color_property(c, prop, reference=None):
+    if prop == "hex":
+        return c.lhex
+    if prop == "hexa":
+        return c.lhexa
+    if prop == "rgb":
+        return c.rgb256
+    if prop == "contrast":
+        return c.contrast_ratio(_get_color(reference or "#fff"))
+
+    return getattr(c, prop)
+
+
+@lru_cache(maxsize=4096)
+def _colordef_record(colordef, props, reference):
+    c = repacolors.Color(colordef)
+    return tuple(color_property(c, prop, reference) for prop in props)
+
+
+def color_record(colordef, props, reference=None):
+    """Tuple of the requested properties of the color"""
+    if isinstance(colordef, str):
+        return _colordef_record(colordef, props, reference)
+
+    c = colordef if isinstance(colordef, repacolors.Color) else repacolors.Color(colordef)
+    return tuple(color_property(c, prop, reference) for prop in props)
+
+
+def _flatten(record):
+    for value in record:
+        if isinstance(value, tuple):
+            yield from value
+        else:
+            yield value
+
+
+def _raw_struct(props, record):
+    fmt = ["<"]
+    for prop, value in zip(props, record):
+        if prop in ["hex", "hexa"]:
+            fmt.append("4B")
+        elif prop == "rgb":
+            fmt.append("3B")
+        elif isinstance(value, tuple):
+            fmt.append(f"{len(value)}f")
+        elif isinstance(value, (int, float)):
+            fmt.append("f")
+        else:
+            raise click.BadParameter(f"'{prop}' cannot be written in raw mode", param_hint="--props")
+
+    return struct.Struct("".join(fmt))
+
+
+def _raw_values(props, record):
+    for prop, value in zip(props, record):
+        if prop in ["hex", "hexa"]:
+            yield from bytes.fromhex(value[1:9].ljust(8, "f"))
+        elif isinstance(value, tuple):
+            yield from value
+        else:
+            yield value
+
+
+def write_records(records, props, mode, stream=None):
+    """Write color records as JSON lines, CSV (with header) or packed binary
 
-    return colordef
+    raw: little-endian records, `hex`/`hexa` as 4 x uint8 (RGBA), `rgb` as
+    3 x uint8, every other value as float32
+    """
+    if stream is None:
+        stream = sys.stdout
+
+    if mode == "jsonl":
+        write_lines(
+            (json.dumps(dict(zip(props, record)), separators=(",", ":")) for record in records),
+            stream,
+        )
+
+    elif mode == "csv":
+        writer = csv.writer(stream, lineterminator="\n")
+        header = None
+        for record in records:
+            if header is None:
+                header = []
+                for prop, value in zip(props, record):
+                    if isinstance(value, tuple):
+                        fields = getattr(value, "_fields", range(len(value)))
+                        header.extend(f"{prop}_{field}" for field in fields)
+                    else:
+                        header.append(prop)
+                writer.writerow(header)
+            writer.writerow(_flatten(record))
+        stream.flush()
+
+    elif mode == "raw":
+        out = stream.buffer if hasattr(stream, "buffer") else stream
+        packer = None
+        for record in records:
+            if packer is None:
+                packer = _raw_struct(props, record)
+            out.write(packer.pack(*_raw_values(props, record)))
+        out.flush()
+
+
+@lru_cache(maxsize=8)
+def _get_scale(colors):
+    return repacolors.scale.ColorScale(list(colors))
+
+
+def _format_scale_sample(pos, colors, fmt):
+    return format_color(_get_scale(colors)[pos], fmt)
+
+
+def _map_chunk(fn, chunk):
+    return [fn(item) for item in chunk]
+
+
+def ordered_map(fn, items, jobs=1, chunksize=256):
+    """Lazily map `fn` over `items`, in `jobs` worker processes if `jobs` > 1
+
+    Results are yielded in the order of `items`, at most `2 * jobs` chunks are
+    in flight at once, so memory use is bounded even for endless input.
+    `fn` has to be picklable (module level function or `partial` of one).
+    """
+    if jobs <= 1:
+        yield from map(fn, items)
+        return
+
+    # imported only when used, it's slow to import
+    from concurrent.futures import ProcessPoolExecutor
+
+    items = iter(items)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        while True:
+            while len(pending) < 2 * jobs:
+                chunk = list(islice(items, chunksize))
+                if not chunk:
+                    break
+                pending.append(executor.submit(_map_chunk, fn, chunk))
+
+            if not pending:
+                break
+
+            yield from pending.popleft().result()
+
+
+def split_colordefs(line):
+    """Split a line to color definitions - tab separated or whitespace
+    separated outside of parentheses (`rgb(1, 2, 3) #fff`)
+    """
+    if "\t" in line:
+        return [cdef.strip() for cdef in line.split("\t") if cdef.strip()]
+
+    return COLORDEF_RE.findall(line)
+
+
+def contrast_pair(c1):
+    # using #757575 as middle point
+    return repacolors.Color("#fff") if c1.luminance < .178 else repacolors.Color("#000")
+
+
+def _adjust_contrast_line(line, contrast, fmt):
+    colordef = split_colordefs(line)
+    if not colordef:
+        return ""
+
+    c1 = repacolors.Color(colordef[0])
+    c2 = repacolors.Color(colordef[1]) if len(colordef) > 1 else contrast_pair(c1)
+    adjc1, adjc2 = c1.adjust_contrast(c2, contrast)
+
+    return f"{getattr(adjc1, fmt, adjc1.lhex)} {getattr(adjc2, fmt, adjc2.lhex)}"
 
 
 def pick_external(picker="xcolor"):
@@ -31,10 +283,11 @@ def color(ctx):
 @color.command()
 @click.argument("name", nargs=-1)
 @click.option("--format", default="hexdisplay", help="Color format to show.")
-def palette(name, format):
+@click.option("-j", "--jobs", "jobs", default=1, type=int, help="Number of worker processes.")
+def palette(name, format, jobs):
     """Get colors of given palette"""
     if len(name) == 0:
-        names = repacolors.palette.PALETTES.keys()
+        names = repacolors.palette.names()
         click.echo("List of available palette names:")
         click.echo(", ".join(names))
     else:
@@ -45,22 +298,34 @@ def palette(name, format):
             except KeyError:
                 click.echo(f"Palette '{n}' not found.", err=True)
 
-        for cdef in colors:
-            c = repacolors.Color(cdef)
-            c.print(format)
+        write_lines(ordered_map(color_formatter(format), colors, jobs))
 
 
 @color.command()
 @click.argument("colordef", nargs=-1)
 @click.option("--format", default="display", help="Color format to show.")
-def display(colordef, format):
+@click.option("-j", "--jobs", "jobs", default=1, type=int, help="Number of worker processes.")
+@click.option("-o", "--output", "output", default="text", type=click.Choice(OUTPUT_MODES), help="Output mode.")
+@click.option("--props", "props", default=DEFAULT_PROPERTIES, help="Comma separated color properties (for jsonl, csv and raw output).")
+@click.option("--reference", "reference", default="#fff", help="Reference color of the `contrast` property.")
+def display(colordef, format, jobs, output, props, reference):
     """Display information about the provided colors."""
     if len(colordef) == 0:
-        colordef = from_stdin()
+        # stream stdin, skipping empty lines
+        colordef = filter(None, iter_stdin())
 
-    for cdef in colordef:
-        c = repacolors.Color(cdef)
-        c.print(format)
+    if output == "text":
+        write_lines(ordered_map(color_formatter(format), colordef, jobs))
+        return
+
+    props = tuple(prop.strip() for prop in props.split(",") if prop.strip())
+    try:
+        color_record(repacolors.Color(), props, reference)
+    except (AttributeError, TypeError):
+        raise click.BadParameter(f"invalid color property in '{','.join(props)}'", param_hint="--props")
+
+    records = ordered_map(partial(color_record, props=props, reference=reference), colordef, jobs)
+    write_records(records, props, output)
 
 
 @color.command()
@@ -68,8 +333,19 @@ def display(colordef, format):
 @click.option("--contrast", default=4.5, help="Required contrast")
 @click.option("--format", default="display", help="Color format to show.")
 @click.option("-v", "--verbose", "verbose", default=False, is_flag=True, help="Print verbose output.")
-def adjust_contrast(colordef, contrast, format, verbose):
+@click.option("-p", "--pairs", "pairs", default=False, is_flag=True, help="Adjust `fg bg` pairs read line by line from stdin.")
+@click.option("-j", "--jobs", "jobs", default=1, type=int, help="Number of worker processes (with --pairs).")
+def adjust_contrast(colordef, contrast, format, verbose, pairs, jobs):
     """Adjust the colors to match required contrast ratio."""
+    if pairs:
+        if format in ["display", "hexdisplay"] and not sys.stdout.isatty():
+            format = "lhex"
+        elif format == "display":
+            format = "hexdisplay"
+
+        write_lines(ordered_map(partial(_adjust_contrast_line, contrast=contrast, fmt=format), iter_stdin(), jobs))
+        return
+
     # check stdin for more colors
     if len(colordef) < 2 and not sys.stdin.isatty():
         stdincolors = from_stdin()
@@ -82,8 +358,7 @@ def adjust_contrast(colordef, contrast, format, verbose):
     c1 = repacolors.Color(colordef[0])
     # still not enough colors, fall back to black/white
     if len(colordef) < 2:
-        # using #757575 as middle point
-        c2 = repacolors.Color("#fff") if c1.luminance < .178 else repacolors.Color("#000")
+        c2 = contrast_pair(c1)
     else:
         c2 = repacolors.Color(colordef[1])
 
@@ -140,7 +415,10 @@ def colorwheel(name):
 @click.option("-n", "--number", "number", default=1, help="Number of colors to pick.")
 @click.option("-c", "--copy", "copy", default=False, is_flag=True, help="Copy to clipboard (using `xsel`)")
 @click.option("-s", "--scheme", "scheme", default=None, help="Draws color wheel of the given scheme.")
-def pick(format, number, copy, scheme):
+@click.option("-r", "--region", "region", default=1, type=click.IntRange(1), help="Size of the region to pick from (integrated picker).")
+@click.option("-m", "--mode", "mode", default="pixel", type=click.Choice(["pixel", "average", "median"]), help="How to pick from the region.")
+@click.option("-l", "--loupe", "loupe", default=False, is_flag=True, help="Show the magnified region (integrated picker).")
+def pick(format, number, copy, scheme, region, mode, loupe):
     """Pick colors from your desktop."""
     # TODO proper copy to clipboard
 
@@ -156,7 +434,7 @@ def pick(format, number, copy, scheme):
     if not colorpicker:
         try:
             import repacolors.picker
-            colors = repacolors.picker.pick(number)
+            colors = repacolors.picker.pick(number, region, mode, loupe)
         except ImportError:
             pass
 
@@ -180,12 +458,42 @@ def pick(format, number, copy, scheme):
 @click.argument("colors", nargs=-1)
 @click.option("--format", default="display", help="Scale format to show.")
 @click.option("-s", "--steps", "steps", default=None, type=int, help="Number of steps.")
-def scale(colors, format, steps):
+@click.option("-j", "--jobs", "jobs", default=1, type=int, help="Number of worker processes.")
+def scale(colors, format, steps, jobs):
     """Display color scale defined by the colors provided."""
     if len(colors) == 0:
         colors = from_stdin()
-    cscale = repacolors.scale.ColorScale(colors)
-    cscale.print(fmt=format, steps=steps)
+
+    format = resolve_format(format)
+    if format == "display":
+        cscale = repacolors.scale.ColorScale(colors)
+        cscale.print(fmt=format, steps=steps)
+        return
+
+    if steps is None:
+        steps = repacolors.scale.ColorScale.DISPLAY_STEPS
+    steps = max(steps, 2)
+    positions = (i / (steps - 1) for i in range(steps))
+    write_lines(ordered_map(partial(_format_scale_sample, colors=tuple(colors), fmt=format), positions, jobs))
+
+
+@color.command()
+@click.option("--socket", "path", default=None, help="Path of the UNIX socket.")
+def serve(path):
+    """Answer color requests on a UNIX socket (see `repacolors.service`)."""
+    import repacolors.service
+    import signal
+
+    path = path or repacolors.service.default_socket_path()
+    # clean up the socket on `kill` as well
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+    click.echo(f"Listening on {path}", err=True)
+    try:
+        repacolors.service.serve(path)
+    except FileExistsError as err:
+        raise click.ClickException(str(err))
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
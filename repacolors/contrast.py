@@ -0,0 +1,154 @@
+"""WCAG contrast functions for many colors at once
+
+https://www.w3.org/TR/WCAG21/#dfn-contrast-ratio
+"""
+
+from typing import Any, Iterable, List, Optional, Tuple
+from . import colors
+from . import convert
+from .types import *
+
+# minimum contrast ratios
+AA = 4.5
+AAA = 7.0
+AA_LARGE = 3.0
+AAA_LARGE = 4.5
+
+
+def luminance(color: Any) -> float:
+    """Relative luminance (CIE Y) of a color, `Color.cie_y` is cached"""
+    if not isinstance(color, colors.Color):
+        color = colors.Color(color)
+
+    return color.xyz.y
+
+
+def luminances(colorlist: Iterable[Any]) -> List[float]:
+    return [luminance(c) for c in colorlist]
+
+
+def ratio(l1: float, l2: float) -> float:
+    """Contrast ratio of two relative luminances"""
+    if l2 > l1:
+        l1, l2 = l2, l1
+
+    return (l1 + 0.05) / (l2 + 0.05)
+
+
+def contrast_matrix(colors_a: Iterable[Any], colors_b: Iterable[Any] = None) -> List[List[float]]:
+    """Contrast ratios of every color in `colors_a` against every color in `colors_b`
+
+    `matrix[i][j]` is the ratio of `colors_a[i]` and `colors_b[j]`, the
+    luminances are computed only once per color.
+    """
+    lums_a = luminances(colors_a)
+    lums_b = lums_a if colors_b is None else luminances(colors_b)
+    offs_b = [lb + 0.05 for lb in lums_b]
+
+    matrix = []
+    for la in lums_a:
+        oa = la + 0.05
+        matrix.append([oa / ob if oa > ob else ob / oa for ob in offs_b])
+
+    return matrix
+
+
+def passes(matrix: List[List[float]], limit: float = AA) -> List[List[bool]]:
+    """Mask of the pairs in a contrast matrix fulfilling the `limit` (`AA`, `AAA`, ...)"""
+    return [[cr >= limit for cr in row] for row in matrix]
+
+
+def passing_pairs(colors_a: Iterable[Any], colors_b: Iterable[Any] = None, limit: float = AA) -> List[Tuple[int, int]]:
+    """Indices `(i, j)` of the color pairs with contrast ratio >= `limit`"""
+    return [
+        (i, j)
+        for i, row in enumerate(contrast_matrix(colors_a, colors_b))
+        for j, cr in enumerate(row)
+        if cr >= limit
+    ]
+
+
+def _hsl_luminance(hsl: HSLTuple) -> float:
+    return convert.rgb2xyz(convert.hsl2rgb(hsl)).y
+
+
+def solve_lightness(hsl: HSLTuple, target: float, lighter: bool = True, tolerance: float = 1e-4) -> Optional[float]:
+    """HSL lightness closest to `hsl.lightness` where the luminance reaches `target`
+
+    Searches upwards (`lighter`) or downwards by bisection - luminance is
+    monotonic in HSL lightness. Returns `None` if the target is not reachable.
+    """
+    current = hsl.lightness
+    bound = 1.0 if lighter else 0.0
+
+    def reached(lightness):
+        lum = _hsl_luminance(HSLTuple(hsl.hue, hsl.saturation, lightness))
+        return lum >= target if lighter else lum <= target
+
+    if reached(current):
+        return current
+    if not reached(bound):
+        return None
+
+    # `bound` always fulfills the target, `current` never does
+    while abs(bound - current) > tolerance:
+        middle = (current + bound) / 2
+        if reached(middle):
+            bound = middle
+        else:
+            current = middle
+
+    return bound
+
+
+def _target_luminance(lum: float, limit: float, lighter: bool) -> float:
+    if lighter:
+        return limit * (lum + 0.05) - 0.05
+    return (lum + 0.05) / limit - 0.05
+
+
+def adjust_contrast(
+    color1: "colors.Color", color2: "colors.Color", limit: float = AA, tolerance: float = None
+) -> Tuple["colors.Color", "colors.Color"]:
+    """Adjust the contrast of the given colors to reach `limit`
+
+    Changes the HSL lightness of `color1` only, if that is not enough, it
+    changes `color2` too (in the opposite direction).
+    """
+    lum1, lum2 = luminance(color1), luminance(color2)
+    if ratio(lum1, lum2) >= limit:
+        return (color1, color2)
+
+    if tolerance is None:
+        tolerance = 1e-4
+
+    lighter = lum1 > lum2
+
+    # try to adjust color1
+    lightness = solve_lightness(color1.hsl, _target_luminance(lum2, limit, lighter), lighter, tolerance)
+    if lightness is not None:
+        return (color1.set(lightness=lightness), color2)
+
+    # color1 was not enough, adjust color2 too
+    color1 = color1.set(lightness=1.0 if lighter else 0.0)
+    lum1 = luminance(color1)
+    lightness = solve_lightness(color2.hsl, _target_luminance(lum1, limit, not lighter), not lighter, tolerance)
+    if lightness is None:
+        lightness = 0.0 if lighter else 1.0
+
+    return (color1, color2.set(lightness=lightness))
+
+
+def adjust_contrast_many(
+    pairs: Iterable[Tuple[Any, Any]], limit: float = AA, tolerance: float = None
+) -> List[Tuple["colors.Color", "colors.Color"]]:
+    """`adjust_contrast` for many (color1, color2) pairs"""
+    return [
+        adjust_contrast(
+            c1 if isinstance(c1, colors.Color) else colors.Color(c1),
+            c2 if isinstance(c2, colors.Color) else colors.Color(c2),
+            limit,
+            tolerance,
+        )
+        for c1, c2 in pairs
+    ]
@@ -1,7 +1,7 @@
 from .colors import Color
 from .types import RGBTuple
 from .scale import ColorScale, project_domain, linear_ip_f
-from typing import Union, List
+from typing import Union, List, Tuple
 import math
 
 
@@ -78,6 +78,9 @@ class CubeHelix(ColorScale):
             lightness = [lightness, lightness]
         self.luminance_map = [light * 100 for light in lightness]
 
+    def _lut_key(self) -> Tuple:
+        return super()._lut_key() + (self.start, self.rotations, tuple(self.hue))
+
     def _get_color_for_pos(self, pos: float) -> Color:
         projpos = project_domain(pos, self.domain)
 
@@ -20,6 +20,12 @@ def distance(c1: CTuple, c2: CTuple) -> float:
     return ((c1[0] - c2[0]) ** 2 + (c1[1] - c2[1]) ** 2 + (c1[2] - c2[2]) ** 2) ** 0.5
 
 
+def distance_squared(c1: CTuple, c2: CTuple) -> float:
+    """Squared eucledian distance, for comparisons (no square root)"""
+
+    return (c1[0] - c2[0]) ** 2 + (c1[1] - c2[1]) ** 2 + (c1[2] - c2[2]) ** 2
+
+
 def distance_cie94(lab1: LabTuple, lab2: LabTuple, w: Tuple[float, float, float] = Wgraphic) -> float:
     """Color distance - CIE94
     https://en.wikipedia.org/wiki/Color_difference#CIE94
@@ -0,0 +1,283 @@
+"""Color analysis of images
+
+Reads binary PPM (`P6`), PAM (`P7`, RGB / RGB_ALPHA) and raw RGB(A) dumps
+without external decoders. The file is memory mapped and processed in tiles
+(bands of rows), so the memory use doesn't depend on the size of the image.
+
+    img = Image.open("screenshot.ppm")
+    img.dominant_colors(8)   # [(Color, weight), ...]
+    img.theme(8)             # Theme of the dominant colors
+    img.scale(5)             # ColorScale of the dominant colors (by lightness)
+"""
+
+import mmap
+from collections import Counter
+from typing import Dict, Iterator, List, Tuple
+from . import cluster
+from . import convert
+from . import pixels
+from .colorarray import BufferArray
+from .colors import Color
+from .scale import ColorScale
+from .themes import Theme
+from .types import *
+
+# rows of a tile
+TILE_ROWS = 64
+
+
+def _header_tokens(data, pos: int, count: int) -> Tuple[List[bytes], int]:
+    """Read `count` whitespace separated tokens of a PNM header, skips comments"""
+    tokens: List[bytes] = []
+    while len(tokens) < count:
+        while data[pos:pos + 1].isspace():
+            pos += 1
+        if data[pos:pos + 1] == b"#":
+            end = data.find(b"\n", pos)
+            if end < 0:
+                raise ValueError("Unexpected end of header")
+            pos = end + 1
+            continue
+
+        start = pos
+        while pos < len(data) and not data[pos:pos + 1].isspace():
+            pos += 1
+        if start == pos:
+            raise ValueError("Unexpected end of header")
+        tokens.append(data[start:pos])
+
+    # single whitespace after the header
+    return tokens, pos + 1
+
+
+def _parse_ppm(data) -> Tuple[int, int, str, int]:
+    (width, height, maxval), offset = _header_tokens(data, 2, 3)
+    if int(maxval) != 255:
+        raise ValueError("Only 8 bit PPM images are supported")
+
+    return int(width), int(height), "RGB", offset
+
+
+def _parse_pam(data) -> Tuple[int, int, str, int]:
+    end = data.find(b"ENDHDR\n")
+    if end < 0:
+        raise ValueError("Invalid PAM header")
+
+    header = {}
+    for line in bytes(data[3:end]).decode("ascii").split("\n"):
+        if line and not line.startswith("#"):
+            key, _, value = line.partition(" ")
+            header[key] = value.strip()
+
+    depth, maxval = int(header.get("DEPTH", 0)), int(header.get("MAXVAL", 0))
+    if maxval != 255 or depth not in (3, 4):
+        raise ValueError("Only 8 bit RGB / RGB_ALPHA PAM images are supported")
+
+    if "WIDTH" not in header or "HEIGHT" not in header:
+        raise ValueError("Invalid PAM header")
+
+    return int(header["WIDTH"]), int(header["HEIGHT"]), "RGB" if depth == 3 else "RGBA", end + 7
+
+
+class Image:
+    """Memory mapped raw image, see `open` / `open_raw`
+
+    - `buf`: the pixel data (with the header, if any)
+    - `byteorder`: channels of a pixel (see `repacolors.pixels`)
+    - `offset`: position of the pixel data in `buf`
+    """
+
+    def __init__(self, buf, width: int, height: int, byteorder: str = "RGB", stride: int = None, offset: int = 0):
+        self.width = width
+        self.height = height
+        self.byteorder = byteorder.upper()
+        self.psize = len(byteorder)
+        self.stride = stride or width * self.psize
+        self._offsets = pixels.channel_offsets(self.byteorder)
+        with memoryview(buf) as view:
+            size = view.nbytes - offset
+        if size < self.stride * (height - 1) + width * self.psize:
+            raise ValueError("Image data too small")
+
+        self._buf = buf
+        self._view = memoryview(buf).cast("B")[offset:]
+
+    @classmethod
+    def open(cls, path: str) -> "Image":
+        """Open a PPM (`P6`) or PAM (`P7`) image"""
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic = buf[:2]
+            if magic == b"P6":
+                width, height, byteorder, offset = _parse_ppm(buf)
+            elif magic == b"P7":
+                width, height, byteorder, offset = _parse_pam(buf)
+            else:
+                raise ValueError("Unsupported image format, use `open_raw` for raw data")
+
+            return cls(buf, width, height, byteorder, offset=offset)
+        except Exception:
+            buf.close()
+            raise
+
+    @classmethod
+    def open_raw(cls, path: str, width: int, height: int, byteorder: str = "RGB", stride: int = None, offset: int = 0) -> "Image":
+        """Open a raw pixel dump"""
+        with open(path, "rb") as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            return cls(buf, width, height, byteorder, stride, offset)
+        except Exception:
+            buf.close()
+            raise
+
+    def close(self):
+        self._view.release()
+        if isinstance(self._buf, mmap.mmap):
+            try:
+                self._buf.close()
+            except BufferError:
+                # tiles still in use, unmapped when they are released
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def tiles(self, rows: int = TILE_ROWS) -> Iterator[BufferArray]:
+        """The image in bands of `rows` rows (views, no copying)"""
+        for top in range(0, self.height, rows):
+            height = min(rows, self.height - top)
+            yield BufferArray(self._view[top * self.stride:], self.byteorder, self.width, height, self.stride)
+
+    def _rows(self, step: int = 1) -> Iterator[memoryview]:
+        linelen = self.width * self.psize
+        for y in range(0, self.height, step):
+            yield self._view[y * self.stride:y * self.stride + linelen]
+
+    def histogram(self, bits: int = 5, step: int = 1) -> Dict[int, int]:
+        """Number of pixels in the color bins (the top `bits` of the channels)
+
+        The bins are packed `(r << 2 * bits) | (g << bits) | b`, at most
+        `2 ** (3 * bits)` of them. Every `step`th pixel of every `step`th row is
+        counted, transparent pixels are skipped.
+        """
+        shift = 8 - bits
+        ro, go, bo = self._offsets["R"], self._offsets["G"], self._offsets["B"]
+        ao = self._offsets.get("A")
+        pstep = self.psize * step
+        hist: Counter = Counter()
+
+        for row in self._rows(step):
+            reds, greens, blues = row[ro::pstep], row[go::pstep], row[bo::pstep]
+            if ao is None:
+                hist.update(
+                    ((r >> shift) << (2 * bits)) | ((g >> shift) << bits) | (b >> shift)
+                    for r, g, b in zip(reds, greens, blues)
+                )
+            else:
+                hist.update(
+                    ((r >> shift) << (2 * bits)) | ((g >> shift) << bits) | (b >> shift)
+                    for r, g, b, a in zip(reds, greens, blues, row[ao::pstep]) if a
+                )
+
+        return hist
+
+    def dominant_colors(self, k: int = 8, method: str = "median-cut", bits: int = 5, step: int = 1, **kwargs) -> List[Tuple[Color, float]]:
+        """`k` dominant colors of the image with their weights (sum: 1)
+
+        Computed from the quantized histogram (see `histogram`) in Lab, with
+        median cut (`method="median-cut"`) or k-means (`method="kmeans"`, the
+        other arguments are passed to `repacolors.cluster.kmeans`).
+        """
+        bins = histogram_bins(self.histogram(bits, step), bits)
+        if method == "median-cut":
+            return median_cut(bins, k)
+        if method == "kmeans":
+            kwargs.setdefault("seed", 0)
+            return cluster.kmeans([lab for lab, _ in bins], k, weights=[count for _, count in bins], **kwargs)
+
+        raise ValueError(f"Unknown method '{method}'")
+
+    def theme(self, k: int = 8, **kwargs) -> Theme:
+        """Theme of the `k` dominant colors (most common first)"""
+        return Theme([color.lhex for color, _ in self.dominant_colors(k, **kwargs)])
+
+    def scale(self, k: int = 8, **kwargs) -> ColorScale:
+        """Color scale of the `k` dominant colors, ordered by lightness"""
+        colors = sorted((color for color, _ in self.dominant_colors(k, **kwargs)), key=lambda c: c.cie_l)
+        return ColorScale(colors)
+
+
+def histogram_bins(hist: Dict[int, int], bits: int = 5) -> List[Tuple[LabTuple, int]]:
+    """Lab color (the center) and pixel count of the histogram bins"""
+    mask = (1 << bits) - 1
+    size = 1 << (8 - bits)
+
+    def center(v: int) -> float:
+        return ((v << (8 - bits)) + (size - 1) / 2) / 255
+
+    return [
+        (convert.rgb2lab(RGBTuple(center(key >> (2 * bits)), center((key >> bits) & mask), center(key & mask))), count)
+        for key, count in hist.items()
+    ]
+
+
+def _weighted_mean(bins: List[Tuple[LabTuple, int]]) -> Tuple[LabTuple, int]:
+    total = sum(count for _, count in bins)
+    mean = LabTuple(*(sum(lab[i] * count for lab, count in bins) / total for i in range(3)))
+
+    return mean, total
+
+
+def median_cut(bins: List[Tuple[LabTuple, int]], k: int = 8) -> List[Tuple[Color, float]]:
+    """Median cut of weighted Lab colors into (at most) `k` boxes
+
+    The box with the widest (weighted) range is split at the weighted median
+    until there are `k` boxes. Returns the mean color of the boxes and their
+    weights, most common first.
+    """
+    if not bins:
+        return []
+
+    def widest(box):
+        return max(range(3), key=lambda i: max(lab[i] for lab, _ in box) - min(lab[i] for lab, _ in box))
+
+    def spread(box):
+        axis = widest(box)
+        extent = max(lab[axis] for lab, _ in box) - min(lab[axis] for lab, _ in box)
+        return extent * sum(count for _, count in box)
+
+    boxes = [bins]
+    while len(boxes) < k:
+        splittable = [box for box in boxes if len(box) > 1]
+        if not splittable:
+            break
+
+        target = max(splittable, key=spread)
+        axis = widest(target)
+        box = sorted(target, key=lambda b: b[0][axis])
+
+        half = sum(count for _, count in box) / 2
+        acc = 0
+        for cut, (_, count) in enumerate(box, 1):
+            acc += count
+            if acc >= half:
+                break
+        cut = min(cut, len(box) - 1)
+
+        boxes = [b for b in boxes if b is not target]
+        boxes.extend([box[:cut], box[cut:]])
+
+    means = [_weighted_mean(box) for box in boxes]
+    total = sum(count for _, count in means)
+
+    return sorted(
+        ((Color(lab), count / total) for lab, count in means),
+        key=lambda cw: -cw[1]
+    )
@@ -0,0 +1,274 @@
+"""Named color tables
+
+The tables are compact binary files, memory mapped on load, so looking up a
+name, a hex value or the nearest named colors doesn't need to parse JSON or to
+create a python object for every entry. The CSS table (`css-color-names.bin`)
+is generated from `css-color-names.json` by the build step:
+
+    $ python -m repacolors.names [source.json [target.bin]]
+
+User tables can be built with `build` / `write` from any `name -> hex`
+mapping, and loaded with `NameTable.open`.
+
+File format (little-endian, `n` entries, sorted by name):
+
+- header: magic (`RPCN`), version (uint16), reserved (uint16), `n` (uint32),
+  size of the names block (uint32)
+- name offsets: `n + 1` uint32 into the names block
+- colors: `n` uint32, packed RGB (`0xRRGGBB`)
+- Lab values: `n * 3` float32
+- hex index: `n` uint32 entry indices sorted by color, the preferred name of
+  a color (the last one in the source) comes first
+- names block: UTF-8 names
+"""
+
+import mmap
+import os
+import struct
+import sys
+import heapq
+from array import array
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+from . import convert
+from .types import *
+
+DIR = os.path.dirname(os.path.realpath(__file__))
+CSSJSON = os.path.join(DIR, "css-color-names.json")
+CSSTABLE = os.path.join(DIR, "css-color-names.bin")
+
+MAGIC = b"RPCN"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+
+
+def _column(buf: memoryview, typecode: str) -> Union[memoryview, array]:
+    """uint32 / float32 column of the (little-endian) table"""
+    if sys.byteorder == "little":
+        return buf.cast(typecode)
+
+    column = array(typecode, buf.tobytes())
+    column.byteswap()
+    return column
+
+
+def _packed(hx: str) -> Optional[int]:
+    """`#rrggbb` or `#rgb` as `0xRRGGBB`"""
+    if not isinstance(hx, str) or not hx.startswith("#"):
+        return None
+
+    hx = hx[1:]
+    if len(hx) == 3:
+        hx = "".join(c * 2 for c in hx)
+    if len(hx) != 6:
+        return None
+
+    try:
+        return int(hx, 16)
+    except ValueError:
+        return None
+
+
+class NameTable:
+    """Named color table backed by a buffer in the binary format (see `build`)
+
+    Usage:
+
+        table = NameTable.open("mycolors.bin")
+        table.get_hex("brand-red")        # "#e10600"
+        table.get_name("#e10600")         # "brand-red"
+        table.nearest(Color("#e00").lab)  # [("brand-red", "#e10600", 1.83), ...]
+    """
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        view = memoryview(buffer)
+        magic, version, _, count, names_size = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("Not a repacolors name table")
+        if version != VERSION:
+            raise ValueError(f"Unsupported name table version {version}")
+
+        self.count = count
+        pos = HEADER.size
+        sizes = [(count + 1) * 4, count * 4, count * 12, count * 4, names_size]
+        if len(view) < pos + sum(sizes):
+            raise ValueError("Truncated name table")
+
+        columns = []
+        for size in sizes:
+            columns.append(view[pos:pos + size])
+            pos += size
+
+        self._offsets = _column(columns[0], "I")
+        self._rgb = _column(columns[1], "I")
+        self._lab = _column(columns[2], "f")
+        self._hexindex = _column(columns[3], "I")
+        self._names = columns[4]
+
+    @classmethod
+    def open(cls, path: str) -> "NameTable":
+        """Memory map the table at `path`"""
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    def from_mapping(cls, names: Mapping[str, str]) -> "NameTable":
+        return cls(build(names))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._name(i) for i in range(self.count))
+
+    def __contains__(self, name) -> bool:
+        return self._find(name) is not None
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """`(name, hex)` pairs, sorted by name"""
+        return ((self._name(i), self._hex(i)) for i in range(self.count))
+
+    def _name(self, i: int) -> str:
+        return bytes(self._names[self._offsets[i]:self._offsets[i + 1]]).decode("utf-8")
+
+    def _hex(self, i: int) -> str:
+        return "#%06x" % self._rgb[i]
+
+    def _find(self, name: str) -> Optional[int]:
+        if not isinstance(name, str):
+            return None
+
+        key = name.encode("utf-8")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if bytes(self._names[self._offsets[mid]:self._offsets[mid + 1]]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        if lo < self.count and self._name(lo) == name:
+            return lo
+
+        return None
+
+    def get_hex(self, name: str) -> Optional[str]:
+        """Hex value (`#rrggbb`) of `name`"""
+        i = self._find(name)
+        return None if i is None else self._hex(i)
+
+    def get_name(self, hx: str) -> Optional[str]:
+        """Preferred name of the color `hx` (`#rrggbb` or `#rgb`)"""
+        packed = _packed(hx)
+        if packed is None:
+            return None
+
+        rgb, index = self._rgb, self._hexindex
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if rgb[index[mid]] < packed:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        if lo < self.count and rgb[index[lo]] == packed:
+            return self._name(index[lo])
+
+        return None
+
+    def nearest(self, lab: LabTuple, n: int = 3, exclude: str = None) -> List[Tuple[str, str, float]]:
+        """`n` closest named colors to `lab` as `(name, hex, distance)`, CIE76
+
+        Every color is listed once (with its preferred name), the color `exclude`
+        (hex) is skipped.
+        """
+        excluded = _packed(exclude) if exclude is not None else None
+        rgb, labs, index = self._rgb, self._lab, self._hexindex
+        l0, a0, b0 = lab[:3]
+
+        candidates = []
+        previous = None
+        for i in index:
+            packed = rgb[i]
+            if packed == previous or packed == excluded:
+                previous = packed
+                continue
+
+            previous = packed
+            j = i * 3
+            dist = (labs[j] - l0) ** 2 + (labs[j + 1] - a0) ** 2 + (labs[j + 2] - b0) ** 2
+            candidates.append((dist, i))
+
+        return [(self._name(i), self._hex(i), dist ** .5) for dist, i in heapq.nsmallest(n, candidates)]
+
+
+def build(names: Union[Mapping[str, str], Iterable[Tuple[str, str]]]) -> bytes:
+    """Binary name table of the `name -> hex` mapping (or `(name, hex)` pairs)
+
+    If more names have the same color, the last one is its preferred name.
+    """
+    if isinstance(names, Mapping):
+        names = names.items()
+
+    entries: Dict[str, Tuple[int, int]] = {}
+    for order, (name, hx) in enumerate(names):
+        packed = _packed(hx)
+        if packed is None:
+            raise ValueError(f"Invalid hex color '{hx}' for '{name}'")
+        entries[name] = (packed, order)
+
+    ordered = sorted(entries, key=lambda name: name.encode("utf-8"))
+    encoded = [name.encode("utf-8") for name in ordered]
+
+    offsets = array("I", [0])
+    for name in encoded:
+        offsets.append(offsets[-1] + len(name))
+
+    rgb = array("I", [entries[name][0] for name in ordered])
+    lab = array("f")
+    for packed in rgb:
+        lab.extend(convert.rgb2lab(convert.hex2rgb("#%06x" % packed)))
+
+    hexindex = array("I", sorted(range(len(ordered)), key=lambda i: (rgb[i], -entries[ordered[i]][1])))
+
+    columns: List[array] = [offsets, rgb, lab, hexindex]
+    if sys.byteorder != "little":
+        for column in columns:
+            column.byteswap()
+
+    blob = b"".join(encoded)
+    header = HEADER.pack(MAGIC, VERSION, 0, len(ordered), len(blob))
+
+    return header + b"".join(column.tobytes() for column in columns) + blob
+
+
+def write(names: Union[Mapping[str, str], Iterable[Tuple[str, str]]], path: str):
+    """Write the binary name table of `names` to `path`"""
+    data = build(names)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+@lru_cache(maxsize=1)
+def css_names() -> NameTable:
+    """The CSS color name table"""
+    return NameTable.open(CSSTABLE)
+
+
+def main(argv: List[str]):
+    import json
+
+    source = argv[0] if argv else CSSJSON
+    target = argv[1] if len(argv) > 1 else os.path.splitext(source)[0] + ".bin"
+    with open(source, "r") as f:
+        write(json.load(f), target)
+
+    print(f"{target}: {len(NameTable.open(target))} names")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,6 +1,10 @@
-from typing import Iterator, List, Union, Callable
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Type, Union, Callable
+import math
 import operator
+import sys
+from array import array
 from . import colors
+from . import types
 from .types import *
 
 def equal_hex(c1: "colors.Color", c2: "colors.Color") -> bool:
@@ -65,7 +69,61 @@ def normalize_lch(c: CTuple) -> LChTuple:
     )
 
 
+def is_array(obj: Any) -> bool:
+    """`obj` is a `ColorArray` (without importing `repacolors.colorarray`)"""
+    module = sys.modules.get(f"{__package__}.colorarray")
+    return module is not None and isinstance(obj, getattr(module, "ColorArray"))
+
+
+def _clamp(low: float, high: float) -> Callable[[Sequence[float]], List[float]]:
+    return lambda col: [low if v < low else high if v > high else v for v in col]
+
+
+def _wrap_hue(col: Sequence[float]) -> List[float]:
+    return [1 if v == 1 else v % 1 for v in col]
+
+
+def _limit_chroma(col: Sequence[float]) -> List[float]:
+    return [min(abs(v), 230) for v in col]
+
+
+def _column_normalizers(cspace: str) -> List[Optional[Callable[[Sequence[float]], List[float]]]]:
+    """Normalizer of each channel of `cspace`, the same limits as `normalize`"""
+    channels = types.channels(cspace)
+    if cspace in ["rgb", "yuv", "xyz", "cmyk"]:
+        return [_clamp(0, 1)] * channels
+    elif cspace == "lab":
+        return [_clamp(0, 400), _clamp(-160, 160), _clamp(-160, 160)]
+    elif cspace == "lch":
+        return [_clamp(0, 400), _limit_chroma, _wrap_hue]
+    elif hueprop(cspace) == 0:
+        return [_wrap_hue, _clamp(0, 1), _clamp(0, 1)]
+
+    return [None] * channels
+
+
+def _new_array(values: array, cspace: str, alpha: Optional[array]) -> Any:
+    from .colorarray import ColorArray
+    return ColorArray(values, cspace, alpha)
+
+
+def normalize_array(carr: Any) -> Any:
+    """Normalized copy of a `ColorArray`, channel by channel"""
+    values, channels = carr.values, carr.channels
+    out = array("d", values)
+    for i, norm in enumerate(_column_normalizers(carr.cspace)):
+        if norm is not None:
+            out[i::channels] = array("d", norm(values[i::channels]))
+
+    return _new_array(out, carr.cspace, carr.alpha)
+
+
 def normalize(color: CTuple, cspace: str = None) -> CTuple:
+    """Clamp (and wrap the hue of) a color tuple or a `ColorArray`"""
+    if not isinstance(color, tuple) and is_array(color):
+        carr: Any = color
+        return normalize_array(carr.to(cspace) if cspace else carr)
+
     cspace = cspace if cspace else get_cspace(color)
 
     if cspace in ["rgb", "yuv", "xyz", "cmyk"]:
@@ -85,7 +143,69 @@ def _apply_f(t: CTuple, f: float, op: Callable[[float, float], float]) -> CTuple
     return cls(*tuple(op(v, f) for v in t))  # type: ignore
 
 
+def _columns(operand: Any, cspace: str, channels: int) -> Tuple[List[Any], Optional[int]]:
+    """Channel values of an operand (scalars, or sequences for arrays) and its length (`None`: scalar)"""
+    if is_array(operand):
+        operand = operand.to(cspace)
+        if len(operand) == 1:
+            return list(operand._tuple(0)), None
+        values = operand.values
+        return [values[i::channels] for i in range(channels)], len(operand)
+    if isinstance(operand, colors.Color):
+        return list(getattr(operand, cspace)), None
+    if isinstance(operand, tuple):
+        return list(operand), None
+
+    return [operand] * channels, None
+
+
+def _operands_cspace(operand1: Any, operand2: Any, arr: Any) -> str:
+    """Color space of the tuple operand if it's known, else of the first `Color` or `ColorArray`"""
+    tup = operand2 if isinstance(operand2, tuple) else operand1 if isinstance(operand1, tuple) else None
+    cspace = get_cspace(tup) if tup is not None else None
+    if cspace in COLORSPACES:
+        return cspace
+
+    return operand1.cspace if isinstance(operand1, colors.Color) or is_array(operand1) else arr.cspace
+
+
+def _apply_array(operand1: Any, operand2: Any, op: Callable[[float, float], float], cspace: str = None) -> Any:
+    """Channel-wise `op` with broadcasting, one of the operands is a `ColorArray`
+
+    The other operand is a number, a tuple, a `Color` or a `ColorArray` of the
+    same length (or of one color). The result is opaque, as the result of the
+    operations on `Color`s.
+    """
+    arr = operand1 if is_array(operand1) else operand2
+    if cspace is None:
+        cspace = _operands_cspace(operand1, operand2, arr)
+
+    channels = types.channels(cspace)
+    cols1, len1 = _columns(operand1, cspace, channels)
+    cols2, len2 = _columns(operand2, cspace, channels)
+    if len1 is not None and len2 is not None and len1 != len2:
+        raise ValueError(f"Cannot broadcast arrays of {len1} and {len2} colors")
+    length = len1 if len1 is not None else len2 if len2 is not None else 1
+
+    out = array("d", bytes(8 * length * channels))
+    for i, (x, y) in enumerate(zip(cols1, cols2)):
+        if len1 is not None and len2 is not None:
+            col = list(map(op, x, y))
+        elif len1 is not None:
+            col = [op(v, y) for v in x]
+        elif len2 is not None:
+            col = [op(x, v) for v in y]
+        else:
+            col = [op(x, y)]
+        out[i::channels] = array("d", col)
+
+    return normalize_array(_new_array(out, cspace, None))
+
+
 def _apply(color1: "colors.Color", color2: Union["colors.Color", CTuple, float], op: Callable[[float, float], float], cspace: str = None) -> "colors.Color":
+    if is_array(color1) or is_array(color2):
+        return _apply_array(color1, color2, op, cspace)
+
     if cspace is None:
         if isinstance(color2, tuple):
             cspace = get_cspace(color2)
@@ -136,35 +256,225 @@ def mix_hue(v1: float, v2: float, ratio: float = .5, gamma: float = 1):
     return mix_linear(v1, v2, ratio, gamma) % 1
 
 
+def mix_many(
+    color1: "colors.Color", color2: "colors.Color", ratios: Iterable[float], cspace: str = None, gamma: float = None
+) -> Any:
+    """`color1.mix(color2, ratio)` for all the `ratios`, in one pass
+
+    The color spaces are converted once, the channels are mixed column by
+    column (the hue the shorter way around the circle). Returns a `ColorArray`
+    in `cspace`, the `Color`s are created only when the items are accessed
+    (their `cspace` is the mixing color space, not the one of `color1`).
+    """
+    if cspace is None or cspace not in COLORSPACES:
+        cspace = color1.cspace
+    if gamma is None:
+        gamma = 1.0
+
+    ratios = [min(abs(r), 1) for r in ratios]
+    prop1, prop2 = getattr(color1, cspace), getattr(color2, cspace)
+    huep = hueprop(cspace)
+    channels = len(prop1)
+
+    out = array("d", bytes(8 * len(ratios) * channels))
+    for i, (v1, v2) in enumerate(zip(prop1, prop2)):
+        if i == huep and abs(v1 - v2) > .5:
+            if v1 < v2:
+                v1 += 1
+            else:
+                v2 += 1
+
+        if gamma == 1:
+            col = [(1 - r) * v1 + r * v2 for r in ratios]
+        else:
+            g1, g2, inv = v1 ** gamma, v2 ** gamma, 1 / gamma
+            col = [((1 - r) * g1 + r * g2) ** inv for r in ratios]
+
+        if i == huep:
+            col = [v % 1 for v in col]
+        out[i::channels] = array("d", col)
+
+    a1, a2 = color1.alpha, color2.alpha
+    alpha = None if a1 == a2 == 1 else array("d", [a1 * (1 - r) + a2 * r for r in ratios])
+
+    return _new_array(out, cspace, alpha)
+
+
+def _weights(weights: Optional[Sequence[float]], count: int) -> List[float]:
+    """`count` weights: missing weights are 1, extra weights are ignored"""
+    weights = list(weights or [])[:count]
+    return weights + [1] * (count - len(weights))
+
+
+def _tuples_alphas(colorlist: Any, cspace: str):
+    """Channel values in `cspace` and alpha values of Colors, tuples or a ColorArray (lazily)"""
+    from .colorarray import ColorArray, _converter
+
+    if isinstance(colorlist, ColorArray):
+        alpha = colorlist.alpha
+        converter = _converter(colorlist.cspace, cspace)
+        tuples = colorlist.tuples() if converter is None else map(converter, colorlist.tuples())
+        return tuples, alpha if alpha is not None else iter(lambda: 1.0, None)
+
+    colorlist = list(colorlist)
+    return (
+        (getattr(c, cspace) if isinstance(c, colors.Color) else c for c in colorlist),
+        (getattr(c, "alpha", 1.0) for c in colorlist),
+    )
+
+
+class Accumulator:
+    """Streaming (weighted) mean of colors in `cspace`
+
+    The colors are added one by one or in batches (`update`), only the sums
+    are kept, so the mean of millions of colors (e.g. the pixels of an image)
+    is computed in one pass without creating `Color` objects. The hue is
+    averaged on the circle (the mean of red and purple is red-ish, not green).
+
+        acc = Accumulator("lab")
+        acc.update(image_tile)        # ColorArray / BufferArray
+        acc.add(Color("red"), 2)
+        acc.mean()
+    """
+
+    def __init__(self, cspace: str = "lab"):
+        if cspace not in COLORSPACES:
+            raise ValueError(f"Unknown color space '{cspace}'")
+
+        self.cspace = cspace
+        self.ctype: Type[Any] = COLORSPACES[cspace]
+        self.hue = hueprop(cspace)
+        self.sums = [0.0] * types.channels(cspace)
+        self.hue_x = self.hue_y = 0.0
+        self.alpha = 0.0
+        self.weight = 0.0
+        self.count = 0
+
+    def add(self, color: Union["colors.Color", CTuple], weight: float = 1, alpha: float = None):
+        """Add a `Color` or a tuple of channel values in `cspace`"""
+        if isinstance(color, colors.Color):
+            alpha = color.alpha if alpha is None else alpha
+            values = getattr(color, self.cspace)
+        else:
+            values = color
+
+        self._add([values], [weight], [1.0 if alpha is None else alpha])
+
+    def update(self, colorlist: Any, weights: Iterable[float] = None):
+        """Add colors (`Color`s, tuples in `cspace` or a `ColorArray`)"""
+        tuples, alphas = _tuples_alphas(colorlist, self.cspace)
+        self._add(tuples, iter(lambda: 1, None) if weights is None else weights, alphas)
+
+    def _add(self, tuples: Iterable[CTuple], weights: Iterable[float], alphas: Iterable[float]):
+        sums, hue = self.sums, self.hue
+        channels = [i for i in range(len(sums)) if i != hue]
+        hue_x = hue_y = alpha = total = 0.0
+        count = 0
+        tau = 2 * math.pi
+
+        for values, w, a in zip(tuples, weights, alphas):
+            for i in channels:
+                sums[i] += values[i] * w
+            if hue is not None:
+                angle = values[hue] * tau
+                hue_x += math.cos(angle) * w
+                hue_y += math.sin(angle) * w
+            alpha += a * w
+            total += w
+            count += 1
+
+        self.hue_x += hue_x
+        self.hue_y += hue_y
+        self.alpha += alpha
+        self.weight += total
+        self.count += count
+
+    def mean(self) -> "colors.Color":
+        """The mean color, black if no colors were added"""
+        if not self.weight:
+            return colors.Color()
+
+        values = [v / self.weight for v in self.sums]
+        if self.hue is not None:
+            values[self.hue] = math.atan2(self.hue_y, self.hue_x) / (2 * math.pi) % 1
+
+        return colors.Color(self.ctype(*values), alpha=self.alpha / self.weight, cspace=self.cspace)
+
+
+def _list_cspace(colorlist: Any) -> str:
+    """Color space of a `ColorArray`, or of the first `Color` of a list"""
+    return colorlist.cspace if hasattr(colorlist, "tuples") else colorlist[0].cspace
+
+
 def average(
-    colorlist: List["colors.Color"], weights: List[float] = [], cspace: str = None
+    colorlist: Union[List["colors.Color"], Any], weights: Sequence[float] = None, cspace: str = None
 ) -> "colors.Color":
+    """Weighted mean of the colors (`Color`s or a `ColorArray`) in `cspace`
+
+    Missing weights are 1, extra weights are ignored. The hue of hue based
+    color spaces (`hsl`, `lch`, ...) is averaged on the circle.
+    """
     if len(colorlist) < 1:
         return colors.Color()
     elif len(colorlist) == 1:
         return colorlist[0]
 
     if cspace is None or cspace not in COLORSPACES:
-        cspace = colorlist[0].cspace
+        cspace = _list_cspace(colorlist)
+
+    acc = Accumulator(cspace)
+    acc.update(colorlist, _weights(weights, len(colorlist)))
 
-    lenw, lenc = len(weights), len(colorlist)
+    return acc.mean()
 
-    if lenw < lenc:
-        weights = weights + [1 for _ in range(lenc - lenw)]
-    elif lenw > lenc:
-        weights = weights[:lenc]
 
-    sw = sum(weights)
-    weights = [w / sw for w in weights]
+def weighted_median(values: Sequence[float], weights: Sequence[float] = None) -> float:
+    """The (lower) weighted median of the values"""
+    if weights is None:
+        pairs = sorted((v, 1.0) for v in values)
+    else:
+        pairs = sorted(zip(values, weights))
+    if not pairs:
+        raise ValueError("weighted_median of no values")
 
-    cls = getattr(colorlist[0], cspace).__class__
-    retp = cls()
-    propnum = len(retp)
-    alpha = 0
+    half = sum(w for _, w in pairs) / 2
+    acc = 0.0
+    for value, weight in pairs:
+        acc += weight
+        if acc >= half:
+            return value
 
-    for c, w in zip(colorlist, weights):
-        cprop = getattr(c, cspace)
-        retp = tuple(retp[i] + cprop[i] * w for i in range(propnum))
-        alpha += c.alpha * w
+    return pairs[-1][0]
 
-    return colors.Color(cls(*retp), alpha=alpha, cspace=cspace)
+
+def median(
+    colorlist: Union[List["colors.Color"], Any], weights: Sequence[float] = None, cspace: str = None
+) -> "colors.Color":
+    """Weighted median of the channels of the colors (`Color`s or a `ColorArray`) in `cspace`
+
+    The hue is unwrapped around its circular mean before taking its median.
+    """
+    if len(colorlist) < 1:
+        return colors.Color()
+    elif len(colorlist) == 1:
+        return colorlist[0]
+
+    if cspace is None or cspace not in COLORSPACES:
+        cspace = _list_cspace(colorlist)
+
+    weights = _weights(weights, len(colorlist))
+    tuples, alphas = _tuples_alphas(colorlist, cspace)
+    columns = list(zip(*tuples))
+    alphas = [a for a, _ in zip(alphas, weights)]
+
+    values = [weighted_median(column, weights) for column in columns]
+    hue = hueprop(cspace)
+    if hue is not None:
+        angles = [h * 2 * math.pi for h in columns[hue]]
+        center = math.atan2(
+            sum(math.sin(a) * w for a, w in zip(angles, weights)),
+            sum(math.cos(a) * w for a, w in zip(angles, weights)),
+        ) / (2 * math.pi)
+        values[hue] = (center + weighted_median([(h - center + .5) % 1 - .5 for h in columns[hue]], weights)) % 1
+
+    return colors.Color(COLORSPACES[cspace](*values), alpha=weighted_median(alphas, weights), cspace=cspace)
@@ -1,4 +1,9 @@
-from repacolors import ColorScale
+import json
+import os
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from ..colors import Color
+from ..scale import ColorScale
+from .. import cache
 from .colorbrewer import PALETTES as CBPALETTES
 
 
@@ -8,21 +13,148 @@ PALETTES = {
     **CBPALETTES
 }
 
+# can't be unregistered
+_BUILTINS = frozenset(PALETTES)
 
-def get_palette(name: str):
-    if name.lower() not in PALETTES:
-        raise KeyError(f"'{name}' palette not found")
+USER_PALETTES_FILE = "palettes.json"
+
+
+class Palette:
+    """Named list of colors, the colors are parsed once
+
+    The color scales of the palette (`scale`) share the parsed colors and
+    their LUT cache.
+    """
+
+    def __init__(self, name: str, colors: Sequence[Any]):
+        self.name = name
+        self.hexes: Tuple[str, ...] = tuple(c.lhexa if isinstance(c, Color) else c for c in colors)
+        self._colors: Optional[Tuple[Color, ...]] = None
+        self._luts: Dict[Tuple, List[Tuple[float, ...]]] = {}
+
+    @property
+    def colors(self) -> Tuple[Color, ...]:
+        colors = self._colors
+        if colors is None:
+            colors = self._colors = tuple(Color(c) for c in self.hexes)
+        return colors
+
+    def scale(self, *args, **kwargs) -> ColorScale:
+        kwargs.setdefault("name", self.name)
+        scale = ColorScale(list(self.colors), *args, **kwargs)
+        scale._luts = self._luts
+
+        return scale
+
+    def __len__(self) -> int:
+        return len(self.hexes)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.hexes)
+
+    def __getitem__(self, i):
+        return self.hexes[i]
+
+    def __repr__(self) -> str:
+        return f"<Palette {self.name} [{len(self)}]>"
+
+
+_REGISTRY: Dict[str, Palette] = {}
+_USER_PALETTES: Optional[Dict[str, List[str]]] = None
+
+
+def _user_palettes_path(create: bool = False) -> str:
+    return os.path.join(cache.cache_dir(create), USER_PALETTES_FILE)
+
+
+def _user_palettes() -> Dict[str, List[str]]:
+    """Persisted user palettes, loaded on first use"""
+    global _USER_PALETTES
+
+    if _USER_PALETTES is not None:
+        return _USER_PALETTES
+
+    palettes: Dict[str, List[str]] = {}
+    try:
+        with open(_user_palettes_path(), "r") as f:
+            palettes = json.load(f)
+    except (OSError, ValueError):
+        pass
 
+    for name, colors in palettes.items():
+        PALETTES.setdefault(name, colors)
+    _USER_PALETTES = palettes
+
+    return palettes
+
+
+def _save_user_palettes():
+    # the cache directory is created only when there is something to save
+    cache.atomic_write(_user_palettes_path(create=True), json.dumps(_user_palettes(), indent=1).encode("utf-8"))
+
+
+def get(name: str) -> Palette:
+    """The registered palette `name`"""
+    key = name.lower()
+    palette = _REGISTRY.get(key)
+    if palette is None:
+        if key not in PALETTES:
+            _user_palettes()
+        if key not in PALETTES:
+            raise KeyError(f"'{name}' palette not found")
+
+        palette = _REGISTRY[key] = Palette(key, PALETTES[key])
+
+    return palette
+
+
+def register(name: str, colors: Sequence[Any], persist: bool = False) -> Palette:
+    """Register a palette, `persist=True` saves it to the cache directory"""
+    key = name.lower()
+    if key in _BUILTINS:
+        raise ValueError(f"'{name}' is a built-in palette")
+
+    palette = Palette(key, colors)
+    PALETTES[key] = list(palette.hexes)
+    _REGISTRY[key] = palette
+
+    if persist:
+        _user_palettes()[key] = list(palette.hexes)
+        _save_user_palettes()
+
+    return palette
+
+
+def unregister(name: str):
+    """Remove a user palette (from the cache directory too)"""
+    key = name.lower()
+    if key in _BUILTINS:
+        raise ValueError(f"'{name}' is a built-in palette")
+
+    PALETTES.pop(key, None)
+    _REGISTRY.pop(key, None)
+    if _user_palettes().pop(key, None) is not None:
+        _save_user_palettes()
+
+
+def names() -> List[str]:
+    """Names of the available palettes, including the persisted user palettes"""
+    _user_palettes()
+    return list(PALETTES.keys())
+
+
+def get_palette(name: str):
+    get(name)
     return PALETTES[name.lower()]
 
 
 def get_scale(name: str, *args, **kwargs) -> ColorScale:
     kwargs["name"] = name
-    return ColorScale(get_palette(name), *args, **kwargs)
+    return get(name).scale(*args, **kwargs)
 
 
 def demo(width: int = 80):
-    for name, colors in PALETTES.items():
-        s = ColorScale(colors)
+    for name in names():
+        s = get_scale(name)
         print(f"{name:12s}", end="")
         s.print(width=width, height=2, border=0)
@@ -1,15 +1,23 @@
 from contextlib import contextmanager, ContextDecorator
 import math
+import select
 import xcffib
 import xcffib.render
 from xcffib.xproto import WindowClass, CW, EventMask, InputFocus, Time, GrabMode, Atom, ImageFormat
-from time import sleep
+from time import monotonic
 from .convert import rgb2hsl, hsl2rgb
 from .colors import Color
+from . import pixels
 
 MOUSE_BUTTON_LEFT = 1
 MOUSE_BUTTON_RIGHT = 3
 
+# minimal time between two redraws of the preview (s)
+REDRAW_INTERVAL = 1 / 60
+
+# pick modes of a region
+PICK_MODES = ["pixel", "average", "median"]
+
 
 def x8to16(i):
     return 0xffff * (i & 0xff) // 0xff
@@ -85,14 +93,48 @@ def pick_coord(conn, cursor=None):
         conn.core.UngrabPointer(Atom._None)
 
 
-def events(conn, sleep_time=0.001):
-    """Return a generator that yields the incoming X events"""
+def coalesce_motion(events, motion_type=xcffib.xproto.MotionNotifyEvent):
+    """Drops the motion events but the last one, keeps the order of the others"""
+    last = None
+    for i, event in enumerate(events):
+        if isinstance(event, motion_type):
+            last = i
+
+    return [event for i, event in enumerate(events) if i == last or not isinstance(event, motion_type)]
+
+
+def wait_for_events(conn, timeout=None):
+    """Returns the queued X events (motion events coalesced), blocks on the
+    file descriptor of the connection until there are any
+
+    Params:
+    - conn: xcb connection
+    - timeout: maximum time to wait (s), `None` to wait forever
+
+    Returns:
+    - (list): the events, empty if the timeout expired
+    """
+    fd = conn.get_file_descriptor()
     while True:
+        pending = []
         event = conn.poll_for_event()
-        if event:
-            yield event
-        else:
-            sleep(sleep_time)
+        while event:
+            pending.append(event)
+            event = conn.poll_for_event()
+
+        if pending:
+            return coalesce_motion(pending)
+
+        conn.flush()
+        readable, _, _ = select.select([fd], [], [], timeout)
+        if not readable:
+            return []
+
+
+def events(conn):
+    """Return a generator that yields the incoming X events"""
+    while True:
+        yield from wait_for_events(conn)
 
 
 def get_pointer_position(conn, event=None):
@@ -114,24 +156,64 @@ def get_pointer_position(conn, event=None):
         return ppos.root_x, ppos.root_y
 
 
-# TODO get 3x3 or 5x5 pixels to easier picking
-def get_pixel(conn, x, y):
-    """Get the pixel color at the given position
+def get_region(conn, x, y, size=1):
+    """Get the `size`x`size` pixels around the given position in one request
+
+    The region is moved inside the screen at the edges.
 
     Params:
     - conn: xcb connection
     - x, y: coordinates
+    - size: size of the region
+
+    Returns:
+    - (tuple): (data, width, height, stride, cx, cy) the BGRX image data,
+      its size and the position of (x, y) in the region
+    """
+    root = conn.get_setup().roots[0]
+    width = min(size, root.width_in_pixels)
+    height = min(size, root.height_in_pixels)
+    left = max(0, min(x - size // 2, root.width_in_pixels - width))
+    top = max(0, min(y - size // 2, root.height_in_pixels - height))
+
+    reply = conn.core.GetImage(ImageFormat.ZPixmap, root.root, left, top, width, height, 0xffffffff).reply()
+    data = memoryview(reply.data.buf())
+
+    return data, width, height, len(data) // height, x - left, y - top
+
+
+def sample_region(region, mode="pixel"):
+    """Color of the region (see `get_region`)
+
+    Params:
+    - region: the region
+    - mode: `pixel` (the one under the pointer), `average` or `median`
 
     Returns:
     - (tuple of int): (r, g, b) color tuple
     """
+    data, width, height, stride, cx, cy = region
+    if mode == "average":
+        return pixels.average(data, width, height, "BGRX", stride)
+    if mode == "median":
+        return pixels.median(data, width, height, "BGRX", stride)
 
-    setup = conn.get_setup()
-    reply = conn.core.GetImage(ImageFormat.ZPixmap, setup.roots[0].root, x, y, 1, 1, 0xffffffff).reply()
-    # format: BGRX
-    image_data = reply.data.buf()
+    return pixels.pixel(data, width, height, cx, cy, "BGRX", stride)
 
-    return (image_data[2], image_data[1], image_data[0])
+
+def get_pixel(conn, x, y, size=1, mode="pixel"):
+    """Get the pixel color at the given position
+
+    Params:
+    - conn: xcb connection
+    - x, y: coordinates
+    - size: size of the region to pick from
+    - mode: how to pick from the region (see `sample_region`)
+
+    Returns:
+    - (tuple of int): (r, g, b) color tuple
+    """
+    return sample_region(get_region(conn, x, y, size), mode)
 
 
 class ColorPreview:
@@ -141,9 +223,11 @@ class ColorPreview:
     - margin: distance to the pointer
     - size: size of the preview
     - border: border size
+    - loupe: zoom of the magnified region next to the colors (0: no loupe)
+    - region: size of the magnified region
     """
 
-    def __init__(self, conn, margin, size, border, colors=None, length=1):
+    def __init__(self, conn, margin, size, border, colors=None, length=1, loupe=0, region=1):
         self._colors = colors if colors is not None else [(0, 0, 0)] * length
         self._length = len(self._colors)
         self._connection = conn
@@ -153,8 +237,11 @@ class ColorPreview:
         self.margin = margin
         self.size = size
         self.border = border
-        self._distance_x = margin + int(size / 2) + int(size * self._length)
-        self._distance_y = margin + int(size / 2)
+        self.loupe = loupe
+        self.width = size * self._length + loupe * region
+        self.height = max(size, loupe * region)
+        self._distance_x = margin + int(size / 2) + self.width
+        self._distance_y = margin + int(self.height / 2)
         self._window = None
         self._pid = None
         self._format = None
@@ -184,7 +271,7 @@ class ColorPreview:
             self._format = self._find_format()
             self._connection.core.CreateWindow(
                 self._root.root_depth, self._window, self._root.root,
-                0, 0, self.size * len(self._colors), self.size, 0,
+                0, 0, self.width, self.height, 0,
                 WindowClass.InputOutput,
                 self._root.root_visual,
                 CW.BackPixel | CW.OverrideRedirect | CW.EventMask,
@@ -215,7 +302,7 @@ class ColorPreview:
         offset_y = int(self._distance_y * -math.sin(rad))
         offset_x = int(self._distance_x * math.cos(rad))
 
-        self._connection.core.ConfigureWindow(self._window, xcffib.xproto.ConfigWindow.X | xcffib.xproto.ConfigWindow.Y, [x - int(self.size / 2) + offset_x, y - int(self.size / 2) + offset_y])
+        self._connection.core.ConfigureWindow(self._window, xcffib.xproto.ConfigWindow.X | xcffib.xproto.ConfigWindow.Y, [x - int(self.size / 2) + offset_x, y - int(self.height / 2) + offset_y])
 
     def _draw_rectangle(self, x, y, width, height, color=None):
         """Draws a rectangle with the current foreground color on the window.
@@ -262,6 +349,25 @@ class ColorPreview:
             self._draw_border(color, i)
         self._connection.flush()
 
+    def draw_loupe(self, region):
+        """Draws the magnified region next to the colors, marks the picked pixel.
+
+        Param:
+        - region: region (see `get_region`)
+        """
+        data, width, height, stride, cx, cy = region
+        left = self.size * self._length
+        zoom = self.loupe
+        for y, row in enumerate(pixels.decode(data, width, height, "BGRX", stride)):
+            for x, rgb in enumerate(row):
+                self._draw_rectangle(left + x * zoom, y * zoom, zoom, zoom, rgb)
+
+        color = xcolor(border_color(pixels.pixel(data, width, height, cx, cy, "BGRX", stride)))
+        x, y = left + cx * zoom, cy * zoom
+        for rect in ((x, y, zoom, 1), (x, y, 1, zoom), (x + zoom - 1, y, 1, zoom), (x, y + zoom - 1, zoom, 1)):
+            self._draw_rectangle(*rect, color)
+        self._connection.flush()
+
     def pick(self, rgb):
         self._picked += 1
 
@@ -288,28 +394,73 @@ class WindowMapper(ContextDecorator):
         self._window.unmap()
 
 
-def pick(length=1):
-    conn = xcffib.connect()
-    wnd = ColorPreview(conn, 30, 20, 1, length=length)
+def run(conn, wnd, interval=REDRAW_INTERVAL, clock=monotonic, size=1, mode="pixel"):
+    """Event loop of the picker, returns when the picking is done or cancelled
 
-    with WindowMapper(wnd) as mapper,\
-            create_font_cursor(conn, 34) as cursor,\
-            pick_coord(conn, cursor):
-        for event in events(conn):
-            x, y = get_pointer_position(conn, event)
-            rgb = get_pixel(conn, x, y)
+    The preview is redrawn (and the region under the pointer fetched) at most
+    once in every `interval` seconds, for the latest pointer position.
+
+    Params:
+    - conn: xcb connection
+    - wnd: preview window (`ColorPreview`)
+    - interval: minimal time between redraws (s)
+    - clock: time source
+    - size: size of the region to pick from
+    - mode: how to pick from the region (see `sample_region`)
+    """
+    last_draw = -interval
+    position = None  # waiting for redraw
+
+    while True:
+        timeout = None
+        if position is not None:
+            timeout = max(0, last_draw + interval - clock())
+
+        for event in wait_for_events(conn, timeout):
             if isinstance(event, (xcffib.xproto.ExposeEvent, xcffib.xproto.MotionNotifyEvent)):
-                wnd.draw(rgb)
-                wnd.move(x, y)
+                position = get_pointer_position(conn, event)
             elif isinstance(event, xcffib.xproto.ButtonPressEvent):
                 if event.detail == MOUSE_BUTTON_RIGHT:
                     # quit
-                    break
+                    return
                 elif event.detail == MOUSE_BUTTON_LEFT:
                     # pick color
+                    rgb = sample_region(get_region(conn, *get_pointer_position(conn, event), size), mode)
                     should_quit = wnd.pick(rgb)
                     wnd.draw(rgb)
                     if should_quit:
-                        break
+                        return
+
+        if position is not None and clock() - last_draw >= interval:
+            x, y = position
+            region = get_region(conn, x, y, size)
+            wnd.draw(sample_region(region, mode))
+            if wnd.loupe:
+                wnd.draw_loupe(region)
+            wnd.move(x, y)
+            last_draw = clock()
+            position = None
+
+
+def pick(length=1, size=1, mode="pixel", loupe=False):
+    """Pick `length` colors from the screen
+
+    Params:
+    - length: number of colors
+    - size: size of the region (around the pointer) to pick from
+    - mode: how to pick from the region (see `sample_region`)
+    - loupe: show the magnified region
+    """
+    if size < 1:
+        raise ValueError("The size of the region should be at least 1")
+
+    conn = xcffib.connect()
+    zoom = max(2, 64 // size) if loupe else 0
+    wnd = ColorPreview(conn, 30, 20, 1, length=length, loupe=zoom, region=size)
+
+    with WindowMapper(wnd) as mapper,\
+            create_font_cursor(conn, 34) as cursor,\
+            pick_coord(conn, cursor):
+        run(conn, wnd, size=size, mode=mode)
 
     return [Color(rgb) for rgb in reversed(wnd._colors)]
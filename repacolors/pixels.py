@@ -0,0 +1,87 @@
+"""Raw pixel buffers
+
+Decoding and sampling of raw images (e.g. X `GetImage` replies), the buffer
+is accessed through `memoryview` slices, without copying.
+
+`byteorder` describes the channels of a pixel, one character per byte:
+`R`, `G`, `B`, `A` (alpha), anything else is padding (e.g. `BGRX`). `stride`
+is the length of a row in bytes (defaults to `width * len(byteorder)`).
+"""
+
+from typing import Dict, Iterator, List, Tuple
+
+RGB256Tuple = Tuple[int, int, int]
+
+
+def channel_offsets(byteorder: str) -> Dict[str, int]:
+    """Offsets of the `R`, `G`, `B` (and `A`) channels in a pixel"""
+    offsets = {c: i for i, c in enumerate(byteorder.upper()) if c in "RGBA"}
+    missing = set("RGB") - set(offsets)
+    if missing:
+        raise ValueError(f"Missing channels in byteorder '{byteorder}': {''.join(sorted(missing))}")
+
+    return offsets
+
+
+def _rows(buf, width: int, height: int, psize: int, stride: int = None) -> Iterator[memoryview]:
+    view = memoryview(buf).cast("B")
+    stride = stride or width * psize
+    if len(view) < stride * (height - 1) + width * psize:
+        raise ValueError("Buffer too small")
+
+    for y in range(height):
+        yield view[y * stride:y * stride + width * psize]
+
+
+def _channels(buf, width: int, height: int, byteorder: str, stride: int = None) -> Tuple[List[int], ...]:
+    """All the values of the R, G, B channels"""
+    offsets = channel_offsets(byteorder)
+    psize = len(byteorder)
+    channels: Tuple[List[int], ...] = ([], [], [])
+    for row in _rows(buf, width, height, psize, stride):
+        for values, channel in zip(channels, "RGB"):
+            values.extend(row[offsets[channel]::psize])
+
+    return channels
+
+
+def decode(buf, width: int, height: int, byteorder: str = "BGRX", stride: int = None) -> List[List[RGB256Tuple]]:
+    """Rows of `(r, g, b)` tuples (0-255)"""
+    offsets = channel_offsets(byteorder)
+    ro, go, bo = offsets["R"], offsets["G"], offsets["B"]
+    psize = len(byteorder)
+
+    return [
+        list(zip(row[ro::psize], row[go::psize], row[bo::psize]))
+        for row in _rows(buf, width, height, psize, stride)
+    ]
+
+
+def pixel(buf, width: int, height: int, x: int, y: int, byteorder: str = "BGRX", stride: int = None) -> RGB256Tuple:
+    """Color of the pixel at `(x, y)`"""
+    if not (0 <= x < width and 0 <= y < height):
+        raise IndexError(f"Pixel ({x}, {y}) out of the image")
+
+    offsets = channel_offsets(byteorder)
+    psize = len(byteorder)
+    pos = y * (stride or width * psize) + x * psize
+    view = memoryview(buf).cast("B")
+
+    return (view[pos + offsets["R"]], view[pos + offsets["G"]], view[pos + offsets["B"]])
+
+
+def average(buf, width: int, height: int, byteorder: str = "BGRX", stride: int = None) -> RGB256Tuple:
+    """Average color of the image"""
+    count = width * height
+    return tuple(  # type: ignore
+        (sum(values) + count // 2) // count
+        for values in _channels(buf, width, height, byteorder, stride)
+    )
+
+
+def median(buf, width: int, height: int, byteorder: str = "BGRX", stride: int = None) -> RGB256Tuple:
+    """Median color of the image (per channel), ignores outlier pixels"""
+    return tuple(  # type: ignore
+        sorted(values)[len(values) // 2]
+        for values in _channels(buf, width, height, byteorder, stride)
+    )
@@ -1,13 +1,20 @@
 from .colors import Color
 from .types import LabTuple
 from .blend import blend
-from typing import List, Any, Tuple, Callable, Union
+from typing import List, Any, Tuple, Callable, Union, Dict, Iterable
+from . import ops
 from . import terminal
+from . import cache
+from array import array
 from functools import wraps
 import math
 import sys
 
 
+# version of the LUTs in the artifact cache, bump it when the interpolation changes
+LUT_VERSION = 2
+
+
 def _binomial(i: int, n: int) -> float:
     """Binomial coefficient
     """
@@ -44,20 +51,41 @@ def bezier_ip(
     return Color(**cargs)  # type: ignore
 
 
-def linear_ip(
-    colors: List[Color], pos: float = 0.5, cspace: str = "lab", gamma: float = 1.0
-) -> Color:
-
+def linear_ip_many(
+    colors: List[Color], positions: Iterable[float], cspace: str = "lab", gamma: float = 1.0
+) -> List[Color]:
+    """`linear_ip` of many positions, mixed segment by segment with `ops.mix_many`"""
     lenc = len(colors)
-    idx = int(pos * (lenc - 1))
-    cols = colors[idx:idx + 2]
-    if len(cols) == 1:
-        return cols[0]
+    result: List[Any] = []
+    segments: Dict[int, Tuple[List[int], List[float]]] = {}
 
-    col1, col2 = cols
-    ratio = (pos - idx / (lenc - 1)) * (lenc - 1)
+    for i, pos in enumerate(positions):
+        idx = int(pos * (lenc - 1))
+        cols = colors[idx:idx + 2]
+        if len(cols) == 1:
+            result.append(cols[0])
+            continue
 
-    return col1.mix(col2, ratio=ratio, cspace=cspace, gamma=gamma)
+        result.append(None)
+        indexes, ratios = segments.setdefault(idx, ([], []))
+        indexes.append(i)
+        ratios.append((pos - idx / (lenc - 1)) * (lenc - 1))
+
+    for idx, (indexes, ratios) in segments.items():
+        mixed = ops.mix_many(colors[idx], colors[idx + 1], ratios, cspace, gamma)
+        alphas = mixed.alpha if mixed.alpha is not None else [1.0] * len(ratios)
+        # in the color space of the first color, as `Color.mix`
+        base = colors[idx].cspace
+        for i, values, alpha in zip(indexes, mixed.tuples(), alphas):
+            result[i] = Color(values, alpha, cspace=base)
+
+    return result
+
+
+def linear_ip(
+    colors: List[Color], pos: float = 0.5, cspace: str = "lab", gamma: float = 1.0
+) -> Color:
+    return linear_ip_many(colors, [pos], cspace, gamma)[0]
 
 
 def linear_ip_f(lst: List[float], pos: float = 0.5):
@@ -167,6 +195,7 @@ class ColorScale:
                 gamma_correction = 1.0
 
         self.gamma_correction = gamma_correction
+        self._luts: Dict[Tuple, List[Tuple[float, ...]]] = {}
 
     @property
     def interpolator(self):
@@ -234,8 +263,84 @@ class ColorScale:
             interp(self.colors, projpos, self.cspace, self.gamma_correction)
         )
 
+    def _colors_for_pos_many(self, positions: Iterable[float]) -> List[Color]:
+        """`self[pos]` of many positions, interpolated in one pass if possible"""
+        if self.interpolator is not linear_ip or type(self)._get_color_for_pos is not ColorScale._get_color_for_pos:
+            return [self[pos] for pos in positions]
+
+        projected = [project_domain(pos, self.domain) for pos in positions]
+        if self.gamma != 1.0:
+            projected = [pos ** self.gamma for pos in projected]
+
+        return [Color(c) for c in linear_ip_many(self.colors, projected, self.cspace, self.gamma_correction)]
+
     def samples(self, n: int = 10):
-        return [self[self.domain[0] + (self.domain[-1] - self.domain[0]) * i / (n - 1)] for i in range(n)]
+        return self._colors_for_pos_many(self.domain[0] + (self.domain[-1] - self.domain[0]) * i / (n - 1) for i in range(n))
+
+    def _lut_key(self) -> Tuple:
+        return (
+            tuple(tuple(getattr(c, self.cspace)) + (c.alpha,) for c in self.colors),
+            tuple(self.domain),
+            self.gamma,
+            self.cspace,
+            self.gamma_correction,
+            self._interpolator.__name__,
+            tuple(self.luminance_map) if self.luminance_map else None,
+        )
+
+    def lut(self, size: int = 256) -> List[Tuple[float, ...]]:
+        """Lookup table of `size` evenly spaced (r, g, b, alpha) samples
+
+        The table is computed once and cached until the parameters of the scale
+        change, so it can be used for fast batch lookups (see `lookup`).
+        """
+        key = (size,) + self._lut_key()
+        lut = self._luts.get(key)
+        if lut is None:
+            artifacts = cache.artifacts()
+            if artifacts is None:
+                lut = [c.rgb + (c.alpha,) for c in self.samples(size)]
+            else:
+                lut = self._cached_lut(artifacts, key)
+
+            if len(self._luts) >= 8:
+                self._luts.clear()
+            self._luts[key] = lut
+
+        return lut
+
+    def _cached_lut(self, artifacts: "cache.ArtifactCache", key: Tuple) -> List[Tuple[float, ...]]:
+        """LUT from the on-disk cache, computed and stored if it's not there"""
+        akey = f"scale-lut:{LUT_VERSION}:{type(self).__name__}:{key!r}"
+        payload = artifacts.read(akey)
+        values = array("d")
+        if payload is not None:
+            values.frombytes(payload)
+            if sys.byteorder != "little":
+                values.byteswap()
+            return [tuple(values[i:i + 4]) for i in range(0, len(values), 4)]
+
+        lut = [c.rgb + (c.alpha,) for c in self.samples(key[0])]
+        for entry in lut:
+            values.extend(entry)
+        if sys.byteorder != "little":
+            values.byteswap()
+        artifacts.store(akey, values.tobytes())
+
+        return lut
+
+    def lookup(self, positions: Iterable[float], size: int = 256) -> List[Tuple[float, ...]]:
+        """Batch version of `scale[pos]` using the lookup table
+
+        Returns (r, g, b, alpha) tuples, the positions are rounded to the
+        nearest entry of a `size` long LUT.
+        """
+        lut = self.lut(size)
+        frm, to = self.domain[0], self.domain[-1]
+        span = (to - frm) or 1
+        last = size - 1
+
+        return [lut[min(max(round((pos - frm) / span * last), 0), last)] for pos in positions]
 
     def _displayimage(
         self,
@@ -1,14 +1,49 @@
-from .palette import get_scale
 from .scale import ColorScale
 from .colors import Color
-from .types import HSLTuple, LChTuple, LabTuple
-from .blend import blend
+from .types import HSLTuple, LChTuple, LabTuple, RGBTuple
+from .blend import blend_rgb
 from .distance import distance_hue
+from .convert import hsl2rgb, lch2rgb, rgb2hsl, rgb2lch
+from .ops import normalize_1base
 from . import terminal
-from typing import Tuple, List
+from typing import Tuple, List, Iterable, Dict
+from functools import lru_cache
 import math
 
 
+__all__ = [
+    "ColorWheel", "HSLColorWheel", "LChColorWheel", "SCHEMES", "divide_wheel",
+    "RYB", "HSL", "RGB", "LCH", "LAB",
+]
+
+# wheel positions of the colors in each scheme, relative to the base color
+SCHEMES = {
+    "complementary": (0, 6),
+    "triad": (0, 4, 8),
+    "square": (0, 3, 6, 9),
+    "tetrad": (0, 2, 6, 8),
+    "split_complementary": (0, 5, 7),
+    "analogous": (0, 1, 11),
+}
+
+
+@lru_cache(maxsize=8)
+def _polar_grid(w: int) -> Tuple[Tuple[Tuple[float, float], ...], ...]:
+    """(radius, wheel position) of every pixel of a `w` x `w` grid,
+    measured from the center
+    """
+    grid = []
+    center = w / 2
+    for y in range(w):
+        ry = center - y
+        grid.append(tuple(
+            (math.hypot(center - x, ry), 12 * math.atan2(ry, center - x) / math.tau - 3)
+            for x in range(w)
+        ))
+
+    return tuple(grid)
+
+
 class ColorWheel:
     """Color wheel
     Colors arranged in a circle, 0-12 range (like on a clock)
@@ -17,9 +52,11 @@ class ColorWheel:
     """
 
     DISPLAY_BORDER = 1
+    LUT_SIZE = 1024
 
     def __init__(self, scale: ColorScale = None, cspace: str = "rgb"):
         if scale is None:
+            from .palette import get_scale
             scale = get_scale("rybw3", cyclic=True)
 
         self.scale = scale
@@ -39,6 +76,22 @@ class ColorWheel:
 
         return NotImplemented
 
+    def _lut(self, size: int) -> List[Tuple[float, ...]]:
+        return self.scale.lut(size)
+
+    def lookup(self, positions: Iterable[float], size: int = None) -> List[Tuple[float, ...]]:
+        """Batch version of `wheel[pos]`
+
+        Returns (r, g, b, alpha) tuples from a cached lookup table of `size`
+        entries around the wheel, without creating `Color` objects.
+        """
+        if size is None:
+            size = self.LUT_SIZE
+        lut = self._lut(size)
+        last = size - 1
+
+        return [lut[round((pos % 12) / 12 * last)] for pos in positions]
+
     def _get_position(self, color: Color) -> float:
         mindist, minidx, closest = 100.0, 0, color
         colors = self.scale.colors[:-1]
@@ -68,6 +121,67 @@ class ColorWheel:
 
         return 12 * idx / lscale
 
+    def _positions(self, colors: List[Color]) -> List[float]:
+        return [self._get_position(color) for color in colors]
+
+    def _to_color(self, ctuple: Tuple[float, ...]) -> Color:
+        return Color(RGBTuple(*ctuple[:3]), alpha=ctuple[3])
+
+    def _scheme_colors(self, colors: List[Color], positions: List[float], offsets: Tuple[int, ...]) -> List[List[Tuple[float, ...]]]:
+        k = len(offsets)
+        flat = self.lookup(pos + offset for pos in positions for offset in offsets)
+        return [flat[i:i + k] for i in range(0, len(flat), k)]
+
+    def _scheme_hues(self, colors: List[Color], positions: List[float], offsets: Tuple[int, ...]) -> List[List[float]]:
+        if self.cspace in ["lab", "lch"]:
+            huefn = lambda rgba: rgb2lch(rgba[:3]).h
+        else:
+            huefn = lambda rgba: rgb2hsl(rgba[:3]).hue
+
+        return [[huefn(rgba) for rgba in scheme] for scheme in self._scheme_colors(colors, positions, offsets)]
+
+    def batch(self, colors: List[Color], scheme: str = "triad", adjust: bool = True, n: int = 5) -> List[Tuple[Color, ...]]:
+        """Generate the same color scheme for many base colors at once
+
+        `scheme` is one of `SCHEMES` or "monochromatic" (with `n` colors).
+        Returns a list of scheme tuples (one per base color), the colors of
+        the wheel are taken from the lookup table and the adjusted colors are
+        computed directly in the wheel's space.
+        """
+        if scheme == "monochromatic":
+            deltal = 1 / n
+            return [
+                tuple(
+                    Color(HSLTuple(hsl.hue, hsl.saturation, hsl.lightness % deltal + deltal * i), alpha=color.alpha)
+                    for i in range(n)
+                )
+                for color, hsl in ((color, color.hsl) for color in colors)
+            ]
+
+        if scheme not in SCHEMES:
+            raise KeyError(f"'{scheme}' scheme not found")
+
+        offsets = SCHEMES[scheme]
+        positions = self._positions(colors)
+
+        if not adjust:
+            return [
+                tuple(self._to_color(ctuple) for ctuple in row)
+                for row in self._scheme_colors(colors, positions, offsets)
+            ]
+
+        hues = self._scheme_hues(colors, positions, offsets)
+        if self.cspace in ["lab", "lch"]:
+            return [
+                tuple(Color(LChTuple(lch.l, lch.c, hue), alpha=color.alpha) for hue in row)
+                for color, lch, row in ((color, color.lch, row) for color, row in zip(colors, hues))
+            ]
+
+        return [
+            tuple(Color(HSLTuple(hue, hsl.saturation, hsl.lightness), alpha=color.alpha) for hue in row)
+            for color, hsl, row in ((color, color.hsl, row) for color, row in zip(colors, hues))
+        ]
+
     def _adjust(self, color: Color, refcolor: Color) -> Color:
         if self.cspace in ["lab", "lch"]:
             return refcolor.set(cie_h=color.cie_h)
@@ -160,7 +274,11 @@ class ColorWheel:
         lightnesses = [diffl + deltal * i for i in range(n)]
         return tuple(color.set(lightness=lness) for lness in lightnesses)
 
-    def _displayimage(self, width: int = None, border: int = None, bgcolors: List[Color] = None) -> List[List["Color"]]:
+    def raster(self, width: int = None, border: int = None, bgcolors: List[Color] = None) -> List[List[Tuple[float, ...]]]:
+        """Image of the wheel as rows of (r, g, b, alpha) tuples
+
+        Can be drawn with `terminal.draw_rgb` or exported to any image format.
+        """
         if border is None:
             border = self.DISPLAY_BORDER
         if width is None:
@@ -168,48 +286,54 @@ class ColorWheel:
             width = min(ts[0], ts[1] * 2) - border * 2 - 6 # -6 for prompt
 
         w = width + 2 * border
-        img = []
 
         if bgcolors is None:
             bgcolors = getattr(
                 self, "bgcolors", [Color("#000")]
             )
 
-        bgl = len(bgcolors)
-        white = Color("#fff")
-        black = Color("#000")
-
-        for y in range(w):
-            line = []
-            for x in range(w):
-                bgc = bgcolors[(y + x) % bgl]
-                ro, ri1, ri2 = width / 2, width / 3, 2 * width / 5
-                rx, ry = w / 2 - x, w / 2 - y
-                r = (rx ** 2 + ry ** 2) ** .5
+        bgs: List[Tuple[float, ...]] = [c.rgb + (c.alpha,) for c in bgcolors]
+        bgl = len(bgs)
+        white: Tuple[float, ...] = (1.0, 1.0, 1.0, 1.0)
+        black: Tuple[float, ...] = (0.0, 0.0, 0.0, 1.0)
+        ro, ri1, ri2 = width / 2, width / 3, 2 * width / 5
+
+        grid = _polar_grid(w)
+        colors = iter(self.lookup(pos for row in grid for r, pos in row if r < ro))
+        img: List[List[Tuple[float, ...]]] = []
+
+        for y, row in enumerate(grid):
+            line: List[Tuple[float, ...]] = []
+            for x, (r, pos) in enumerate(row):
+                bgc = bgs[(y + x) % bgl]
                 if r < ro:
-                    alpha = math.atan2(ry, rx)
-                    pos = 12 * alpha / math.tau - 3
-                    alpha = 1
+                    alpha = 1.0
                     if r < ri1:
                         alpha = 1 - (ri1 - r) / ri1
                         bgc = white
                     elif r > ri2:
                         alpha = 1 - (r - ri2) / (ro - ri2)
                         bgc = black
-                    line.append(blend(self[pos].set(alpha=alpha), bgc))
+                    line.append(blend_rgb(next(colors), bgc, alpha) + (bgc[3],))
                 else:
                     line.append(bgc)
             img.append(line)
 
         return img
 
+    def _displayimage(self, width: int = None, border: int = None, bgcolors: List[Color] = None) -> List[List["Color"]]:
+        return [
+            [Color(RGBTuple(*pixel[:3]), alpha=pixel[3]) for pixel in line]
+            for line in self.raster(width, border, bgcolors)
+        ]
+
     def print(
         self,
         width: int = None,
         border: int = None,
         bgcolors: List["Color"] = None,
     ):
-        print(terminal.draw(self._displayimage(width, border, bgcolors)))
+        print(terminal.draw_rgb(self.raster(width, border, bgcolors)))
 
 
 class HSLColorWheel(ColorWheel):
@@ -219,16 +343,44 @@ class HSLColorWheel(ColorWheel):
     def __init__(self, lightness: float = .5, saturation: float = 1.0):
         self.lightness = lightness
         self.saturation = saturation
+        self.cspace = "rgb"
+        self._luts: Dict[Tuple, List[Tuple[float, ...]]] = {}
 
     def __getitem__(self, pos: float) -> Color:
         hue = pos / 12
         return Color(HSLTuple(hue, self.saturation, self.lightness))
 
+    def _lut(self, size: int) -> List[Tuple[float, ...]]:
+        key = (size, self.saturation, self.lightness)
+        if key not in self._luts:
+            self._luts.clear()
+            self._luts[key] = [
+                normalize_1base(hsl2rgb(HSLTuple((i / (size - 1)) % 1, self.saturation, self.lightness))) + (1.0,)
+                for i in range(size)
+            ]
+
+        return self._luts[key]
+
     def _get_position(self, color: Color) -> float:
         self.saturation = color.saturation
         self.lightness = color.lightness
         return color.hue * 12
 
+    def _to_color(self, ctuple: Tuple[float, ...]) -> Color:
+        return Color(ctuple)
+
+    def _positions(self, colors: List[Color]) -> List[float]:
+        return [color.hue * 12 for color in colors]
+
+    def _scheme_colors(self, colors: List[Color], positions: List[float], offsets: Tuple[int, ...]) -> List[List[Tuple[float, ...]]]:
+        return [
+            [HSLTuple(((pos + offset) / 12) % 1, hsl.saturation, hsl.lightness) for offset in offsets]
+            for pos, hsl in zip(positions, (color.hsl for color in colors))
+        ]
+
+    def _scheme_hues(self, colors: List[Color], positions: List[float], offsets: Tuple[int, ...]) -> List[List[float]]:
+        return [[((pos + offset) / 12) % 1 for offset in offsets] for pos in positions]
+
 
 class LChColorWheel(ColorWheel):
     """LCh/Lab color wheel
@@ -238,19 +390,79 @@ class LChColorWheel(ColorWheel):
         self.cie_l = cie_l
         self.cie_c = cie_c
         self.cspace = "lab"
+        self._luts: Dict[Tuple, List[Tuple[float, ...]]] = {}
 
     def __getitem__(self, pos: float) -> Color:
         cie_h = pos / 12
         return Color(LChTuple(self.cie_l, self.cie_c, cie_h))
 
+    def _lut(self, size: int) -> List[Tuple[float, ...]]:
+        key = (size, self.cie_l, self.cie_c)
+        if key not in self._luts:
+            self._luts.clear()
+            self._luts[key] = [
+                normalize_1base(lch2rgb(LChTuple(self.cie_l, self.cie_c, (i / (size - 1)) % 1))) + (1.0,)
+                for i in range(size)
+            ]
+
+        return self._luts[key]
+
     def _get_position(self, color: Color) -> float:
         self.cie_l = color.cie_l
         self.cie_c = color.cie_c
         return color.cie_h * 12
 
+    def _to_color(self, ctuple: Tuple[float, ...]) -> Color:
+        return Color(ctuple)
+
+    def _positions(self, colors: List[Color]) -> List[float]:
+        return [color.cie_h * 12 for color in colors]
+
+    def _scheme_colors(self, colors: List[Color], positions: List[float], offsets: Tuple[int, ...]) -> List[List[Tuple[float, ...]]]:
+        return [
+            [LChTuple(lch.l, lch.c, ((pos + offset) / 12) % 1) for offset in offsets]
+            for pos, lch in zip(positions, (color.lch for color in colors))
+        ]
+
+    def _scheme_hues(self, colors: List[Color], positions: List[float], offsets: Tuple[int, ...]) -> List[List[float]]:
+        return [[((pos + offset) / 12) % 1 for offset in offsets] for pos in positions]
+
+
+def divide_wheel(colors: List[Color], n: int, cspace: str = None) -> List[List[Color]]:
+    """Batch version of `Color._divide_wheel`
+
+    Rotates the hue (HSL or LCh, based on `cspace`) of every color in `n`
+    equal steps, without creating intermediate colors.
+    """
+    result = []
+    for color in colors:
+        space = cspace if cspace is not None else color.cspace
+        if space in ["lab", "lch", "xyz"]:
+            lch = color.lch
+            result.append([Color(LChTuple(lch.l, lch.c, (lch.h + v / n) % 1), alpha=color.alpha) for v in range(n)])
+        else:
+            hsl = color.hsl
+            result.append([Color(HSLTuple((hsl.hue + v / n) % 1, hsl.saturation, hsl.lightness), alpha=color.alpha) for v in range(n)])
+
+    return result
+
+
+# default wheels, created on first access
+_WHEELS = {
+    "RYB": ColorWheel,
+    "HSL": HSLColorWheel,
+    "LCH": LChColorWheel,
+}
+_ALIASES = {"RGB": "HSL", "LAB": "LCH"}
+
+
+def __getattr__(name):
+    wheel = _ALIASES.get(name, name)
+    if wheel in _WHEELS:
+        if wheel not in globals():
+            globals()[wheel] = _WHEELS[wheel]()
+        if name != wheel:
+            globals()[name] = globals()[wheel]
+        return globals()[name]
 
-RYB = ColorWheel()
-HSL = HSLColorWheel()
-RGB = HSL
-LCH = LChColorWheel()
-LAB = LCH
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
@@ -0,0 +1,279 @@
+"""Long running color service over a local UNIX socket
+
+Saves the startup cost (python, imports, color tables) of calling `repacolor`
+many times. Start it with `repacolor serve`, then talk to it with `Client` or
+any tool that can write to a UNIX socket (`socat`, `nc -U`).
+
+Protocol: UTF-8 lines, the fields are separated by tabs. Every request line
+gets exactly one response line, in order, so many requests can be sent
+before reading the responses (batching).
+
+    request:  <command>\\t<arg>\\t<arg>...
+    response: ok\\t<value>\\t<value>...
+              error\\t<message>
+
+Commands:
+
+- `ping`
+- `convert <colordef> [<format>...]` - any `Color` attribute (default: `lhex`)
+- `sample <pos> <color> <color>...` - color of the scale at `pos` ([0, 1])
+- `samples <n> <color> <color>...` - `n` evenly spaced colors of the scale
+- `contrast <colordef> <colordef>` - WCAG contrast ratio
+- `name <colordef>` - (closest) CSS color name
+"""
+
+import errno
+import os
+import socket
+import socketserver
+import stat
+import tempfile
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
+
+ENCODING = "utf-8"
+SEPARATOR = "\t"
+# longest request line (in bytes) the server accepts
+MAX_LINE = 1 << 20
+
+
+def default_socket_path() -> str:
+    rundir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(rundir, f"repacolors-{os.getuid()}.sock")
+
+
+class ServiceError(Exception):
+    """Error reported by the color service"""
+
+
+def encode_request(command: str, *args: str) -> bytes:
+    return (SEPARATOR.join((command,) + tuple(str(arg) for arg in args)) + "\n").encode(ENCODING)
+
+
+def decode_response(line: str) -> List[str]:
+    status, *values = line.rstrip("\n").split(SEPARATOR)
+    if status != "ok":
+        raise ServiceError(values[0] if values else line)
+
+    return values
+
+
+class Client:
+    """Thin client of the color service
+
+    Usage:
+
+        with Client() as client:
+            client.request("convert", "red", "cssrgb")  # ["rgb(255, 0, 0)"]
+            client.batch([("name", "#f00"), ("contrast", "#000", "#fff")])
+    """
+
+    def __init__(self, path: str = None, timeout: float = None):
+        self.path = path or default_socket_path()
+        self.timeout = timeout
+        self._socket: Optional[socket.socket] = None
+        self._reader: Optional[TextIO] = None
+
+    def _connection(self) -> Tuple[socket.socket, TextIO]:
+        if self._socket is None or self._reader is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.path)
+            self._socket, self._reader = sock, sock.makefile("r", encoding=ENCODING, newline="\n")
+
+        return self._socket, self._reader
+
+    def connect(self):
+        self._connection()
+        return self
+
+    def close(self):
+        if self._socket is not None:
+            if self._reader is not None:
+                self._reader.close()
+            self._socket.close()
+            self._socket = None
+            self._reader = None
+
+    def __enter__(self):
+        return self.connect()
+
+    def __exit__(self, *args):
+        self.close()
+
+    def request(self, command: str, *args: str) -> List[str]:
+        return self.batch([(command,) + args])[0]
+
+    def batch(self, requests: Iterable[Sequence[str]]) -> List[List[str]]:
+        """Send all the requests at once, then read the responses"""
+        sock, reader = self._connection()
+        data = b"".join(encode_request(*request) for request in requests)
+        sock.sendall(data)
+
+        return [decode_response(reader.readline()) for _ in range(data.count(b"\n"))]
+
+
+# server side
+
+@lru_cache(maxsize=4096)
+def _color(colordef: str):
+    from .colors import Color
+    return Color(colordef)
+
+
+@lru_cache(maxsize=256)
+def _scale(colordefs: Sequence[str]):
+    from .scale import ColorScale
+    return ColorScale([_color(cdef) for cdef in colordefs])
+
+
+def _value(value) -> str:
+    if isinstance(value, tuple):
+        return ",".join(str(v) for v in value)
+
+    return str(value)
+
+
+def _ping() -> List[str]:
+    return ["pong"]
+
+
+def _convert(colordef: str, *formats: str) -> List[str]:
+    color = _color(colordef)
+    if not formats:
+        formats = ("lhex",)
+
+    return [_value(getattr(color, fmt)) for fmt in formats]
+
+
+def _sample(pos: str, *colordefs: str) -> List[str]:
+    return [_scale(colordefs)[float(pos)].lhex]
+
+
+def _samples(n: str, *colordefs: str) -> List[str]:
+    return [color.lhex for color in _scale(colordefs).samples(int(n))]
+
+
+def _contrast(colordef1: str, colordef2: str) -> List[str]:
+    return [str(_color(colordef1).contrast_ratio(_color(colordef2)))]
+
+
+@lru_cache(maxsize=4096)
+def _name(colordef: str) -> List[str]:
+    from .colors import hex2name
+    color = _color(colordef)
+    name = hex2name(color.lhex)
+    if name is None:
+        name = color.closest_named(1)[0].name
+
+    return [name]
+
+
+COMMANDS: Dict[str, Callable[..., List[str]]] = {
+    "ping": _ping,
+    "convert": _convert,
+    "sample": _sample,
+    "samples": _samples,
+    "contrast": _contrast,
+    "name": _name,
+}
+
+
+def handle_line(line: str) -> str:
+    """Answer a single request line (without the newline)"""
+    command, *args = line.split(SEPARATOR)
+    fn = COMMANDS.get(command)
+    if fn is None:
+        return f"error{SEPARATOR}unknown command '{command}'"
+
+    try:
+        return SEPARATOR.join(["ok"] + fn(*args))
+    except Exception as err:
+        return f"error{SEPARATOR}{type(err).__name__}: {err}".replace("\n", " ")
+
+
+def _handle_raw_line(line: bytes) -> str:
+    try:
+        text = line.decode(ENCODING)
+    except UnicodeDecodeError as err:
+        return f"error{SEPARATOR}{type(err).__name__}: {err}"
+
+    return handle_line(text.rstrip("\r"))
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    """Answers every complete line received in one chunk with one `sendall`
+
+    Lines longer than `MAX_LINE` are answered with an error (when the limit
+    is reached) and skipped.
+    """
+
+    def handle(self):
+        pending = b""
+        skipping = False
+        while True:
+            data = self.request.recv(65536)
+            if not data:
+                break
+
+            lines = (pending + data).split(b"\n")
+            pending = lines.pop()
+            if skipping and lines:
+                # the end of the too long line
+                lines.pop(0)
+                skipping = False
+
+            responses = [_handle_raw_line(line) for line in lines]
+            if len(pending) > MAX_LINE:
+                if not skipping:
+                    responses.append(f"error{SEPARATOR}request line longer than {MAX_LINE} bytes")
+                skipping = True
+                pending = b""
+
+            if responses:
+                self.request.sendall("".join(r + "\n" for r in responses).encode(ENCODING))
+
+
+class ColorServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, handler=_RequestHandler):
+        super().__init__(path, handler)
+
+
+def _remove_stale_socket(path: str):
+    """Remove the socket of a server that is not running anymore
+
+    Raises `FileExistsError` if `path` is not a socket or a server is
+    listening on it.
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(errno.EEXIST, "Not a socket", path)
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+
+    raise FileExistsError(errno.EEXIST, "A server is already listening", path)
+
+
+def serve(path: str = None):
+    """Serve requests on the UNIX socket at `path` until interrupted"""
+    path = path or default_socket_path()
+    _remove_stale_socket(path)
+
+    with ColorServer(path) as server:
+        try:
+            server.serve_forever()
+        finally:
+            os.unlink(path)
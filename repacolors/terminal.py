@@ -1,6 +1,11 @@
-from typing import Iterable, Any, Union, List
+from typing import Iterable, Any, Union, List, Tuple
 from itertools import zip_longest
 import shutil
+from . import cache
+from . import convert
+
+# version of the ANSI tables in the artifact cache, bump it when `rgb2ansi` changes
+ANSI_TABLE_VERSION = 1
 
 
 def _linepairs(image: Iterable[Iterable[Any]]):
@@ -53,3 +58,60 @@ def draw(image: Iterable[Iterable[TerminalColor]]) -> str:
         output.append("\n")
 
     return "".join(output)
+
+
+def _rgb256(rgb: Tuple[float, ...]) -> Tuple[int, int, int]:
+    return tuple(int((max(0, min(1, c)) + .0025) * 255) for c in rgb[:3])  # type: ignore
+
+
+def draw_rgb(image: Iterable[Iterable[Tuple[float, ...]]]) -> str:
+    """Draw image of plain RGB(A) tuples (with ANSI escape sequences)
+
+    image - (r, g, b[, a])[][], components in [0, 1] range, alpha is ignored
+    """
+    output = [""]
+
+    linepairs = _linepairs(image)
+
+    for l1, l2 in linepairs:
+        if l2 is None:
+            l2 = []
+        for c1, c2 in zip_longest(l1, l2):
+            if c1 and c2:
+                output.append("\x1b[38;2;%d;%d;%dm\x1b[48;2;%d;%d;%dm▀" % (_rgb256(c1) + _rgb256(c2)))
+            elif c1:
+                output.append("\x1b[38;2;%d;%d;%dm▀" % _rgb256(c1))
+            elif c2:
+                output.append("\x1b[48;2;%d;%d;%dm▀" % _rgb256(c2))
+        output.append(TerminalColor.termreset)
+        output.append("\n")
+
+    return "".join(output)
+
+
+def _ansi_table(bits: int) -> bytes:
+    # evenly spaced levels, so black and white stay exact
+    levels = [v / ((1 << bits) - 1) for v in range(1 << bits)]
+
+    return bytes(convert.rgb2ansi((r, g, b)) for r in levels for g in levels for b in levels)
+
+
+def ansi_table(bits: int = 5) -> Union[bytes, memoryview]:
+    """ANSI 256 color of every color of `bits` bit channels
+
+    The index of an (r, g, b) color is `(r << 2 * bits) | (g << bits) | b`
+    (the top `bits` of the 8 bit channels). Loaded (memory mapped) from the
+    artifact cache if it's enabled, computed on every call otherwise.
+    """
+    artifacts = cache.artifacts()
+    if artifacts is None:
+        return _ansi_table(bits)
+
+    key = f"ansi-table:{ANSI_TABLE_VERSION}:{bits}"
+    table = artifacts.load(key)
+    if table is None:
+        data = _ansi_table(bits)
+        artifacts.store(key, data)
+        return data
+
+    return table
@@ -1,6 +1,7 @@
+from typing import Dict, Optional
 from .theme import Theme
 
-__all__ = ["Theme", "GRUVBOX", "XTHEME"]
+__all__ = ["Theme", "GRUVBOX", "XTHEME", "get_xtheme"]
 
 GRUVBOX = Theme([
     "#282828", "#cc241d", "#98971a", "#d79921", "#458588", "#b16286", "#689d6a", "#a89984",  # normal
@@ -18,10 +19,35 @@ GRUVBOX = Theme([
     "darkorange", "orange", "lightorange",
 ])
 
-# try to get XTHEME
-XTHEME = GRUVBOX
-try:
-    from .xresources import get_theme
-    XTHEME = get_theme()
-except ImportError:
-    pass
+# themes by display, `None` is the default display ($DISPLAY)
+_XTHEMES: Dict[Optional[str], Theme] = {}
+
+
+def _load_xtheme(DISPLAY=None) -> Theme:
+    try:
+        from .xresources import get_theme
+    except ImportError:
+        return GRUVBOX
+
+    return get_theme(DISPLAY)
+
+
+def get_xtheme(refresh: bool = False, DISPLAY=None) -> Theme:
+    """Theme of the X resources (`GRUVBOX` without `xcffib`)
+
+    Resolved on first use and cached per `DISPLAY`, `refresh=True` reloads it
+    (e.g. after `xrdb -merge`).
+    """
+    theme = _XTHEMES.get(DISPLAY)
+    if theme is None or refresh:
+        theme = _XTHEMES[DISPLAY] = _load_xtheme(DISPLAY)
+
+    return theme
+
+
+def __getattr__(name):
+    # XTHEME connects to the X server, only when it's used
+    if name == "XTHEME":
+        return get_xtheme()
+
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
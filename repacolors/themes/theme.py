@@ -1,5 +1,7 @@
 from collections import OrderedDict
+from typing import Any, Dict, Hashable, Tuple
 from ..colors import Color
+from .. import contrast
 
 DEFAULT_NAMES = [
     "black", "red", "green", "brown", "blue", "magenta", "cyan", "lightgray",
@@ -7,9 +9,17 @@ DEFAULT_NAMES = [
 ]
 
 class Theme(OrderedDict):
+    """Ordered color definitions, accessible by index or (alias) name
+
+    The parsed `Color`s and the derived variants (`lighten`, `darken`,
+    `textcolor`, terminal escape codes, ...) are cached, so they can be queried
+    often, changing the theme clears the caches.
+    """
 
     def __init__(self, values=None, names=None, aliases=None):
         self._aliases = aliases or {}
+        self._colors: Dict[Hashable, Color] = {}
+        self._variants: Dict[Tuple, Any] = {}
 
         if values is None:
             values = {}
@@ -46,20 +56,62 @@ class Theme(OrderedDict):
             return self.background
         return self[self._bgidx]
 
-    def color(self, attr):
-        if isinstance(attr, int):
-            return Color(self[attr])
-        else:
-            return Color(getattr(self, attr))
+    def _key(self, attr):
+        if attr == "fg":
+            return self._aliases.get("foreground", self._fgidx)
+        if attr == "bg":
+            return self._aliases.get("background", self._bgidx)
+
+        return self._aliases.get(attr, attr)
+
+    def color(self, attr) -> Color:
+        key = self._key(attr)
+        color = self._colors.get(key)
+        if color is None:
+            color = self._colors[key] = Color(self[key])
+
+        return color
+
+    def variant(self, attr, name: str, *args) -> Any:
+        """Cached `Color` attribute / method result of the color `attr`
+
+        E.g. `theme.variant("red", "lighten", 20)`, `theme.variant(3, "termfg")`
+        """
+        key = (self._key(attr), name) + args
+        if key not in self._variants:
+            value = getattr(self.color(attr), name)
+            self._variants[key] = value(*args) if callable(value) else value
+
+        return self._variants[key]
+
+    def lighten(self, attr, amount=10) -> Color:
+        return self.variant(attr, "lighten", amount)
+
+    def darken(self, attr, amount=10) -> Color:
+        return self.variant(attr, "darken", amount)
+
+    def termfg(self, attr) -> str:
+        return self.variant(attr, "termfg")
+
+    def termbg(self, attr) -> str:
+        return self.variant(attr, "termbg")
+
+    def textcolor(self, attr, background="bg", limit: float = 4.5) -> Color:
+        """The color `attr` adjusted to be readable (`limit` contrast) on `background`"""
+        key = (self._key(attr), "textcolor", self._key(background), limit)
+        if key not in self._variants:
+            self._variants[key] = contrast.adjust_contrast(self.color(attr), self.color(background), limit)[0]
+
+        return self._variants[key]
 
     def display(self):
         output = ["\n"]
-        output.append(Color(self.bg).termbg + " " * 8)
-        output.append(Color(self.fg).termbg + " " * 8)
+        output.append(self.termbg("bg") + " " * 8)
+        output.append(self.termbg("fg") + " " * 8)
         for j in range(2):
             output.append("\n")
             for i in range(8):
-                output.append(Color(self[i + j * 8]).termbg + "  ")
+                output.append(self.termbg(i + j * 8) + "  ")
         output.append("\n")
 
         return "".join(output)
@@ -79,3 +131,28 @@ class Theme(OrderedDict):
 
     def alias(self, alias, key):
         self._aliases[alias] = key
+        self._clear_cache()
+
+    def _clear_cache(self):
+        self._colors.clear()
+        self._variants.clear()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._clear_cache()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._clear_cache()
+
+    def pop(self, *args):
+        self._clear_cache()
+        return super().pop(*args)
+
+    def popitem(self, *args, **kwargs):
+        self._clear_cache()
+        return super().popitem(*args, **kwargs)
+
+    def clear(self):
+        self._clear_cache()
+        super().clear()
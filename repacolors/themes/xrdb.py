@@ -0,0 +1,66 @@
+"""X resources parsing, without an X server
+
+`parse` accepts the resources as a string (the `RESOURCE_MANAGER` property or
+the content of an `.Xresources` file), `load` reads a file.
+"""
+
+import re
+from typing import Dict
+from .theme import Theme
+
+COLOR_PROPS = [f"color{i}" for i in range(16)] + ["background", "foreground"]
+
+DEFINE_RE = re.compile(r"^#\s*define\s+(\w+)\s*(.*)$")
+
+
+def parse(resource_string: str, defaults: Dict[str, str] = None) -> Dict[str, str]:
+    """Resources defined in `resource_string`
+
+    `!` comments are skipped, `#define`d names are substituted in the values,
+    other preprocessor directives are ignored.
+    """
+    resources = {} if defaults is None else defaults.copy()
+    defines: Dict[str, str] = {}
+    define_re = None
+
+    # line continuation
+    resource_string = resource_string.replace("\\\n", "")
+
+    for line in resource_string.split("\n"):
+        line = line.strip()
+        if not line or line.startswith("!"):
+            continue
+
+        if line.startswith("#"):
+            match = DEFINE_RE.match(line)
+            if match:
+                defines[match.group(1)] = match.group(2).strip()
+                define_re = re.compile(r"\b(" + "|".join(re.escape(name) for name in defines) + r")\b")
+            continue
+
+        key, sep, value = line.partition(":")
+        if not sep:
+            continue
+
+        value = value.strip()
+        if define_re is not None:
+            value = define_re.sub(lambda m: defines[m.group(1)], value)
+
+        resources[key.strip().strip("*.")] = value
+
+    return resources
+
+
+def load(path: str, defaults: Dict[str, str] = None) -> Dict[str, str]:
+    """Resources of the file at `path` (e.g. `~/.Xresources`)"""
+    with open(path, "r") as f:
+        return parse(f.read(), defaults)
+
+
+def colors(resources: Dict[str, str]):
+    return [resources.get(key, "#000000") for key in COLOR_PROPS]
+
+
+def theme(resources: Dict[str, str]) -> Theme:
+    """Theme of the terminal colors defined in `resources`"""
+    return Theme(colors(resources), COLOR_PROPS.copy())
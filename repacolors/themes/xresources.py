@@ -1,7 +1,82 @@
 import os
+import warnings
 import xcffib
 import xcffib.xproto
-from . import Theme
+from typing import Dict, Optional
+from . import xrdb
+
+# kept for backwards compatibility
+_COLOR_PROPS = xrdb.COLOR_PROPS
+
+
+class ResourceLoader:
+    """Cached X resources of a display
+
+    Keeps the connection open and listens to the `PropertyNotify` events of the
+    root window, the `RESOURCE_MANAGER` property is fetched and parsed again
+    only if it has been changed (e.g. by `xrdb -merge`).
+    """
+
+    def __init__(self, DISPLAY=None):
+        self.display = DISPLAY
+        self._conn = None
+        self._root = None
+        self._atom = None
+        self._resources: Optional[Dict[str, str]] = None
+
+    def _connect(self):
+        self._conn = xcffib.connect(display=self.display)
+        self._root = self._conn.get_setup().roots[0].root
+        self._atom = self._conn.core.InternAtom(False, 16, "RESOURCE_MANAGER").reply().atom
+
+        self._conn.core.ChangeWindowAttributesChecked(
+            self._root, xcffib.xproto.CW.EventMask, [xcffib.xproto.EventMask.PropertyChange]
+        ).check()
+        self._resources = None
+
+    def _changed(self) -> bool:
+        changed = False
+        while True:
+            event = self._conn.poll_for_event()
+            if event is None:
+                return changed
+
+            if isinstance(event, xcffib.xproto.PropertyNotifyEvent) and event.atom == self._atom:
+                changed = True
+
+    def _fetch(self) -> str:
+        reply = self._conn.core.GetProperty(
+            False, self._root, self._atom, xcffib.xproto.Atom.STRING,
+            0, (2 ** 32) - 1).reply()
+
+        return reply.value.buf().decode("utf-8")
+
+    def get(self) -> Dict[str, str]:
+        """The resources (do not modify the returned dict)"""
+        if self._conn is None:
+            self._connect()
+
+        try:
+            if self._changed():
+                self._resources = None
+        except xcffib.ConnectionException:
+            # lost connection, try again
+            self.close()
+            self._connect()
+
+        resources = self._resources
+        if resources is None:
+            resources = self._resources = xrdb.parse(self._fetch())
+
+        return resources
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.disconnect()
+            self._conn = None
+
+
+_LOADERS: Dict[str, ResourceLoader] = {}
 
 
 def get(DISPLAY=None, defaults=None):
@@ -12,46 +87,25 @@ def get(DISPLAY=None, defaults=None):
     if DISPLAY is None:
         DISPLAY = os.environ.get("DISPLAY")
 
-    if defaults is None:
-        resources = {}
-    else:
-        resources = defaults.copy()
+    resources = {} if defaults is None else defaults.copy()
+
+    loader = _LOADERS.get(DISPLAY)
+    if loader is None:
+        loader = _LOADERS[DISPLAY] = ResourceLoader(DISPLAY)
 
     try:
-        conn = xcffib.connect(display=DISPLAY)
+        resources.update(loader.get())
     except xcffib.ConnectionException as err:
-        print(err)
-        return resources
-
-    root = conn.get_setup().roots[0].root
-    atom = conn.core.InternAtom(False, 16, 'RESOURCE_MANAGER').reply().atom
-
-    reply = conn.core.GetProperty(
-        False, root, atom, xcffib.xproto.Atom.STRING,
-        0, (2 ** 32) - 1).reply()
-    conn.disconnect()
-
-    resource_string = reply.value.buf().decode("utf-8")
-    resource_list = filter(None, resource_string.split("\n"))
-
-    for resource in resource_list:
-        key, value = resource.split(":\t")
-        resources[key.strip("*.")] = value
+        # no X server (headless), the defaults only
+        loader.close()
+        warnings.warn(f"Cannot read the X resources of display '{DISPLAY}': {err}", RuntimeWarning)
 
     return resources
 
 
-_COLOR_PROPS = [f"color{i}" for i in range(16)] + ["background", "foreground"]
-
-
 def get_colors(DISPLAY=None):
-    resources = get(DISPLAY)
-
-    return [resources.get(key, "#000000") for key in _COLOR_PROPS]
+    return xrdb.colors(get(DISPLAY))
 
 
 def get_theme(DISPLAY=None):
-    colors = get_colors(DISPLAY)
-    xtheme = Theme(colors, _COLOR_PROPS.copy())
-
-    return xtheme
+    return xrdb.theme(get(DISPLAY))
@@ -1,7 +1,7 @@
 """Named tuples for color spaces
 """
 
-from typing import Tuple, NamedTuple, Optional
+from typing import Any, Tuple, Type, NamedTuple, Optional
 
 CTuple = Tuple[float, ...]
 
@@ -78,3 +78,9 @@ def hueprop(cspace: str) -> Optional[int]:
     if 'h' in cspace:
         return cspace.index('h')
     return None
+
+
+def channels(cspace: str) -> int:
+    """Number of channels of the color space `cspace`"""
+    ctype: Type[Any] = COLORSPACES[cspace]
+    return len(ctype._fields)
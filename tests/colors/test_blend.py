@@ -47,3 +47,13 @@ def test_blend_softlight():
     c1 = Color("#6080a0")
     c2 = Color("#808010")
     assert blend(c1, c2, mode="soft-light") == Color("#70801a")
+
+
+def test_blend_rgb():
+    r, w = Color("red"), Color("white")
+
+    assert blend_rgb(r.rgb, w.rgb) == r.rgb
+    assert blend_rgb(r.rgb, w.rgb, 0) == w.rgb
+    assert Color(blend_rgb(r.rgb, w.rgb, .5)) == Color("#ffbaba")
+    assert Color(blend_rgb(r.rgb, w.rgb, .5, gamma=1)) == Color("#ff8080")
+    assert Color(blend_rgb((.5, .5, .5), (.625, .5, .375), mode="multiply")) == Color("#504030")
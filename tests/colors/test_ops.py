@@ -1,3 +1,4 @@
+import pytest
 from repacolors import convert, colors, Color
 from repacolors.ops import *
 import random
@@ -149,9 +150,135 @@ def test_average():
 
     assert average([r, g, b]) == Color("#555")
     assert average([r, g, b], [1, 2, 1]) == Color("#408040")
-    assert average([r, g, b], [1, 2, 1], "lch") == Color("#00c336")
-    assert average([r, g, b], [1, 2], "lch") == Color("#00c336")
-    assert average([r, g, b], [1, 2, 1, 1], "lch") == Color("#00c336")
+    assert average([r, g, b], [1, 2, 1], "lch") == Color("#b5a000")
+    assert average([r, g, b], [1, 2], "lch") == Color("#b5a000")
+    assert average([r, g, b], [1, 2, 1, 1], "lch") == Color("#b5a000")
 
     assert average([]) == Color()
     assert average([r]) == r
+
+
+def test_average_hue():
+    c1, c2 = Color("hsl(350, 100%, 50%)"), Color("hsl(30, 100%, 50%)")
+    assert average([c1, c2], cspace="hsl").hsl.hue * 360 == pytest.approx(10)
+    assert average([c1, c2], [3, 1], cspace="hsl").hsl.hue * 360 == pytest.approx(359.6, abs=.1)
+
+
+def test_average_colorarray():
+    from repacolors.colorarray import ColorArray, from_buffer
+
+    r, g, b = Color("red"), Color("#0f0"), Color("blue")
+    carr = ColorArray.from_colors([r, g, b], "rgb")
+    assert average(carr) == average([r, g, b])
+    assert average(carr, [1, 2, 1], "lab") == average([r, g, b], [1, 2, 1], "lab")
+    assert average(from_buffer(bytes([255, 0, 0, 0, 0, 255]), "RGB")) == Color("#800080")
+
+
+def test_accumulator():
+    r, g, b = Color("red"), Color("#0f0"), Color("blue")
+    acc = Accumulator("rgb")
+    assert acc.mean() == Color()
+
+    acc.add(r)
+    acc.update([g, b], [2, 1])
+    assert acc.count == 3
+    assert acc.weight == 4
+    assert acc.mean() == average([r, g, b], [1, 2, 1])
+
+    acc = Accumulator("rgb")
+    acc.add(RGBTuple(1, 1, 1), alpha=0)
+    acc.add(RGBTuple(0, 0, 0))
+    assert acc.mean().alpha == pytest.approx(.5)
+
+    with pytest.raises(ValueError):
+        Accumulator("rgx")
+
+
+def test_median():
+    assert weighted_median([3, 1, 2]) == 2
+    assert weighted_median([3, 1, 2], [1, 1, 5]) == 2
+    assert weighted_median([3, 1, 2], [5, 1, 1]) == 3
+    with pytest.raises(ValueError):
+        weighted_median([])
+
+    r, g, b = Color("red"), Color("#0f0"), Color("blue")
+    assert median([r, g, b]) == Color("black")
+    assert median([r, g, g, b], [1, 1, 1, 0]) == Color("#0f0")
+    assert median([Color("#111"), Color("#222"), Color("#fff")]) == Color("#222")
+    assert median([]) == Color()
+
+    hues = [Color(f"hsl({h}, 100%, 50%)") for h in (350, 355, 20)]
+    assert median(hues, cspace="hsl").hsl.hue * 360 == pytest.approx(355)
+
+
+def test_array_ops():
+    from repacolors.colorarray import ColorArray
+
+    clist = [Color("#c09060"), Color("#123456"), Color("hsl(200, 50%, 50%)")]
+    carr = ColorArray.from_colors(clist, "lab")
+    dlab = convert.LabTuple(10, -5, 5)
+
+    assert add(carr, dlab).hexes() == [add(c, dlab).lhex for c in clist]
+    assert sub(carr, 20).hexes() == [sub(c, 20, "lab").lhex for c in clist]
+    assert mul(carr, Color("#808080")).hexes() == [mul(c, Color("#808080"), "lab").lhex for c in clist]
+    assert div(carr, 3, "rgb").hexes() == [div(c, 3, "rgb").lhex for c in clist]
+    assert sub(Color("#fff"), carr, "rgb").hexes() == [sub(Color("#fff"), c, "rgb").lhex for c in clist]
+
+    assert (carr + dlab).hexes() == add(carr, dlab).hexes()
+    assert (carr.to("rgb") / 3).hexes() == div(carr, 3, "rgb").hexes()
+    assert (1 - carr.to("rgb")).hexes() == [c.lhex for c in sub(Color("#fff"), carr, "rgb")]
+    assert (Color("#fff") - carr.to("rgb")).hexes() == (1 - carr.to("rgb")).hexes()
+
+    doubled = carr + carr
+    assert doubled.cspace == "lab"
+    assert doubled.hexes() == [add(c, c, "lab").lhex for c in clist]
+    assert (carr + carr[:1]).hexes() == [add(c, clist[0], "lab").lhex for c in clist]
+
+    with pytest.raises(ValueError):
+        carr + carr[:2]
+
+
+def test_array_alpha_normalize():
+    from repacolors.colorarray import ColorArray
+
+    carr = ColorArray([.5, .5, .5, 1, 1, 1], "rgb", [.5, 1])
+    assert list((carr * 3).values) == [1, 1, 1, 1, 1, 1]
+
+    # the same alpha as the operations on colors
+    translucent = Color("#0000ff80")
+    opaque = ColorArray.from_colors(["red", "lime"])
+    for result, expected in [
+        (carr * 3, [c * 3 for c in carr]),
+        (opaque + translucent, [c + translucent for c in opaque]),
+        (translucent - opaque, [translucent - c for c in opaque]),
+        (carr + carr, [c + c for c in carr]),
+    ]:
+        assert [c.alpha for c in result] == [c.alpha for c in expected]
+        assert result.hexes() == [c.lhex for c in expected]
+
+    hsl = ColorArray([1.2, 2, -1, 1, .5, .5], "hsl")
+    normalized = normalize(hsl)
+    assert list(normalized.values) == pytest.approx([.2, 1, 0, 1, .5, .5])
+    assert list(normalized.values) == pytest.approx([v for c in hsl.tuples() for v in normalize(c)])
+
+    lch = ColorArray([500, -300, 1.5], "lch")
+    assert list(lch.normalize().values) == pytest.approx(list(normalize(convert.LChTuple(500, -300, 1.5))))
+    assert normalize(lch, "lab").cspace == "lab"
+
+
+def test_mix_many():
+    r, b = Color("red"), Color("#0000ff80")
+    ratios = [0, .25, .5, .75, 1, -.5, 2]
+
+    for cspace in ["rgb", "hsl", "lab", "lch"]:
+        mixed = mix_many(r, b, ratios, cspace)
+        assert mixed.cspace == cspace
+        assert list(mixed) == [r.mix(b, ratio, cspace) for ratio in ratios]
+        assert list(mixed.alpha) == pytest.approx([r.mix(b, ratio).alpha for ratio in ratios])
+
+    assert list(mix_many(r, Color("lime"), ratios, "rgb", 2.2)) == [r.mix(Color("lime"), ratio, "rgb", 2.2) for ratio in ratios]
+    assert mix_many(r, Color("lime"), ratios).alpha is None
+
+    # hue the shorter way
+    c1, c2 = Color("hsl(350, 100%, 50%)"), Color("hsl(30, 100%, 50%)")
+    assert mix_many(c1, c2, [.25], "hsl")[0].hsl.hue * 360 == pytest.approx(0)
@@ -0,0 +1,82 @@
+from repacolors import Color
+from repacolors.aio import *
+from repacolors.service import ColorServer, ServiceError
+import asyncio
+import threading
+import pytest
+
+
+def test_convert():
+    async def convert():
+        async with ColorPool(chunksize=2) as pool:
+            return await pool.convert(["red", "#0f0", "blue", "rgb(0, 0, 0)", "white"], "lhex")
+
+    assert asyncio.run(convert()) == ["#ff0000", "#00ff00", "#0000ff", "#000000", "#ffffff"]
+
+
+def test_process_pool():
+    async def convert():
+        async with ColorPool("process", max_workers=2, chunksize=3) as pool:
+            return await asyncio.gather(
+                pool.convert(["red"] * 10, "cssrgb"),
+                pool.map_scale(["#000", Color("#fff")], [0, .5, 1]),
+                pool.palette("viridis"),
+                pool.palette("viridis", 3),
+                pool.schemes(["red", "blue"], "complementary", "hsl"),
+            )
+
+    converted, scale, palette, samples, schemes = asyncio.run(convert())
+    assert converted == ["rgb(255, 0, 0)"] * 10
+    assert scale == [Color("#000"), Color("#777"), Color("#fff")]
+    assert palette[0] == Color("#440154")
+    assert len(samples) == 3
+    assert schemes[0] == (Color("red"), Color("cyan"))
+
+
+def test_pool_kind():
+    with pytest.raises(ValueError):
+        ColorPool("nonexisting")
+
+
+def test_cancel():
+    async def cancel():
+        async with ColorPool(limit=1, chunksize=1) as pool:
+            task = asyncio.ensure_future(pool.convert(["red"] * 1000))
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            # still usable
+            return await pool.convert(["red"])
+
+    assert asyncio.run(cancel()) == ["#ff0000"]
+
+
+def test_reuse_across_loops():
+    pool = ColorPool(limit=1, chunksize=1)
+    try:
+        assert asyncio.run(pool.convert(["red", "blue"])) == ["#ff0000", "#0000ff"]
+        assert asyncio.run(pool.convert(["lime", "white"])) == ["#00ff00", "#ffffff"]
+    finally:
+        pool.close()
+
+
+def test_client(tmp_path):
+    path = str(tmp_path / "repacolors.sock")
+    server = ColorServer(path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    async def requests():
+        async with AsyncClient(path) as client:
+            results = await asyncio.gather(*(client.request("convert", f"#{i:06x}") for i in range(100)))
+            with pytest.raises(ServiceError):
+                await client.request("nonexisting")
+            return results + await client.batch([("name", "#f00"), ("ping",)])
+
+    try:
+        assert asyncio.run(requests()) == [[f"#{i:06x}"] for i in range(100)] + [["red"], ["pong"]]
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,154 @@
+import os
+import pytest
+from repacolors import cache, terminal, ColorScale
+from repacolors import scale
+from repacolors.scale import LUT_VERSION
+
+
+@pytest.fixture
+def artifacts(tmp_path):
+    yield cache.ArtifactCache(str(tmp_path / "artifacts"), max_size=1000)
+
+
+@pytest.fixture
+def enabled(tmp_path):
+    yield cache.enable(str(tmp_path / "artifacts"))
+    cache.disable()
+
+
+def test_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("REPACOLORS_CACHE_DIR", str(tmp_path / "own"))
+    assert cache.cache_dir() == str(tmp_path / "own")
+    assert os.path.isdir(tmp_path / "own")
+
+    monkeypatch.delenv("REPACOLORS_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    assert cache.cache_dir(create=False) == str(tmp_path / "xdg" / "repacolors")
+    assert not os.path.exists(tmp_path / "xdg")
+
+
+def test_atomic_write(tmp_path):
+    path = str(tmp_path / "file")
+    cache.atomic_write(path, b"one")
+    cache.atomic_write(path, b"two")
+    with open(path, "rb") as f:
+        assert f.read() == b"two"
+    assert os.listdir(tmp_path) == ["file"]
+
+
+def test_store_load(artifacts):
+    assert artifacts.load("key") is None
+
+    artifacts.store("key", b"payload")
+    assert bytes(artifacts.load("key")) == b"payload"
+    assert artifacts.load("other") is None
+
+
+def test_invalid(artifacts):
+    artifacts.store("key", b"payload")
+    path = artifacts.path("key")
+
+    with open(path, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        f.write(b"X")
+    assert artifacts.load("key") is None
+    assert not os.path.exists(path)
+
+    artifacts.store("key", b"payload")
+    with open(path, "r+b") as f:
+        f.seek(4)
+        f.write(b"\xff")  # version
+    assert artifacts.load("key") is None
+
+    artifacts.store("key", b"payload")
+    with open(path, "r+b") as f:
+        f.truncate(10)
+    assert artifacts.load("key") is None
+
+
+def test_read(artifacts):
+    assert artifacts.read("key") is None
+
+    artifacts.store("key", b"payload")
+    assert artifacts.read("key") == b"payload"
+
+    with open(artifacts.path("key"), "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        f.write(b"X")
+    assert artifacts.read("key") is None
+    assert not os.path.exists(artifacts.path("key"))
+
+
+def test_lru(artifacts):
+    for i, key in enumerate(["a", "b", "c"]):
+        artifacts.store(key, bytes(300))
+        os.utime(artifacts.path(key), (i, i))
+
+    # used, becomes the most recent
+    assert artifacts.load("a") is not None
+
+    artifacts.store("d", bytes(300))
+    assert artifacts.load("b") is None
+    assert all(artifacts.load(key) is not None for key in ["a", "c", "d"])
+
+    artifacts.clear()
+    assert os.listdir(artifacts.directory) == []
+
+
+def test_scale_lut(enabled):
+    scale = ColorScale(["#000", "#f00", "#fff"])
+    lut = scale.lut(32)
+    assert len(os.listdir(enabled.directory)) == 1
+
+    # another process
+    fresh = ColorScale(["#000", "#f00", "#fff"])
+    fresh.samples = None
+    assert fresh.lut(32) == lut
+
+    fresh = ColorScale(["#000", "#f00", "#fff"], gamma=2)
+    assert fresh.lut(32) != lut
+    assert len(os.listdir(enabled.directory)) == 2
+
+    # keyed on the components, not on the rounded hex
+    fresh = ColorScale(["#000", (1 - 1 / 1024, 0, 0), "#fff"])
+    assert fresh.colors[1].lhex == "#ff0000"
+    fresh.lut(32)
+    assert len(os.listdir(enabled.directory)) == 3
+
+
+def test_scale_lut_version(enabled, monkeypatch):
+    ColorScale(["#000", "#fff"]).lut(32)
+    monkeypatch.setattr(scale, "LUT_VERSION", LUT_VERSION + 1)
+    ColorScale(["#000", "#fff"]).lut(32)
+    assert len(os.listdir(enabled.directory)) == 2
+
+
+def test_ansi_table(tmp_path):
+    cache.disable()
+    table = terminal.ansi_table(4)
+    assert len(table) == 16 ** 3
+    assert table[0] == 16 and table[-1] == 231
+
+    # enabled after the first use
+    artifacts = cache.enable(str(tmp_path / "artifacts"))
+    try:
+        assert terminal.ansi_table(4) == table
+        assert len(os.listdir(artifacts.directory)) == 1
+
+        loaded = terminal.ansi_table(4)
+        assert isinstance(loaded, memoryview)
+        assert bytes(loaded) == table
+    finally:
+        cache.disable()
+
+
+def test_disabled(monkeypatch, tmp_path):
+    monkeypatch.setattr(cache, "_ENABLED", None)
+    monkeypatch.delenv("REPACOLORS_CACHE", raising=False)
+    assert cache.artifacts() is None
+
+    monkeypatch.setattr(cache, "_ENABLED", None)
+    monkeypatch.setenv("REPACOLORS_CACHE", "1")
+    monkeypatch.setenv("REPACOLORS_CACHE_DIR", str(tmp_path))
+    assert cache.artifacts().directory == str(tmp_path / "artifacts")
+    cache.disable()
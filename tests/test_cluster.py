@@ -0,0 +1,80 @@
+import random
+import pytest
+from repacolors import Color, ColorArray, ColorScale
+from repacolors.cluster import *
+from repacolors.themes import Theme
+from repacolors.types import LabTuple
+
+CENTERS = ["#c81e1e", "#1ea03c", "#1428c8"]
+
+
+def blobs(n=60, seed=1):
+    rnd = random.Random(seed)
+    colors = []
+    for hx in CENTERS:
+        center = Color(hx).lab
+        colors.extend(Color(LabTuple(*(v + rnd.uniform(-3, 3) for v in center))) for _ in range(n))
+    return colors
+
+
+def matches(result, centers=CENTERS):
+    return sorted(
+        min(range(len(centers)), key=lambda i: color.distance(Color(centers[i])))
+        for color, _ in result
+    ) == list(range(len(centers)))
+
+
+def test_kmeans():
+    colors = blobs()
+    result = kmeans(colors, 3, seed=1)
+    assert len(result) == 3
+    assert matches(result)
+    assert sum(w for _, w in result) == pytest.approx(1)
+    assert [w for _, w in result] == pytest.approx([1 / 3] * 3)
+
+    # deterministic
+    assert [c.lhex for c, _ in kmeans(colors, 3, seed=1)] == [c.lhex for c, _ in result]
+
+
+def test_kmeans_inputs():
+    colors = blobs(20)
+    expected = [c.lhex for c, _ in kmeans(colors, 3, seed=2)]
+    assert [c.lhex for c, _ in kmeans([c.lab for c in colors], 3, seed=2)] == expected
+    assert [c.lhex for c, _ in kmeans(ColorArray.from_colors(colors, "lab"), 3, seed=2)] == expected
+
+    assert kmeans([], 3) == []
+    assert len(kmeans([Color("red")] * 5, 3)) == 1
+
+    with pytest.raises(ValueError):
+        kmeans(colors, 3, weights=[1])
+
+
+def test_kmeans_weights():
+    colors = [Color("#000"), Color("#fff"), Color("#f00")]
+    result = kmeans(colors, 3, weights=[1, 2, 5], seed=0)
+    assert [(c.lhex, w) for c, w in result] == [("#ff0000", .625), ("#ffffff", .25), ("#000000", .125)]
+
+    result = kmeans(colors, 1, weights=[0, 1, 1])
+    assert result[0][0].distance(Color("#fff").mix(Color("#f00"), cspace="lab")) < 1
+
+
+def test_kmeans_jobs():
+    colors = blobs(100)
+    assert [c.lhex for c, _ in kmeans(colors, 3, seed=3, jobs=2)] == [c.lhex for c, _ in kmeans(colors, 3, seed=3)]
+
+
+def test_minibatch():
+    result = kmeans(blobs(), 3, seed=4, batch_size=32)
+    assert matches(result)
+    assert [w for _, w in result] == pytest.approx([1 / 3] * 3)
+
+
+def test_theme_scale():
+    colors = blobs(20)
+    t = theme(colors, 3, seed=5)
+    assert isinstance(t, Theme)
+    assert len(t) == 3
+
+    s = scale(colors, 3, seed=5)
+    assert isinstance(s, ColorScale)
+    assert s[0].cie_l <= s[.5].cie_l <= s[1].cie_l
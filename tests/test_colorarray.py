@@ -0,0 +1,95 @@
+import mmap
+import pytest
+from repacolors import Color, ColorArray
+from repacolors.colorarray import *
+from repacolors.types import *
+
+
+def test_colorarray():
+    carr = ColorArray([1, 0, 0, 0, 1, 0, 0, 0, 1])
+    assert len(carr) == 3
+    assert carr[0] == Color("red")
+    assert carr[-1] == Color("blue")
+    assert list(carr) == [Color("red"), Color("lime"), Color("blue")]
+    assert list(carr.tuples()) == [RGBTuple(1, 0, 0), RGBTuple(0, 1, 0), RGBTuple(0, 0, 1)]
+    assert carr.alpha is None
+    assert carr.hexes() == ["#ff0000", "#00ff00", "#0000ff"]
+
+    sliced = carr[1:]
+    assert isinstance(sliced, ColorArray)
+    assert sliced.hexes() == ["#00ff00", "#0000ff"]
+
+    with pytest.raises(IndexError):
+        carr[3]
+
+    with pytest.raises(ValueError):
+        ColorArray([1, 0])
+
+    with pytest.raises(ValueError):
+        ColorArray([1, 0, 0], "rgx")
+
+
+def test_colorarray_cspaces():
+    colors = [Color("red"), Color("#00ff0080"), Color("hsl(200, 50%, 50%)")]
+    carr = ColorArray.from_colors(colors, "lab")
+    assert carr.cspace == "lab"
+    assert list(carr.tuples())[0] == Color("red").lab
+    assert list(carr) == colors
+    assert carr[1].alpha == pytest.approx(128 / 255)
+
+    for cspace in ["rgb", "hsl", "lch", "cmyk", "xyz"]:
+        converted = carr.to(cspace)
+        assert converted.cspace == cspace
+        assert converted.hexes() == [c.lhex for c in colors]
+        assert list(converted.alpha) == list(carr.alpha)
+
+    assert carr.to("lab") is carr
+    assert ColorArray.from_colors(["red", "blue"]).alpha is None
+
+
+def test_from_buffer():
+    data = bytes([0, 0, 255, 0, 0, 255, 0, 0, 255, 0, 0, 0])
+    carr = from_buffer(data)
+    assert len(carr) == 3
+    assert carr.hexes() == ["#ff0000", "#00ff00", "#0000ff"]
+    assert carr[1] == Color("lime")
+    assert carr.alpha is None
+
+    carr = from_buffer(data, "RGBA")
+    assert carr.hexes() == ["#0000ff", "#00ff00", "#ff0000"]
+    assert carr[0].alpha == 0
+    assert list(carr.alpha) == [0, 0, 0]
+
+    carr = from_buffer(data, "RGB", 2, 2)
+    assert carr.hexes() == ["#0000ff", "#0000ff", "#0000ff", "#000000"]
+
+
+def test_from_buffer_stride():
+    # 2x2 RGB, rows padded to 8 bytes
+    data = bytearray([255, 0, 0, 0, 255, 0, 9, 9, 0, 0, 255, 255, 255, 255, 9, 9])
+    carr = from_buffer(data, "RGB", 2, 2, 8)
+    assert carr.hexes() == ["#ff0000", "#00ff00", "#0000ff", "#ffffff"]
+    assert carr.pixel(1, 1) == Color("white")
+    assert list(carr.values) == [1, 0, 0, 0, 1, 0, 0, 0, 1, 1, 1, 1]
+    assert carr[1:3].hexes() == ["#00ff00", "#0000ff"]
+
+    # zero-copy
+    data[0] = 0
+    assert carr[0] == Color("black")
+
+    with pytest.raises(ValueError):
+        from_buffer(data, "RGB", 2, 3, 8)
+
+    with pytest.raises(IndexError):
+        carr.pixel(2, 0)
+
+
+def test_from_buffer_sources():
+    data = bytes([255, 0, 0, 0, 255, 0])
+    assert from_buffer(memoryview(data), "RGB").hexes() == ["#ff0000", "#00ff00"]
+
+    with mmap.mmap(-1, len(data)) as mm:
+        mm.write(data)
+        carr = from_buffer(mm, "RGB")
+        assert carr.hexes() == ["#ff0000", "#00ff00"]
+        del carr
@@ -0,0 +1,180 @@
+from repacolors import Color, ColorScale
+import repacolors.palette
+from repacolors.command.repacolor import *
+from repacolors.command.repacolor import _format_scale_sample, _raw_struct
+from click.testing import CliRunner
+import io
+import json
+import os
+import struct
+import subprocess
+import sys
+import pytest
+
+
+class FakeTTY(io.StringIO):
+    def isatty(self):
+        return True
+
+
+def _double(x):
+    return x * 2
+
+
+def test_ordered_map():
+    assert list(ordered_map(_double, [1, 2, 3])) == [2, 4, 6]
+    assert list(ordered_map(_double, range(1000), jobs=2, chunksize=7)) == [x * 2 for x in range(1000)]
+    assert list(ordered_map(_double, [], jobs=2)) == []
+
+
+def test_no_process_pool_import():
+    code = "import sys, repacolors.command.repacolor; print('concurrent.futures.process' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout == "False\n"
+
+
+def test_split_colordefs():
+    assert split_colordefs("red #fff") == ["red", "#fff"]
+    assert split_colordefs("rgb(1, 2, 3) #fff") == ["rgb(1, 2, 3)", "#fff"]
+    assert split_colordefs("rgb(1, 2, 3)\t hsl(1, 2%, 3%) \t") == ["rgb(1, 2, 3)", "hsl(1, 2%, 3%)"]
+    assert split_colordefs("  ") == []
+
+
+def test_adjust_contrast_pairs():
+    runner = CliRunner()
+    lines = ["#777 #888", "", "#fff\t#eee", "#000"]
+
+    result = runner.invoke(color, ["adjust-contrast", "--pairs", "--format", "lhex", "-j", "2"], input="\n".join(lines))
+    assert result.exit_code == 0
+    output = result.output.split("\n")[:-1]
+    assert len(output) == 4
+    assert output[1] == ""
+    for line, out in zip(lines, output):
+        if line:
+            fg, bg = (Color(c) for c in out.split())
+            # the output is rounded to 8 bit
+            assert fg.contrast_ratio(bg) > 4.45
+
+
+def test_write_lines():
+    out = io.StringIO()
+    write_lines(iter(["a", "b"]), out, flush_every=1)
+    assert out.getvalue() == "a\nb\n"
+
+
+def test_write_lines_broken_pipe():
+    rfd, wfd = os.pipe()
+    os.close(rfd)
+    with os.fdopen(wfd, "w") as stream:
+        with pytest.raises(SystemExit):
+            write_lines(["a"], stream, flush_every=1)
+
+
+def test_display_stream():
+    runner = CliRunner()
+
+    result = runner.invoke(color, ["display", "--format", "lhex", "red", "lime", "blue"])
+    assert result.exit_code == 0
+    assert result.output.splitlines() == ["#ff0000", "#00ff00", "#0000ff"]
+
+    result = runner.invoke(color, ["display", "--format", "lhex"], input="red\n\nblue\n")
+    assert result.output.splitlines() == ["#ff0000", "#0000ff"]
+
+
+def test_resolve_format():
+    assert resolve_format("display", stream=io.StringIO()) == "lhex"
+    assert resolve_format("hexdisplay", stream=io.StringIO()) == "lhex"
+    assert resolve_format("display", force_ansi=True, stream=io.StringIO()) == "display"
+    assert resolve_format("display", stream=FakeTTY()) == "display"
+    assert resolve_format("cssrgb", stream=io.StringIO()) == "cssrgb"
+
+
+def test_format_scale_sample():
+    assert _format_scale_sample(0, ("red", "blue"), "lhex") == "#ff0000"
+    assert _format_scale_sample(1, ("red", "blue"), "lhex") == "#0000ff"
+
+
+def test_jobs_keep_order():
+    runner = CliRunner()
+    colors = [f"#{i:06x}" for i in range(0, 0xffffff, 0xffff)]
+
+    result = runner.invoke(color, ["display", "--format", "lhex", "-j", "2"], input="\n".join(colors))
+    assert result.exit_code == 0
+    assert result.output.splitlines() == colors
+
+    result = runner.invoke(color, ["scale", "--format", "lhex", "-s", "5", "-j", "2", "#000", "#fff"])
+    assert result.output.splitlines() == [ColorScale(["#000", "#fff"])[i / 4].lhex for i in range(5)]
+
+    result = runner.invoke(color, ["palette", "--format", "lhex", "-j", "2", "ryb"])
+    assert result.output.splitlines() == [Color(c).lhex for c in repacolors.palette.get_palette("ryb")]
+
+
+def test_color_record():
+    props = ("hex", "rgb", "contrast")
+    assert color_record("red", props) == ("#ff0000", (255, 0, 0), Color("red").contrast_ratio(Color("#fff")))
+    assert color_record(Color("red"), props, "#000") == ("#ff0000", (255, 0, 0), Color("red").contrast_ratio(Color("#000")))
+    assert color_record("#ff000080", ("hexa", "alpha")) == ("#ff000080", pytest.approx(128 / 255))
+
+    with pytest.raises(AttributeError):
+        color_record(Color(), ("nonexisting",))
+
+
+def test_write_records():
+    props = ("hex", "rgb", "lab")
+    records = [color_record(c, props) for c in ["red", "blue"]]
+
+    out = io.StringIO()
+    write_records(iter(records), props, "jsonl", out)
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["hex"] == "#ff0000"
+    assert json.loads(lines[1])["rgb"] == [0, 0, 255]
+
+    out = io.StringIO()
+    write_records(iter(records), props, "csv", out)
+    lines = out.getvalue().splitlines()
+    assert lines[0] == "hex,rgb_red,rgb_green,rgb_blue,lab_l,lab_a,lab_b"
+    assert lines[1].startswith("#ff0000,255,0,0,")
+
+    out = io.BytesIO()
+    write_records(iter(records), props, "raw", out)
+    packer = _raw_struct(props, records[0])
+    assert packer.format == "<4B3B3f"
+    assert len(out.getvalue()) == 2 * packer.size
+    assert packer.unpack_from(out.getvalue())[:7] == (255, 0, 0, 255, 255, 0, 0)
+    assert packer.unpack_from(out.getvalue(), packer.size)[:7] == (0, 0, 255, 255, 0, 0, 255)
+
+    with pytest.raises(click.BadParameter):
+        _raw_struct(("name",), ("red",))
+
+
+def test_display_outputs():
+    runner = CliRunner()
+    colors = ["red", "lime", "blue"]
+
+    result = runner.invoke(color, ["display", "-o", "jsonl", "--props", "hex,alpha"] + colors)
+    assert [json.loads(line) for line in result.output.splitlines()] == [
+        {"hex": "#ff0000", "alpha": 1}, {"hex": "#00ff00", "alpha": 1}, {"hex": "#0000ff", "alpha": 1},
+    ]
+
+    result = runner.invoke(color, ["display", "-o", "csv", "--props", "hex,rgb"] + colors)
+    assert result.output.splitlines() == [
+        "hex,rgb_red,rgb_green,rgb_blue", "#ff0000,255,0,0", "#00ff00,0,255,0", "#0000ff,0,0,255",
+    ]
+
+    result = runner.invoke(color, ["display", "-o", "raw", "--props", "hex,luminance"] + colors)
+    assert result.exit_code == 0
+    values = list(struct.iter_unpack("<4Bf", result.stdout_bytes))
+    assert [v[:4] for v in values] == [(255, 0, 0, 255), (0, 255, 0, 255), (0, 0, 255, 255)]
+
+    result = runner.invoke(color, ["display", "-o", "jsonl", "--props", "nonexisting"] + colors)
+    assert result.exit_code != 0
+
+    colors = [f"#{i:06x}" for i in range(0, 0xffffff, 0xffff)]
+    result = runner.invoke(color, ["display", "-o", "csv", "--props", "hex", "-j", "2"], input="\n".join(colors))
+    assert result.output.splitlines() == ["hex"] + colors
+
+
+def test_pick_region_bounds():
+    result = CliRunner().invoke(color, ["pick", "--region", "0", "--loupe"])
+    assert result.exit_code == 2
+    assert "--region" in result.output
@@ -0,0 +1,82 @@
+from repacolors import Color
+from repacolors.contrast import *
+import random
+
+
+def about_the_same(x, y, epsilon=0.001):
+    return x - epsilon < y < x + epsilon
+
+
+def test_ratio():
+    assert about_the_same(ratio(0, 1), 21)
+    assert about_the_same(ratio(1, 0), 21)
+    assert ratio(.5, .5) == 1
+
+
+def test_contrast_matrix():
+    colors_a = [Color((random.random(), random.random(), random.random())) for _ in range(5)]
+    colors_b = [Color((random.random(), random.random(), random.random())) for _ in range(3)]
+
+    matrix = contrast_matrix(colors_a, colors_b)
+    assert len(matrix) == 5
+    for ca, row in zip(colors_a, matrix):
+        assert len(row) == 3
+        for cb, cr in zip(colors_b, row):
+            assert about_the_same(cr, ca.contrast_ratio(cb))
+
+    assert contrast_matrix(["black", "white"]) == contrast_matrix(["black", "white"], ["#000", "#fff"])
+
+
+def test_passes():
+    matrix = contrast_matrix(["black", "white", "#777"])
+
+    assert passes(matrix) == [
+        [False, True, True],
+        [True, False, False],
+        [True, False, False],
+    ]
+    assert passes(matrix, AAA)[0] == [False, True, False]
+
+
+def test_passing_pairs():
+    assert passing_pairs(["black", "white"], ["#fff", "#000", "#777"], AAA) == [(0, 0), (1, 1)]
+
+
+def test_solve_lightness():
+    hsl = Color("#5e8d87").hsl
+    lum = luminance(Color("#5e8d87"))
+
+    assert solve_lightness(hsl, lum - .01) == hsl.lightness
+    assert solve_lightness(hsl, 1.01) is None
+
+    lightness = solve_lightness(hsl, .5, tolerance=1e-6)
+    assert about_the_same(luminance(Color(hsl._replace(lightness=lightness))), .5)
+
+    lightness = solve_lightness(hsl, .05, lighter=False, tolerance=1e-6)
+    assert about_the_same(luminance(Color(hsl._replace(lightness=lightness))), .05)
+
+
+def test_adjust_contrast():
+    c1, c2 = Color("#5e8d87"), Color("#555")
+
+    ac1, ac2 = adjust_contrast(c1, c2)
+    assert ac2 == c2
+    assert ac1.hue == c1.hue
+    assert ac1.lightness > c1.lightness
+    assert about_the_same(ac1.contrast_ratio(ac2), 4.5)
+
+    # both colors has to be changed
+    ac1, ac2 = adjust_contrast(c1, c2, 21)
+    assert ac1 == Color("white")
+    assert ac2 == Color("black")
+
+    # already fine
+    assert adjust_contrast(Color("black"), Color("white")) == (Color("black"), Color("white"))
+
+
+def test_adjust_contrast_many():
+    pairs = [((random.random(), random.random(), random.random()), (random.random(), random.random(), random.random())) for _ in range(20)]
+
+    for limit in (AA_LARGE, AA, AAA):
+        for ac1, ac2 in adjust_contrast_many(pairs, limit):
+            assert ac1.contrast_ratio(ac2) >= limit
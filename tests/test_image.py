@@ -0,0 +1,144 @@
+import mmap
+import pytest
+from repacolors import Color, ColorScale
+from repacolors.image import *
+from repacolors.themes import Theme
+
+RED, GREEN, BLUE = (200, 30, 30), (30, 160, 60), (20, 40, 200)
+
+
+def pixel_data(width, height, alpha=False):
+    """Left half red, right half green-blue stripes"""
+    data = bytearray()
+    for y in range(height):
+        for x in range(width):
+            color = RED if x < width // 2 else (GREEN if y % 2 else BLUE)
+            data.extend(color)
+            if alpha:
+                data.append(0 if x == 0 else 255)
+    return bytes(data)
+
+
+@pytest.fixture
+def ppm(tmp_path):
+    path = tmp_path / "image.ppm"
+    path.write_bytes(b"P6\n# comment\n8 4\n255\n" + pixel_data(8, 4))
+    return str(path)
+
+
+def test_open_ppm(ppm):
+    with Image.open(ppm) as img:
+        assert (img.width, img.height, img.byteorder) == (8, 4, "RGB")
+
+        tiles = list(img.tiles(3))
+        assert [len(tile) for tile in tiles] == [24, 8]
+        assert tiles[0][0] == Color(bytes(RED))
+        assert tiles[1][7] == Color(bytes(GREEN))
+        del tiles
+
+
+def test_open_pam(tmp_path):
+    path = tmp_path / "image.pam"
+    header = b"P7\nWIDTH 4\nHEIGHT 2\nDEPTH 4\nMAXVAL 255\nTUPLTYPE RGB_ALPHA\nENDHDR\n"
+    path.write_bytes(header + pixel_data(4, 2, alpha=True))
+
+    with Image.open(str(path)) as img:
+        assert (img.width, img.height, img.byteorder) == (4, 2, "RGBA")
+        # transparent pixels skipped
+        assert sum(img.histogram().values()) == 6
+
+
+def test_open_raw(tmp_path):
+    path = tmp_path / "image.raw"
+    path.write_bytes(pixel_data(8, 4))
+
+    with Image.open_raw(str(path), 8, 4) as img:
+        assert sum(img.histogram().values()) == 32
+
+    with pytest.raises(ValueError):
+        Image.open(str(path))
+
+    with pytest.raises(ValueError):
+        Image.open_raw(str(path), 8, 5)
+
+
+def test_histogram(ppm):
+    with Image.open(ppm) as img:
+        hist = img.histogram(4)
+        red = (200 >> 4) << 8 | (30 >> 4) << 4 | (30 >> 4)
+        assert hist[red] == 16
+        assert len(hist) == 3
+        assert sum(img.histogram(step=2).values()) == 8
+
+
+def test_dominant_colors(ppm):
+    with Image.open(ppm) as img:
+        dominant = img.dominant_colors(3)
+        assert [weight for _, weight in dominant] == [.5, .25, .25]
+        assert dominant[0][0].distance(Color(bytes(RED))) < 2.3
+        assert {c.lhex for c, _ in dominant[1:]} == {
+            c.lhex for c, _ in median_cut(histogram_bins(img.histogram()), 3)[1:]
+        }
+
+        assert len(img.dominant_colors(10)) == 3
+
+        theme = img.theme(2)
+        assert isinstance(theme, Theme)
+        assert len(theme) == 2
+
+        scale = img.scale(3)
+        assert isinstance(scale, ColorScale)
+        assert scale[0].cie_l < scale[1].cie_l
+
+        with pytest.raises(ValueError):
+            img.dominant_colors(3, method="nope")
+
+
+def test_median_cut():
+    bins = [(Color(c).lab, n) for c, n in [("#000", 10), ("#111", 10), ("#fff", 20)]]
+    result = median_cut(bins, 2)
+    assert [w for _, w in result] == [.5, .5]
+    assert sorted(c.lhex for c, _ in result) == ["#090909", "#ffffff"]
+    assert median_cut([], 3) == []
+
+
+def test_dominant_colors_kmeans(ppm):
+    with Image.open(ppm) as img:
+        dominant = img.dominant_colors(3, method="kmeans")
+        assert [weight for _, weight in dominant] == [.5, .25, .25]
+        assert dominant[0][0].distance(Color(bytes(RED))) < 2.3
+        assert [c.lhex for c, _ in dominant] == [c.lhex for c, _ in img.dominant_colors(3, method="kmeans")]
+
+
+def test_open_invalid(tmp_path, monkeypatch):
+    closed = []
+    mmap_class = mmap.mmap
+
+    class TrackedMmap(mmap_class):
+        def close(self):
+            closed.append(self)
+            super().close()
+
+    monkeypatch.setattr(mmap, "mmap", TrackedMmap)
+
+    path = tmp_path / "comment.ppm"
+    # comment without a newline, truncated header
+    path.write_bytes(b"P6\n4 # truncated")
+    with pytest.raises(ValueError):
+        Image.open(str(path))
+
+    path = tmp_path / "small.ppm"
+    path.write_bytes(b"P6\n4 4\n255\n" + pixel_data(4, 2))
+    with pytest.raises(ValueError):
+        Image.open(str(path))
+
+    with pytest.raises(ValueError):
+        Image.open_raw(str(path), 40, 40)
+
+    path = tmp_path / "nosize.pam"
+    path.write_bytes(b"P7\nWIDTH 4\nDEPTH 3\nMAXVAL 255\nENDHDR\n" + bytes(12))
+    with pytest.raises(ValueError, match="Invalid PAM header"):
+        Image.open(str(path))
+
+    assert len(closed) == 4
+    assert all(buf.closed for buf in closed)
@@ -0,0 +1,33 @@
+import subprocess
+import sys
+import pytest
+
+
+def run(code):
+    return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+
+
+def test_lazy_imports():
+    code = (
+        "import sys, repacolors\n"
+        "print(sorted(m for m in sys.modules if m.startswith('repacolors')))\n"
+        "scale = repacolors.ColorScale\n"
+        "print('repacolors.scale' in sys.modules, scale is repacolors.scale.ColorScale)\n"
+        "print(repacolors.palette.__name__)\n"
+    )
+    assert run(code).splitlines() == ["['repacolors']", "True True", "repacolors.palette"]
+
+
+def test_lazy_wheel_aliases():
+    code = (
+        "from repacolors.schemes import *\n"
+        "print(RGB is HSL, LAB is LCH)\n"
+    )
+    assert run(code).splitlines() == ["True True"]
+
+
+def test_missing_attribute():
+    import repacolors
+
+    with pytest.raises(AttributeError):
+        repacolors.nonexisting
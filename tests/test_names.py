@@ -0,0 +1,66 @@
+import json
+import pytest
+from repacolors import Color
+from repacolors.names import *
+
+
+def test_css_table():
+    table = css_names()
+    assert len(table) == 148
+    assert "red" in table
+    assert "nored" not in table
+    assert table.get_hex("rebeccapurple") == "#663399"
+    assert table.get_hex("nored") is None
+    assert table.get_name("#ff0000") == "red"
+    assert table.get_name("#f00") == "red"
+    assert table.get_name("#123456") is None
+    assert table.get_name("red") is None
+
+
+def test_css_table_up_to_date():
+    with open(CSSJSON) as f:
+        source = json.load(f)
+
+    with open(CSSTABLE, "rb") as f:
+        assert f.read() == build(source)
+
+
+def test_preferred_name():
+    table = NameTable.from_mapping({"aqua": "#00ffff", "cyan": "#00ffff"})
+    assert table.get_name("#00ffff") == "cyan"
+    assert table.get_hex("aqua") == "#00ffff"
+
+    table = NameTable.from_mapping([("cyan", "#00ffff"), ("aqua", "#00ffff")])
+    assert table.get_name("#00ffff") == "aqua"
+
+
+def test_nearest():
+    table = NameTable.from_mapping({"black": "#000", "white": "#fff", "gray": "#808080", "grey": "#808080"})
+    nearest = table.nearest(Color("#111").lab, 3)
+    assert [name for name, _, _ in nearest] == ["black", "grey", "white"]
+    assert nearest[0][1] == "#000000"
+    assert nearest[0][2] == pytest.approx(Color("#111").lab[0], abs=1e-3)
+
+    nearest = table.nearest(Color("#000").lab, 1, exclude="#000000")
+    assert nearest[0][0] == "grey"
+
+
+def test_user_table(tmp_path):
+    path = str(tmp_path / "brand.bin")
+    write({"brand-red": "#e10600", "brand-blue": "#0050b4", "árvíztűrő": "#abcdef"}, path)
+
+    table = NameTable.open(path)
+    assert list(table) == ["brand-blue", "brand-red", "árvíztűrő"]
+    assert dict(table.items())["árvíztűrő"] == "#abcdef"
+    assert Color("#e00").closest_named(1, table)[0].name == "brand-red"
+
+
+def test_invalid_table():
+    with pytest.raises(ValueError):
+        NameTable(b"nope" + bytes(16))
+
+    with pytest.raises(ValueError):
+        NameTable(build({"red": "#f00"})[:-5])
+
+    with pytest.raises(ValueError):
+        build({"red": "red"})
@@ -0,0 +1,109 @@
+import json
+import os
+import pytest
+from repacolors import Color, ColorScale, palette
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("REPACOLORS_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(palette, "_USER_PALETTES", None)
+    yield tmp_path
+    for name in ["brand", "Other"]:
+        palette.PALETTES.pop(name.lower(), None)
+        palette._REGISTRY.pop(name.lower(), None)
+
+
+def test_get():
+    viridis = palette.get("Viridis")
+    assert viridis is palette.get("viridis")
+    assert viridis.name == "viridis"
+    assert list(viridis) == palette.PALETTES["viridis"]
+    assert palette.get_palette("viridis") == palette.PALETTES["viridis"]
+    assert viridis.colors is viridis.colors
+    assert viridis.colors[0] == Color(viridis[0])
+
+    with pytest.raises(KeyError):
+        palette.get("nope")
+
+
+def test_scales():
+    s1 = palette.get_scale("viridis")
+    s2 = palette.get_scale("viridis", gamma=2)
+    assert isinstance(s1, ColorScale)
+    assert s1 is not s2
+    assert s1.name == "viridis"
+    assert s1.colors[0] is s2.colors[0]
+    assert s1[.3] != s2[.3]
+
+    # the LUTs are shared by the scales of the palette
+    lut = s1.lut(64)
+    assert palette.get_scale("viridis").lut(64) is lut
+    assert s2.lut(64) != lut
+
+    # changing a scale doesn't change the others
+    s1.reverse()
+    assert s1[0] == palette.get_scale("viridis")[1]
+
+    cyclic = palette.get_scale("rybw3", cyclic=True)
+    assert len(cyclic.colors) == len(palette.get("rybw3")) + 1
+
+
+def test_register(cache_dir):
+    brand = palette.register("Brand", ["#e10600", Color("#0050b4")])
+    assert palette.get("brand") is brand
+    assert brand.hexes == ("#e10600", "#0050b4ff")
+    assert "brand" in palette.names()
+    assert not os.path.exists(cache_dir / "palettes.json")
+
+    palette.unregister("brand")
+    with pytest.raises(KeyError):
+        palette.get("brand")
+
+
+def test_persist(cache_dir, monkeypatch):
+    palette.register("brand", ["#e10600", "#0050b4"], persist=True)
+    with open(cache_dir / "palettes.json") as f:
+        assert json.load(f) == {"brand": ["#e10600", "#0050b4"]}
+
+    # new process
+    palette.PALETTES.pop("brand")
+    palette._REGISTRY.pop("brand")
+    monkeypatch.setattr(palette, "_USER_PALETTES", None)
+    assert palette.get_palette("brand") == ["#e10600", "#0050b4"]
+
+    palette.unregister("brand")
+    with open(cache_dir / "palettes.json") as f:
+        assert json.load(f) == {}
+
+
+def test_no_cache_dir_on_read(tmp_path, monkeypatch):
+    path = tmp_path / "cache"
+    monkeypatch.setenv("REPACOLORS_CACHE_DIR", str(path))
+    monkeypatch.setattr(palette, "_USER_PALETTES", None)
+
+    assert "viridis" in palette.names()
+    with pytest.raises(KeyError):
+        palette.get("nope")
+    assert not path.exists()
+
+    try:
+        palette.register("brand", ["#e10600"], persist=True)
+        assert (path / "palettes.json").exists()
+    finally:
+        palette.unregister("brand")
+
+
+def test_builtins(cache_dir):
+    with pytest.raises(ValueError):
+        palette.unregister("Viridis")
+    assert "viridis" in palette.PALETTES
+
+    viridis = list(palette.PALETTES["viridis"])
+    with pytest.raises(ValueError):
+        palette.register("Viridis", ["#000", "#fff"], persist=True)
+    assert palette.PALETTES["viridis"] == viridis
+    assert not os.path.exists(cache_dir / "palettes.json")
+
+    assert palette.get_scale("Viridis").name == "Viridis"
+    assert palette.get_palette("Viridis") is palette.PALETTES["viridis"]
@@ -0,0 +1,190 @@
+import types
+import pytest
+
+xcffib = pytest.importorskip("xcffib")
+xproto = pytest.importorskip("xcffib.xproto")
+
+from repacolors import picker
+
+
+def event(cls, x=0, y=0, detail=0):
+    evt = cls.__new__(cls)
+    evt.root_x, evt.root_y, evt.detail = x, y, detail
+    return evt
+
+
+def motion(x, y):
+    return event(xproto.MotionNotifyEvent, x, y)
+
+
+def click(x, y, button):
+    return event(xproto.ButtonPressEvent, x, y, button)
+
+
+class FakeConnection:
+    """Delivers a batch of events for every `select`, `None` means timeout"""
+
+    def __init__(self, batches, clock):
+        self.batches = list(batches)
+        self.clock = clock
+        self.queue = []
+        self.timeouts = []
+
+    def get_file_descriptor(self):
+        return 42
+
+    def poll_for_event(self):
+        return self.queue.pop(0) if self.queue else None
+
+    def flush(self):
+        pass
+
+    def select(self, rlist, wlist, xlist, timeout=None):
+        assert self.batches, "would block forever"
+        self.timeouts.append(timeout)
+        batch = self.batches.pop(0)
+        if batch is None:
+            self.clock.now += timeout
+            return [], [], []
+
+        self.queue = list(batch)
+        return rlist, [], []
+
+
+class FakeClock:
+    now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakePreview:
+    loupe = 0
+
+    def __init__(self, length):
+        self.length = length
+        self.draws = []
+        self.moves = []
+        self.picks = []
+        self.loupes = []
+
+    def draw(self, rgb):
+        self.draws.append(rgb)
+
+    def move(self, x, y):
+        self.moves.append((x, y))
+
+    def draw_loupe(self, region):
+        self.loupes.append(region)
+
+    def pick(self, rgb):
+        self.picks.append(rgb)
+        return len(self.picks) >= self.length
+
+
+@pytest.fixture
+def pixels(monkeypatch):
+    fetched = []
+
+    def get_region(conn, x, y, size=1):
+        # 1x1 BGRX image
+        fetched.append((x, y))
+        return memoryview(bytes([0, y, x, 0])), 1, 1, 4, 0, 0
+
+    monkeypatch.setattr(picker, "get_region", get_region)
+    return fetched
+
+
+def run(monkeypatch, batches, length=2, loupe=0):
+    clock = FakeClock()
+    conn = FakeConnection(batches, clock)
+    wnd = FakePreview(length)
+    wnd.loupe = loupe
+    monkeypatch.setattr(picker.select, "select", conn.select)
+
+    picker.run(conn, wnd, interval=.1, clock=clock)
+
+    return conn, wnd
+
+
+def test_coalesce_motion():
+    m1, m2 = motion(1, 1), motion(2, 2)
+    c = click(1, 1, picker.MOUSE_BUTTON_LEFT)
+    assert picker.coalesce_motion([m1, c, m2]) == [c, m2]
+    assert picker.coalesce_motion([m1, m2, c]) == [m2, c]
+    assert picker.coalesce_motion([c]) == [c]
+
+
+def test_run(monkeypatch, pixels):
+    conn, wnd = run(monkeypatch, [
+        [motion(1, 1), motion(2, 2), motion(3, 3)],
+        [motion(4, 4)],  # throttled
+        None,
+        [click(5, 5, picker.MOUSE_BUTTON_LEFT)],
+        [motion(6, 6), click(6, 6, picker.MOUSE_BUTTON_RIGHT)],
+    ])
+
+    assert pixels == [(3, 3), (4, 4), (5, 5)]
+    assert wnd.moves == [(3, 3), (4, 4)]
+    assert wnd.picks == [(5, 5, 0)]
+    assert wnd.draws == [(3, 3, 0), (4, 4, 0), (5, 5, 0)]
+    # blocks while idle
+    assert conn.timeouts == [None, None, pytest.approx(.1), None, None]
+
+
+def test_run_picks(monkeypatch, pixels):
+    conn, wnd = run(monkeypatch, [
+        [click(1, 2, picker.MOUSE_BUTTON_LEFT)],
+        [click(3, 4, picker.MOUSE_BUTTON_LEFT)],
+    ])
+
+    assert wnd.picks == [(1, 2, 0), (3, 4, 0)]
+    assert conn.batches == []
+
+
+def test_run_loupe(monkeypatch, pixels):
+    conn, wnd = run(monkeypatch, [
+        [motion(1, 2)],
+        [click(1, 2, picker.MOUSE_BUTTON_RIGHT)],
+    ], loupe=8)
+
+    assert len(wnd.loupes) == 1
+    assert bytes(wnd.loupes[0][0]) == bytes([0, 2, 1, 0])
+
+
+class FakeScreen:
+    """2x(4x3) screen, BGRX images"""
+
+    def __init__(self):
+        self.core = self
+        self.requests = []
+        self.pixels = [[(x * 10, y * 10, x + y) for x in range(4)] for y in range(3)]
+
+    def get_setup(self):
+        root = types.SimpleNamespace(root=1, width_in_pixels=4, height_in_pixels=3)
+        return types.SimpleNamespace(roots=[root])
+
+    def GetImage(self, fmt, drawable, x, y, width, height, planes):
+        self.requests.append((x, y, width, height))
+        data = bytes(
+            c for row in self.pixels[y:y + height]
+            for r, g, b in row[x:x + width] for c in (b, g, r, 0)
+        )
+        reply = types.SimpleNamespace(data=types.SimpleNamespace(buf=lambda: data))
+        return types.SimpleNamespace(reply=lambda: reply)
+
+
+def test_get_pixel():
+    screen = FakeScreen()
+    assert picker.get_pixel(screen, 1, 1) == (10, 10, 2)
+    assert picker.get_pixel(screen, 1, 1, 3, "average") == (10, 10, 2)
+    assert picker.get_pixel(screen, 1, 1, 3, "median") == (10, 10, 2)
+    assert screen.requests == [(1, 1, 1, 1), (0, 0, 3, 3), (0, 0, 3, 3)]
+
+    # moved inside the screen
+    screen.requests = []
+    assert picker.get_pixel(screen, 3, 2, 3) == (30, 20, 5)
+    assert screen.requests == [(1, 0, 3, 3)]
+
+    region = picker.get_region(screen, 0, 0, 3)
+    assert region[1:] == (3, 3, 12, 0, 0)
@@ -0,0 +1,52 @@
+import mmap
+import pytest
+from repacolors.pixels import *
+
+# 3x2 image, BGRX, rows padded to 16 bytes
+IMAGE = bytes([
+    0, 0, 255, 0, 0, 255, 0, 0, 255, 0, 0, 0, 9, 9, 9, 9,
+    10, 20, 30, 0, 40, 50, 60, 0, 255, 255, 255, 0, 9, 9, 9, 9,
+])
+
+
+def test_channel_offsets():
+    assert channel_offsets("BGRX") == {"B": 0, "G": 1, "R": 2}
+    assert channel_offsets("rgba") == {"R": 0, "G": 1, "B": 2, "A": 3}
+
+    with pytest.raises(ValueError):
+        channel_offsets("RGX")
+
+
+def test_decode():
+    assert decode(IMAGE, 3, 2, "BGRX", 16) == [
+        [(255, 0, 0), (0, 255, 0), (0, 0, 255)],
+        [(30, 20, 10), (60, 50, 40), (255, 255, 255)],
+    ]
+    assert decode(IMAGE[:12], 3, 1, "XRGB") == [[(0, 255, 0), (255, 0, 0), (0, 0, 0)]]
+
+    with pytest.raises(ValueError):
+        decode(IMAGE, 3, 3, "BGRX", 16)
+
+
+def test_decode_buffers():
+    expected = decode(IMAGE, 3, 2, "BGRX", 16)
+    assert decode(bytearray(IMAGE), 3, 2, "BGRX", 16) == expected
+    assert decode(memoryview(IMAGE), 3, 2, "BGRX", 16) == expected
+
+    with mmap.mmap(-1, len(IMAGE)) as mm:
+        mm.write(IMAGE)
+        assert decode(mm, 3, 2, "BGRX", 16) == expected
+
+
+def test_pixel():
+    assert pixel(IMAGE, 3, 2, 0, 0, "BGRX", 16) == (255, 0, 0)
+    assert pixel(IMAGE, 3, 2, 1, 1, "BGRX", 16) == (60, 50, 40)
+
+    with pytest.raises(IndexError):
+        pixel(IMAGE, 3, 2, 3, 0, "BGRX", 16)
+
+
+def test_average_median():
+    assert average(IMAGE, 3, 2, "BGRX", 16) == (100, 97, 93)
+    assert median(IMAGE, 3, 2, "BGRX", 16) == (60, 50, 40)
+    assert average(IMAGE, 1, 1, "BGRX", 16) == (255, 0, 0)
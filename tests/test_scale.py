@@ -1,4 +1,5 @@
 from repacolors.scale import *
+from repacolors import Color
 
 
 def test_projection():
@@ -15,3 +16,51 @@ def test_projection():
     assert project_domain(0, [10, 0]) == 1
     assert project_domain(5, [10, 0]) == .5
     assert project_domain(1, [10, 0]) == .9
+
+
+def test_lut():
+    scale = ColorScale(["#000", "#fff"])
+    lut = scale.lut(3)
+
+    assert len(lut) == 3
+    assert lut[0] == (0, 0, 0, 1)
+    assert lut[-1] == (1, 1, 1, 1)
+    assert scale.lut(3) is lut
+
+    scale.domain = [0, 10]
+    assert scale.lut(3) is not lut
+
+
+def test_lookup():
+    scale = ColorScale(["#f00", "#00f"], domain=[0, 10])
+
+    for pos, rgba in zip([0, 3, 10], scale.lookup([0, 3, 10], 11)):
+        assert Color(rgba[:3]) == scale[pos]
+
+    rscale = ColorScale(["#f00", "#00f"], domain=[10, 0])
+    first, last = rscale.lookup([10, 0], 11)
+    assert Color(first[:3]) == Color("#f00")
+    assert Color(last[:3]) == Color("#00f")
+
+
+def test_linear_ip_many():
+    colors = [Color("red"), Color("lime"), Color("blue")]
+    positions = [0, .1, .5, .6, .99, 1]
+    for cspace in ["lab", "hsl", "lch"]:
+        assert linear_ip_many(colors, positions, cspace) == [linear_ip(colors, pos, cspace) for pos in positions]
+
+    scale = ColorScale(colors, cspace="lch", domain=[0, 10])
+    assert scale.samples(11) == [scale[i] for i in range(11)]
+    assert scale.samples(11)[0] is not colors[0]
+
+    # the mixed colors keep the color space of the first color, like `Color.mix`
+    for pos in [.1, .6, .99]:
+        idx = int(pos * 2)
+        mixed = linear_ip(colors, pos, "lab")
+        expected = colors[idx].mix(colors[idx + 1], pos * 2 - idx, "lab")
+        assert mixed.cspace == expected.cspace == colors[idx].cspace
+        assert mixed.triad() == expected.triad()
+
+    color = ColorScale(["#f00", "#00f"])[.3]
+    assert color.cspace == "rgb"
+    assert [c.lhex for c in color.triad()] == ["#e3005b", "#5be300", "#005be3"]
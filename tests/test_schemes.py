@@ -0,0 +1,65 @@
+from repacolors import Color
+from repacolors.schemes import *
+import pytest
+
+
+COLORS = [Color("#f00"), Color("#3a7"), Color("#123456"), Color("#fed")]
+
+
+def similar(c1, c2, limit=3):
+    return max(abs(v1 - v2) for v1, v2 in zip(c1.rgb256, c2.rgb256)) <= limit
+
+
+@pytest.mark.parametrize("wheel", [RYB, HSL, LCH])
+@pytest.mark.parametrize("scheme", SCHEMES.keys())
+def test_batch(wheel, scheme):
+    for adjust in (True, False):
+        batch = wheel.batch(COLORS, scheme, adjust)
+        assert len(batch) == len(COLORS)
+
+        for colors, color in zip(batch, COLORS):
+            single = getattr(wheel, scheme)(color, adjust)
+            assert len(colors) == len(SCHEMES[scheme])
+            assert all(similar(c1, c2) for c1, c2 in zip(colors, single))
+
+
+def test_batch_monochromatic():
+    for colors, color in zip(RYB.batch(COLORS, "monochromatic", n=4), COLORS):
+        assert colors == RYB.monochromatic(color, 4)
+
+
+def test_batch_unknown():
+    with pytest.raises(KeyError):
+        RYB.batch(COLORS, "nonexisting")
+
+
+def test_divide_wheel():
+    for colors, color in zip(divide_wheel(COLORS, 3), COLORS):
+        assert colors == color.triad()
+
+    for colors, color in zip(divide_wheel(COLORS, 4, "lab"), COLORS):
+        assert colors == color.square("lab")
+
+
+def test_lazy_wheels(monkeypatch):
+    import repacolors.schemes as schemes
+
+    def forget():
+        for name in ["HSL", "RGB", "LCH", "LAB"]:
+            monkeypatch.delattr(schemes, name, raising=False)
+
+    forget()
+    hsl = schemes.HSL
+    assert isinstance(hsl, HSLColorWheel)
+    assert schemes.RGB is hsl
+    assert schemes.HSL is hsl
+
+    forget()
+    rgb = schemes.RGB
+    assert schemes.HSL is rgb
+
+    forget()
+    assert schemes.LAB is schemes.LCH
+
+    with pytest.raises(AttributeError):
+        schemes.nonexisting
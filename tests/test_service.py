@@ -0,0 +1,113 @@
+from repacolors import Color
+from repacolors.service import *
+import repacolors.service as service
+import os
+import socket
+import threading
+import pytest
+
+
+def test_handle_line():
+    assert handle_line("ping") == "ok\tpong"
+    assert handle_line("convert\tred") == "ok\t#ff0000"
+    assert handle_line("convert\tred\tcssrgb\trgb256") == "ok\trgb(255, 0, 0)\t255,0,0"
+    assert handle_line("sample\t.5\t#000\t#fff") == "ok\t" + Color("#777777").lhex
+    assert handle_line("samples\t3\tred\tblue").split("\t")[1::2] == ["#ff0000", "#0000ff"]
+    assert handle_line("contrast\tblack\twhite").startswith("ok\t21")
+    assert handle_line("name\t#ff0000") == "ok\tred"
+    assert handle_line("name\t#fe0101") == "ok\tred"
+
+
+def test_handle_line_errors():
+    assert handle_line("nonexisting").startswith("error\t")
+    assert handle_line("convert\tred\tnonexisting").startswith("error\tAttributeError")
+    assert handle_line("contrast\tred").startswith("error\tTypeError")
+
+
+def test_decode_response():
+    assert decode_response("ok\ta\tb\n") == ["a", "b"]
+
+    with pytest.raises(ServiceError):
+        decode_response("error\tsomething went wrong\n")
+
+
+def test_client_server(tmp_path):
+    path = str(tmp_path / "repacolors.sock")
+    server = ColorServer(path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        with Client(path, timeout=5) as client:
+            assert client.request("ping") == ["pong"]
+            assert client.batch([("convert", "red", "cssrgb"), ("name", "#fe0101"), ("convert", "rgb(0, 0, 255)")] * 100) == [
+                ["rgb(255, 0, 0)"], ["red"], ["#0000ff"]
+            ] * 100
+
+            with pytest.raises(ServiceError):
+                client.request("nonexisting")
+
+            # still usable after an error
+            assert client.request("ping") == ["pong"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_remove_stale_socket(tmp_path):
+    from repacolors.service import _remove_stale_socket
+    import socket
+
+    # not there
+    _remove_stale_socket(str(tmp_path / "missing.sock"))
+
+    # regular file
+    path = tmp_path / "file"
+    path.write_text("data")
+    with pytest.raises(FileExistsError):
+        _remove_stale_socket(str(path))
+    assert path.exists()
+
+    # stale socket, nobody listening
+    path = str(tmp_path / "stale.sock")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    sock.close()
+    _remove_stale_socket(path)
+    assert not os.path.exists(path)
+
+    # running server
+    path = str(tmp_path / "live.sock")
+    server = ColorServer(path)
+    try:
+        with pytest.raises(FileExistsError):
+            _remove_stale_socket(path)
+        assert os.path.exists(path)
+    finally:
+        server.server_close()
+
+
+def test_invalid_requests(tmp_path, monkeypatch):
+    monkeypatch.setattr(service, "MAX_LINE", 100)
+    path = str(tmp_path / "repacolors.sock")
+    server = ColorServer(path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(5)
+            sock.connect(path)
+            reader = sock.makefile("rb")
+
+            sock.sendall(b"convert\t\xff\xfe\n")
+            assert reader.readline().startswith(b"error\tUnicodeDecodeError")
+
+            sock.sendall(b"ping\n" + b"x" * 150)
+            assert reader.readline() == b"ok\tpong\n"
+            assert reader.readline().startswith(b"error\trequest line longer than 100 bytes")
+            sock.sendall(b"x" * 150 + b"\nping\n")
+            assert reader.readline() == b"ok\tpong\n"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -26,3 +26,18 @@ def test_draw():
     assert tc1.termbg in timg
     assert tc2.termbg in timg
     assert terminal.TerminalColor.termreset in timg
+
+
+def test_draw_rgb():
+    img = [
+        [(1, 0, 0), (0, 1, 0, .5)],
+        [(0, 0, 1), (0, 0, 0)],
+        [(1, 1, 1)],
+    ]
+
+    timg = terminal.draw_rgb(img)
+
+    assert "\x1b[38;2;255;0;0m\x1b[48;2;0;0;255m▀" in timg
+    assert "\x1b[38;2;0;255;0m\x1b[48;2;0;0;0m▀" in timg
+    assert "\x1b[38;2;255;255;255m▀" in timg
+    assert timg.count(terminal.TerminalColor.termreset) == 2
@@ -0,0 +1,211 @@
+import sys
+import types
+import pytest
+from repacolors import Color, themes
+from repacolors.themes import Theme, GRUVBOX, xrdb
+
+
+def fake_xresources(monkeypatch, colors):
+    calls = []
+
+    def get_theme(DISPLAY=None):
+        calls.append(DISPLAY)
+        return Theme(list(colors))
+
+    module = types.ModuleType("repacolors.themes.xresources")
+    module.get_theme = get_theme
+    monkeypatch.setitem(sys.modules, "repacolors.themes.xresources", module)
+    monkeypatch.setattr(themes, "_XTHEMES", {})
+
+    return calls
+
+
+def test_xtheme_lazy(monkeypatch):
+    colors = ["#000000", "#ff0000"]
+    calls = fake_xresources(monkeypatch, colors)
+    assert calls == []
+
+    xtheme = themes.XTHEME
+    assert list(xtheme.values()) == colors
+    assert themes.XTHEME is xtheme
+    assert themes.get_xtheme() is xtheme
+    assert calls == [None]
+
+    colors[1] = "#00ff00"
+    other = themes.get_xtheme(DISPLAY=":1")
+    assert other is not xtheme
+    assert other.red == "#00ff00"
+    assert themes.get_xtheme(DISPLAY=":1") is other
+    assert themes.XTHEME is xtheme
+    assert calls == [None, ":1"]
+
+    refreshed = themes.get_xtheme(refresh=True)
+    assert refreshed is not xtheme
+    assert themes.XTHEME is refreshed
+    assert refreshed.red == "#00ff00"
+    assert calls == [None, ":1", None]
+
+
+def test_xtheme_fallback(monkeypatch):
+    # import of the module fails without xcffib
+    monkeypatch.setitem(sys.modules, "repacolors.themes.xresources", None)
+    monkeypatch.setattr(themes, "_XTHEMES", {})
+
+    assert themes.XTHEME is GRUVBOX
+
+
+XRESOURCES = """! gruvbox
+#define bg #282828
+#define red #cc241d
+
+*.background: bg
+*.foreground:\t#ebdbb2
+*.color0:  bg
+*color1:   red
+URxvt.font: xft:Iosevka:size=10
+URxvt.perl-ext-common: default,\\
+matcher
+#include "other"
+no separator
+"""
+
+
+def test_xrdb_parse():
+    resources = xrdb.parse(XRESOURCES)
+    assert resources["background"] == "#282828"
+    assert resources["foreground"] == "#ebdbb2"
+    assert resources["color0"] == "#282828"
+    assert resources["color1"] == "#cc241d"
+    assert resources["URxvt.font"] == "xft:Iosevka:size=10"
+    assert resources["URxvt.perl-ext-common"] == "default,matcher"
+    assert len(resources) == 6
+
+    defaults = {"color1": "#000000", "color2": "#98971a"}
+    resources = xrdb.parse("*.color1:\t#fb4934\n", defaults)
+    assert resources == {"color1": "#fb4934", "color2": "#98971a"}
+    assert defaults["color1"] == "#000000"
+
+
+def test_xrdb_theme(tmp_path):
+    path = tmp_path / ".Xresources"
+    path.write_text(XRESOURCES)
+
+    theme = xrdb.theme(xrdb.load(str(path)))
+    assert theme.bg == "#282828"
+    assert theme.fg == "#ebdbb2"
+    assert theme.red == "#cc241d"
+    assert theme.green == "#000000"
+
+
+class FakeConnection:
+    def __init__(self, xproto, resources):
+        self.xproto = xproto
+        self.resources = resources
+        self.events = []
+        self.fetches = 0
+        self.core = self
+
+    def get_setup(self):
+        return types.SimpleNamespace(roots=[types.SimpleNamespace(root=1)])
+
+    def InternAtom(self, *args):
+        return types.SimpleNamespace(reply=lambda: types.SimpleNamespace(atom=23))
+
+    def ChangeWindowAttributesChecked(self, *args):
+        return types.SimpleNamespace(check=lambda: None)
+
+    def GetProperty(self, *args):
+        self.fetches += 1
+        value = types.SimpleNamespace(buf=lambda: self.resources.encode("utf-8"))
+        return types.SimpleNamespace(reply=lambda: types.SimpleNamespace(value=value))
+
+    def poll_for_event(self):
+        return self.events.pop(0) if self.events else None
+
+    def notify(self, atom):
+        event = self.xproto.PropertyNotifyEvent.__new__(self.xproto.PropertyNotifyEvent)
+        event.atom = atom
+        self.events.append(event)
+
+    def disconnect(self):
+        pass
+
+
+def test_resource_loader(monkeypatch):
+    xcffib = pytest.importorskip("xcffib")
+    xproto = pytest.importorskip("xcffib.xproto")
+    from repacolors.themes import xresources
+
+    conn = FakeConnection(xproto, "*.color1:\t#cc241d\n")
+    monkeypatch.setattr(xcffib, "connect", lambda display=None: conn)
+
+    loader = xresources.ResourceLoader(":0")
+    assert loader.get()["color1"] == "#cc241d"
+    assert loader.get()["color1"] == "#cc241d"
+    assert conn.fetches == 1
+
+    # other property changed
+    conn.notify(42)
+    loader.get()
+    assert conn.fetches == 1
+
+    conn.resources = "*.color1:\t#fb4934\n"
+    conn.notify(23)
+    assert loader.get()["color1"] == "#fb4934"
+    assert conn.fetches == 2
+
+
+def test_no_xserver(monkeypatch, capsys):
+    xcffib = pytest.importorskip("xcffib")
+    from repacolors.themes import xresources
+
+    def connect(display=None):
+        raise xcffib.ConnectionException(1)
+
+    monkeypatch.setattr(xcffib, "connect", connect)
+    monkeypatch.setattr(xresources, "_LOADERS", {})
+
+    with pytest.warns(RuntimeWarning):
+        assert xresources.get(":0", {"color1": "#cc241d"}) == {"color1": "#cc241d"}
+    assert capsys.readouterr().out == ""
+
+
+def test_theme_cache():
+    theme = Theme(["#000000", "#cc241d", "#98971a"], aliases={"foreground": 2})
+
+    red = theme.color("red")
+    assert red == theme.color(1)
+    assert red is theme.color("red")
+    assert theme.color("fg").lhex == "#98971a"
+    assert theme.color("bg").lhex == "#000000"
+
+    lighter = theme.lighten("red", 20)
+    assert lighter is theme.lighten(1, 20)
+    assert lighter == red.lighten(20)
+    assert theme.darken("red") == red.darken()
+    assert theme.termfg("red") == red.termfg
+    assert theme.termbg("red") == red.termbg
+
+    text = theme.textcolor("red")
+    assert text is theme.textcolor("red")
+    assert text.contrast_ratio(theme.color("bg")) >= 4.5
+    assert theme.variant("red", "complementary") == red.complementary()
+
+
+def test_theme_cache_invalidation():
+    theme = Theme(["#000000", "#cc241d"])
+    red = theme.color("red")
+    lighter = theme.lighten("red")
+    text = theme.textcolor("red")
+
+    theme[1] = "#fb4934"
+    assert theme.color("red").lhex == "#fb4934"
+    assert theme.lighten("red") != lighter
+
+    theme[0] = "#ffffff"
+    assert theme.textcolor("red") != text
+    assert theme.textcolor("red").contrast_ratio(Color("#fff")) >= 4.5
+
+    theme.alias("red", 0)
+    assert theme.color("red").lhex == "#ffffff"
+    assert red.lhex == "#cc241d"